@@ -38,38 +38,85 @@ def bot():
         app.run_polling()
 
 @cli.command()
-def worker():
+@click.option('--async', 'async_mode', is_flag=True, help='Run skill coroutines concurrently in one asyncio process.')
+@click.option('--queues', '-Q', default=None, help='Comma-separated queues to consume (interactive,background,heavy). Default: all.')
+@click.option('--concurrency', default=None, type=int, help='Worker concurrency (default: per-queue defaults, or ASYNC_WORKER_CONCURRENCY in --async mode).')
+def worker(async_mode, queues, concurrency):
     """Start the Gabay Celery Worker."""
-    click.echo("Starting Gabay Celery Worker...")
-    # Using subprocess to run celery
-    subprocess.run(["celery", "-A", "gabay.worker.celery_app", "worker", "--loglevel=INFO", "-E"])
+    from gabay.worker.celery_app import QUEUE_CONCURRENCY, QUEUE_PREFETCH_MULTIPLIER
+    queue_list = [q.strip() for q in queues.split(",")] if queues else list(QUEUE_CONCURRENCY)
+    unknown = [q for q in queue_list if q not in QUEUE_CONCURRENCY]
+    if unknown:
+        raise click.BadParameter(f"Unknown queue(s): {', '.join(unknown)}", param_hint="--queues")
+
+    if async_mode:
+        import logging
+        from gabay.core.config import settings
+        from gabay.worker.async_worker import run_async_worker
+        logging.basicConfig(level=settings.log_level)
+        concurrency = concurrency or settings.async_worker_concurrency
+        click.echo(f"Starting Gabay Async Worker on {queue_list} ({concurrency} concurrent tasks)...")
+        run_async_worker(concurrency, queues=queue_list)
+        return
+
+    concurrency = concurrency or sum(QUEUE_CONCURRENCY[q] for q in queue_list)
+    # A worker shared by several queues prefetches as conservatively as its strictest queue
+    prefetch = min(QUEUE_PREFETCH_MULTIPLIER[q] for q in queue_list)
+    click.echo(f"Starting Gabay Celery Worker on {queue_list} (concurrency {concurrency}, prefetch x{prefetch})...")
+    # Using subprocess to run celery; a per-queue node name lets several workers share a host
+    subprocess.run([
+        "celery", "-A", "gabay.worker.celery_app", "worker", "--loglevel=INFO", "-E",
+        "-Q", ",".join(queue_list), "-c", str(concurrency), "-n", f"{'-'.join(queue_list)}@%h",
+        "--prefetch-multiplier", str(prefetch),
+    ])
 
 @cli.command()
 def beat():
-    """Start the Gabay Celery Beat Scheduler."""
+    """Start the Gabay Celery Beat Scheduler (and the reminder scheduler)."""
+    import threading
+    from gabay.worker.scheduler import run_scheduler
     click.echo("Starting Gabay Celery Beat Scheduler...")
+    threading.Thread(target=run_scheduler, name="gabay-reminder-scheduler", daemon=True).start()
     subprocess.run(["celery", "-A", "gabay.worker.celery_app", "beat", "--loglevel=INFO"])
 
 @cli.command()
-def all():
+def scheduler():
+    """Start only the precise reminder scheduler."""
+    import logging
+    from gabay.core.config import settings
+    from gabay.worker.scheduler import run_scheduler
+    logging.basicConfig(level=settings.log_level)
+    click.echo("Starting Gabay Reminder Scheduler...")
+    run_scheduler()
+
+@cli.command()
+@click.option('--embedded', is_flag=True, help='Single process: run tasks, reminders and the heartbeat inside the API (no Celery worker or beat).')
+def all(embedded):
     """Run API, Bot, and Worker concurrently."""
     click.echo("Starting all Gabay services...")
     
     # We use subprocess to launch the other commands
     processes = []
-    
-    # API
-    processes.append(subprocess.Popen([sys.executable, "-m", "uvicorn", "gabay.core.main:app", "--host", "0.0.0.0", "--port", "8000"]))
-    
-    # Worker
-    processes.append(subprocess.Popen(["celery", "-A", "gabay.worker.celery_app", "worker", "--loglevel=INFO", "-E"]))
-    
-    # Beat
-    processes.append(subprocess.Popen(["celery", "-A", "gabay.worker.celery_app", "beat", "--loglevel=INFO"]))
-    
-    # Bot
-    # We can just run it in the main process, or as another subprocess
-    processes.append(subprocess.Popen([sys.executable, "-c", "from gabay.core.telegram_bot import get_telegram_app; app=get_telegram_app(); app and app.run_polling()"]))
+
+    if embedded:
+        # The API process hosts the bot and the embedded executor
+        env = {**os.environ, "EMBEDDED_MODE": "true"}
+        processes.append(subprocess.Popen([sys.executable, "-m", "uvicorn", "gabay.core.main:app", "--host", "0.0.0.0", "--port", "8000"], env=env))
+    else:
+        # API
+        processes.append(subprocess.Popen([sys.executable, "-m", "uvicorn", "gabay.core.main:app", "--host", "0.0.0.0", "--port", "8000"]))
+        
+        # One worker per queue, so heavy and background jobs can't starve interactive ones
+        from gabay.worker.celery_app import QUEUE_CONCURRENCY
+        for queue in QUEUE_CONCURRENCY:
+            processes.append(subprocess.Popen([sys.executable, "-m", "gabay.cli", "worker", "--queues", queue]))
+        
+        # Beat + reminder scheduler
+        processes.append(subprocess.Popen([sys.executable, "-m", "gabay.cli", "beat"]))
+        
+        # Bot
+        # We can just run it in the main process, or as another subprocess
+        processes.append(subprocess.Popen([sys.executable, "-c", "from gabay.core.telegram_bot import get_telegram_app; app=get_telegram_app(); app and app.run_polling()"]))
     
     try:
         for p in processes:
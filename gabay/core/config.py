@@ -38,6 +38,30 @@ class Settings(BaseSettings):
     # Timezone
     tz: str = "UTC"
 
+    # Voice notes larger than this are spooled to a temp file and streamed to Whisper
+    voice_stream_threshold_bytes: int = 5 * 1024 * 1024
+
+    # Drive downloads stay in memory up to the spool threshold, then go to a temp file,
+    # and stop at the max
+    drive_spool_threshold_bytes: int = 2 * 1024 * 1024
+    drive_download_max_bytes: int = 25 * 1024 * 1024
+
+    # Resumable Drive uploads send this much per request (must be a multiple of 256 KB)
+    drive_upload_chunk_bytes: int = 8 * 1024 * 1024
+
+    # Meeting briefings are sent this many minutes before the event starts
+    meeting_briefing_lead_minutes: int = 30
+
+    # Max in-flight tasks for `gabay worker --async`
+    async_worker_concurrency: int = 200
+
+    # Embedded mode: run tasks, reminders and the heartbeat inside the API process,
+    # without Celery workers or beat. Set REDIS_URL empty to run without Redis too.
+    embedded_mode: bool = False
+    embedded_queue_size: int = 100  # pending tasks before new requests are turned away
+    embedded_workers: int = 8       # concurrently running tasks
+    embedded_threads: int = 4       # threads for synchronous tasks
+
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", arbitrary_types_allowed=True, extra="ignore")
 
 # For local development without Docker, use local data folder
@@ -53,9 +53,9 @@ def get_events(user_id: str, time_min: str = None, time_max: str = None) -> list
         logger.error(f"Error fetching calendar events: {e}")
         return [f"Failed to fetch calendar events. Error: {str(e)}"]
 
-def get_raw_events(user_id: str, time_min: str = None, time_max: str = None) -> list[dict]:
+def get_raw_events(user_id: str, time_min: str = None, time_max: str = None, service=None) -> list[dict]:
     """Retrieve raw event objects from the user's primary Google Calendar."""
-    service = get_google_service(user_id, "calendar", "v3")
+    service = service or get_google_service(user_id, "calendar", "v3")
     if not service:
         return []
 
@@ -73,6 +73,18 @@ def get_raw_events(user_id: str, time_min: str = None, time_max: str = None) ->
         logger.error(f"Error fetching raw calendar events: {e}")
         return []
 
+def get_event(user_id: str, event_id: str) -> dict:
+    """Fetch a single event from the user's primary calendar (None if it can't be read)."""
+    service = get_google_service(user_id, "calendar", "v3")
+    if not service:
+        return None
+
+    try:
+        return service.events().get(calendarId='primary', eventId=event_id).execute()
+    except Exception as e:
+        logger.error(f"Error fetching calendar event {event_id}: {e}")
+        return None
+
 def create_event(user_id: str, summary: str, start_time: str, end_time: str, attendees: list = None) -> str:
     """Create a new event on the user's primary calendar."""
     service = get_google_service(user_id, "calendar", "v3")
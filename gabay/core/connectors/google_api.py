@@ -1,82 +1,573 @@
 import logging
-from googleapiclient.discovery import build
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from googleapiclient import discovery_cache
+from googleapiclient.discovery import build, build_from_document
 from google.oauth2.credentials import Credentials
 from google.auth.transport.requests import Request as GoogleRequest
+from google.auth.exceptions import RefreshError
+import codecs
 import json
 import re
 import uuid
+from contextlib import contextmanager
 from gabay.core.connectors.token_manager import token_manager
 from gabay.core.config import settings
+from gabay.core.utils.redis_client import get_redis, redis_enabled
 
 logger = logging.getLogger(__name__)
 
-def get_google_service(user_id: str, service_name: str, version: str):
-    token_data = token_manager.get_token("google", str(user_id))
+# Google APIs Gabay talks to; their discovery documents are parsed once per process
+GOOGLE_APIS = [
+    ("gmail", "v1"), ("calendar", "v3"), ("drive", "v3"), ("docs", "v1"),
+    ("sheets", "v4"), ("slides", "v1"), ("people", "v1"),
+]
+
+# Credentials are refreshed this long before they actually expire
+CREDENTIAL_EXPIRY_MARGIN = timedelta(minutes=5)
+
+# Upper bound for one token refresh; also how long others wait for it
+REFRESH_LOCK_TIMEOUT = 30
+
+# Built services kept per thread; the oldest is dropped past this
+GOOGLE_SERVICE_CACHE_SIZE = 32
+
+# Gmail metadata is fetched in HTTP batches; Google rate-limits batches above ~50 calls
+GMAIL_BATCH_SIZE = 50
+GMAIL_LIST_PAGE_SIZE = 500
+GMAIL_METADATA_HEADERS = ['Subject', 'From', 'Date']
+
+# Newest messages loaded into the local mirror on its first sync
+GMAIL_MIRROR_BACKFILL = 500
+
+# Searches reuse the mirror without a history sync for this many seconds
+GMAIL_MIRROR_MAX_AGE = 60
+
+# Drive search: only the fields skills use, short-lived memo, bounded fan-out
+DRIVE_SEARCH_FIELDS = 'nextPageToken, files(id, name, mimeType, webViewLink)'
+DRIVE_PAGE_SIZE = 100
+DRIVE_SEARCH_TTL = 60
+DRIVE_SEARCH_CACHE_SIZE = 512
+DRIVE_SEARCH_WORKERS = 4
+
+# Local Drive index: metadata fields kept, first-sync cap, and how stale a search may read it
+DRIVE_INDEX_FIELDS = 'id, name, mimeType, webViewLink, modifiedTime, trashed'
+DRIVE_INDEX_PAGE_SIZE = 1000
+DRIVE_INDEX_BACKFILL = 5000
+DRIVE_INDEX_MAX_AGE = 60
+
+# Drive downloads are fetched in chunks of this size
+DRIVE_DOWNLOAD_CHUNK = 1024 * 1024
+
+# Resumable uploads: retries inside one chunk, then resumes of the whole session
+DRIVE_UPLOAD_RETRIES = 3
+DRIVE_UPLOAD_RESUMES = 5
+
+# Slides decks are sent in batchUpdates of at most this many requests
+SLIDES_MAX_BATCH_REQUESTS = 400
+
+# Sheets writes are split into batchUpdates of at most this many cells (keeps bodies
+# well under the request size limit); reads page through this many rows at a time
+SHEETS_MAX_CELLS_PER_BATCH = 50000
+SHEETS_READ_PAGE_ROWS = 5000
+
+# Uploads from /save land in this folder in the user's Drive root
+GABAY_FOLDER_NAME = "Gabay"
+DRIVE_FOLDER_MIME = 'application/vnd.google-apps.folder'
+
+_discovery_docs = {}
+_discovery_lock = threading.Lock()
+
+# user_id -> (Credentials, stored token data, tokens.json version)
+_credentials = {}
+_credentials_lock = threading.Lock()
+
+# Built services are per thread: googleapiclient's httplib2 transport isn't thread-safe.
+# Each thread keeps (user_id, api, version) -> (Credentials, service), built under one tokens.json version
+_thread_services = threading.local()
+
+# (user_id, normalized query, limit) -> (expires_at, results)
+_drive_search_cache = {}
+_drive_search_lock = threading.Lock()
+
+# user_id -> ID of their "Gabay" Drive folder
+_gabay_folders = {}
+
+def _discovery_doc(service_name: str, version: str):
+    key = (service_name, version)
+    if key not in _discovery_docs:
+        raw = discovery_cache.get_static_doc(service_name, version)
+        with _discovery_lock:
+            _discovery_docs[key] = json.loads(raw) if raw else None
+    return _discovery_docs[key]
+
+def preload_discovery_docs():
+    """Parses the bundled discovery documents up front so no request pays for it."""
+    for service_name, version in GOOGLE_APIS:
+        _discovery_doc(service_name, version)
+
+def build_google_service(creds, service_name: str, version: str):
+    """Builds a service from the preloaded discovery document (no network, no re-parse)."""
+    doc = _discovery_doc(service_name, version)
+    if doc is None:
+        return build(service_name, version, credentials=creds)
+    return build_from_document(doc, credentials=creds)
+
+def _is_fresh(creds) -> bool:
+    if not creds.valid:
+        return False
+    # google-auth keeps expiry as naive UTC
+    return creds.expiry is None or creds.expiry - datetime.utcnow() > CREDENTIAL_EXPIRY_MARGIN
+
+def get_google_credentials(user_id: str):
+    """
+    Returns the user's Google credentials, refreshed if they expire soon; None if unavailable.
+    Credentials stay cached in memory until close to expiry, or until the user's stored
+    token changes (re-pairing, a refresh by another process).
+    """
+    user_id = str(user_id)
+    version = token_manager.version()
+    with _credentials_lock:
+        cached = _credentials.get(user_id)
+    if cached and _is_fresh(cached[0]):
+        creds, stored, cached_version = cached
+        if cached_version == version:
+            return creds
+        if token_manager.get_token("google", user_id) == stored:
+            # tokens.json changed for someone else
+            with _credentials_lock:
+                _credentials[user_id] = (creds, stored, version)
+            return creds
+
+    creds, stored = _load_google_credentials(user_id)
+    with _credentials_lock:
+        if creds:
+            _credentials[user_id] = (creds, stored, token_manager.version())
+        else:
+            _credentials.pop(user_id, None)
+    return creds
+
+def _read_google_credentials(user_id: str):
+    """Builds credentials from the stored token. Returns (creds, stored token data)."""
+    token_data = token_manager.get_token("google", user_id)
     if not token_data:
-        logger.warning(f"No Google token found for user {user_id}")
-        return None
+        return None, None
+    stored = dict(token_data)
         
-    logger.debug(f"Getting Google service for user {user_id}. Provider keys: {list(token_data.keys())}")
-    
     # Inject client credentials if missing from stored token
     if 'client_id' not in token_data or not token_data['client_id']:
         token_data['client_id'] = settings.google_client_id
     if 'client_secret' not in token_data or not token_data['client_secret']:
         token_data['client_secret'] = settings.google_client_secret
         
-    creds = Credentials.from_authorized_user_info(token_data)
-    
-    # Check if we need to refresh the token
-    if creds and creds.expired and creds.refresh_token:
+    return Credentials.from_authorized_user_info(token_data), stored
+
+@contextmanager
+def _refresh_lock(user_id: str):
+    """
+    Single-flight guard for refreshing one user's token across threads, processes and
+    hosts: a Redis lock when Redis is configured, otherwise a file lock in the data dir.
+    """
+    if not redis_enabled():
+        with token_manager.lock(f"google-refresh-{user_id}"):
+            yield
+        return
+    lock = get_redis().lock(f"gabay:oauth-refresh:{user_id}", timeout=REFRESH_LOCK_TIMEOUT, blocking_timeout=REFRESH_LOCK_TIMEOUT)
+    acquired = False
+    try:
+        acquired = lock.acquire()
+    except Exception as e:
+        logger.warning(f"Token refresh lock unavailable for {user_id}: {e}")
+    try:
+        yield
+    finally:
+        if acquired:
+            try:
+                lock.release()
+            except Exception:
+                pass  # Expired while we held it; nothing to release
+
+def _is_rejected_grant(error: RefreshError) -> bool:
+    """True when Google refused the grant itself, as opposed to a server error worth retrying."""
+    details = [arg for arg in error.args if isinstance(arg, dict)]
+    if "invalid_grant" in str(error.args[0] if error.args else "") or any(d.get("error") == "invalid_grant" for d in details):
+        return True
+    # google-auth flags 5xx/429/temporarily_unavailable responses as retryable
+    return getattr(error, "retryable", True) is False
+
+def _load_google_credentials(user_id: str):
+    """Reads the stored token and refreshes it if needed. Returns (creds, stored token data)."""
+    creds, stored = _read_google_credentials(user_id)
+    if not creds:
+        logger.warning(f"No Google token found for user {user_id}")
+        return None, None
+    if _is_fresh(creds) or not creds.refresh_token:
+        return creds, stored
+
+    with _refresh_lock(user_id):
+        # Whoever held the lock before us has probably refreshed already: use their result
+        creds, stored = _read_google_credentials(user_id)
+        if not creds:
+            return None, None
+        if _is_fresh(creds):
+            return creds, stored
         try:
             logger.info(f"Refreshing Google token for user {user_id}...")
             creds.refresh(GoogleRequest())
             # Save refreshed token back to storage
-            new_token_data = json.loads(creds.to_json())
-            token_manager.save_token("google", user_id, new_token_data)
+            stored = json.loads(creds.to_json())
+            token_manager.save_token("google", user_id, stored)
+        except RefreshError as e:
+            if _is_rejected_grant(e):
+                # Revoked or expired grant: retrying won't help until the user re-pairs
+                logger.error(f"Google token for {user_id} was rejected: {e}")
+                token_manager.mark_invalid("google", user_id)
+                clear_google_indexes(user_id)
+            else:
+                logger.warning(f"Transient Google token refresh failure for {user_id}: {e}")
+            return None, None
         except Exception as e:
             logger.error(f"Failed to refresh Google token for {user_id}: {e}")
             # If refresh fails, we might want to notify the user to re-pair
-            return None
+            return None, None
             
-    return build(service_name, version, credentials=creds)
+    return creds, stored
+
+def get_google_service(user_id: str, service_name: str, version: str):
+    """
+    Returns a ready service object, reused per thread for as long as the credentials are.
+    Any change to tokens.json (a refresh, re-pairing, a token marked invalid) drops the
+    thread's services, so none outlive the credentials they were built with.
+    """
+    creds = get_google_credentials(user_id)
+    # Read after the credentials: a refresh above has just written tokens.json
+    token_version = token_manager.version()
+    cache = getattr(_thread_services, "cache", None)
+    if cache is None or _thread_services.version != token_version:
+        cache = _thread_services.cache = {}
+        _thread_services.version = token_version
+    if not creds:
+        for key in [k for k in cache if k[0] == str(user_id)]:
+            del cache[key]
+        return None
+
+    key = (str(user_id), service_name, version)
+    entry = cache.pop(key, None)
+    if not entry or entry[0] is not creds:
+        entry = (creds, build_google_service(creds, service_name, version))
+    # Re-inserted to keep the dict in least-recently-used order
+    cache[key] = entry
+    while len(cache) > GOOGLE_SERVICE_CACHE_SIZE:
+        del cache[next(iter(cache))]
+    return entry[1]
 
 def get_unread_emails_full(user_id: str, max_results: int = 5) -> list[dict]:
     """Returns unread emails with full metadata (id, subject, sender, snippet)."""
     return search_gmail_full(user_id, query='is:unread', max_results=max_results)
 
-def search_gmail_full(user_id: str, query: str, max_results: int = 10) -> list[dict]:
-    """Searches for emails matching a query and returns metadata (id, subject, sender, snippet)."""
-    service = get_google_service(user_id, "gmail", "v1")
+def search_gmail_full(user_id: str, query: str, max_results: int = 10, service=None) -> list[dict]:
+    """
+    Searches for emails matching a query and returns metadata (id, subject, sender, snippet).
+    Answered from the local mirror when the query can be translated, falling back to the
+    API for the part of the mailbox older than the mirror.
+    """
+    filters = _parse_gmail_query(query)
+    if filters is not None:
+        try:
+            if sync_gmail_mirror(user_id, service=service):
+                emails = _search_gmail_mirror(user_id, query, filters, max_results, service)
+                if emails is not None:
+                    return emails
+        except Exception as e:
+            logger.warning(f"Gmail mirror unavailable for user {user_id}, searching live: {e}")
+    return _search_gmail_api(user_id, query, max_results, service)
+
+def _search_gmail_api(user_id: str, query: str, max_results: int = 10, service=None) -> list[dict]:
+    service = service or get_google_service(user_id, "gmail", "v1")
     if not service:
         return []
     
     try:
-        results = service.users().messages().list(userId='me', q=query, maxResults=max_results).execute()
-        messages = results.get('messages', [])
-        
-        email_data = []
-        for msg in messages:
-            m = service.users().messages().get(userId='me', id=msg['id'], format='minimal').execute()
-            msg_id = m.get('id')
-            snippet = m.get('snippet', '')
-            
-            m_full = service.users().messages().get(userId='me', id=msg_id).execute()
-            headers = m_full['payload']['headers']
-            subject = next((h['value'] for h in headers if h['name'] == 'Subject'), "No Subject")
-            sender = next((h['value'] for h in headers if h['name'] == 'From'), "Unknown")
-            
-            email_data.append({
-                "id": msg_id,
-                "subject": subject,
-                "sender": sender,
-                "snippet": snippet
-            })
-        return email_data
+        # Page through the ids (one list page holds at most 500)
+        message_ids = []
+        page_token = None
+        while len(message_ids) < max_results:
+            results = service.users().messages().list(
+                userId='me', q=query, pageToken=page_token,
+                maxResults=min(max_results - len(message_ids), GMAIL_LIST_PAGE_SIZE)
+            ).execute()
+            message_ids.extend(m['id'] for m in results.get('messages', []))
+            page_token = results.get('nextPageToken')
+            if not page_token:
+                break
+        return _fetch_email_metadata(service, message_ids[:max_results])
     except Exception as e:
         logger.error(f"Gmail search error: {e}")
         return []
 
+def _parse_email_metadata(m: dict) -> dict:
+    headers = m.get('payload', {}).get('headers', [])
+    return {
+        "id": m.get('id'),
+        "thread_id": m.get('threadId'),
+        "subject": next((h['value'] for h in headers if h['name'] == 'Subject'), "No Subject"),
+        "sender": next((h['value'] for h in headers if h['name'] == 'From'), "Unknown"),
+        "date": next((h['value'] for h in headers if h['name'] == 'Date'), ""),
+        "internal_date": int(m.get('internalDate', 0)),
+        "labels": m.get('labelIds', []),
+        "snippet": m.get('snippet', '')
+    }
+
+def _fetch_email_metadata(service, message_ids: list) -> list[dict]:
+    """
+    Fetches headers-only metadata for the given message ids, GMAIL_BATCH_SIZE per HTTP
+    batch request. Results keep the input order; messages that fail are skipped.
+    """
+    fetched = {}
+
+    def on_response(request_id, response, exception):
+        if exception is not None:
+            logger.warning(f"Gmail metadata fetch failed for {request_id}: {exception}")
+            return
+        fetched[request_id] = _parse_email_metadata(response)
+
+    for i in range(0, len(message_ids), GMAIL_BATCH_SIZE):
+        batch = service.new_batch_http_request(callback=on_response)
+        for msg_id in message_ids[i:i + GMAIL_BATCH_SIZE]:
+            batch.add(
+                service.users().messages().get(
+                    userId='me', id=msg_id, format='metadata', metadataHeaders=GMAIL_METADATA_HEADERS
+                ),
+                request_id=msg_id,
+            )
+        batch.execute()
+    return [fetched[msg_id] for msg_id in message_ids if msg_id in fetched]
+
+# --- Local Gmail mirror ---
+
+_GMAIL_QUERY_TOKEN = re.compile(r'(\w+):("[^"]*"|\S+)|"([^"]*)"|(\S+)')
+
+# is:/in:/label: values that map onto a single system label
+_GMAIL_QUERY_LABELS = {
+    "unread": "UNREAD", "starred": "STARRED", "important": "IMPORTANT",
+    "inbox": "INBOX", "sent": "SENT", "draft": "DRAFT", "drafts": "DRAFT",
+}
+
+_GMAIL_PERIOD_MS = {"d": 86400000, "m": 30 * 86400000, "y": 365 * 86400000}
+
+def _user_timezone():
+    try:
+        return ZoneInfo(settings.tz)
+    except (ZoneInfoNotFoundError, ValueError):
+        logger.warning(f"Unknown timezone '{settings.tz}', reading Gmail dates as UTC")
+        return timezone.utc
+
+def _gmail_query_date_ms(value: str):
+    if value.isdigit():
+        return int(value) * 1000
+    for fmt in ("%Y/%m/%d", "%Y-%m-%d"):
+        try:
+            # A bare date means midnight where the user is, not midnight UTC
+            return int(datetime.strptime(value, fmt).replace(tzinfo=_user_timezone()).timestamp() * 1000)
+        except ValueError:
+            continue
+    return None
+
+def _parse_gmail_query(query: str):
+    """
+    Translates the subset of Gmail search syntax the mirror can answer into filters
+    for db.search_gmail_mirror. Returns None for anything else (OR, negation, grouping,
+    attachments, user labels, ...), which is then searched live.
+    """
+    filters = {"labels_all": [], "labels_none": [], "senders": [], "subjects": [], "after_ms": None, "before_ms": None, "text": []}
+    now_ms = int(datetime.now(timezone.utc).timestamp() * 1000)
+
+    for op, value, phrase, word in _GMAIL_QUERY_TOKEN.findall(query or ""):
+        if phrase:
+            filters["text"].append(phrase)
+            continue
+        if word:
+            if word in ("OR", "AND") or word[0] in "-({" or word.endswith(")"):
+                return None
+            filters["text"].append(word)
+            continue
+
+        op = op.lower()
+        value = value.strip('"')
+        if op in ("is", "in", "label"):
+            if op == "is" and value.lower() == "read":
+                filters["labels_none"].append("UNREAD")
+            elif value.lower() in _GMAIL_QUERY_LABELS:
+                filters["labels_all"].append(_GMAIL_QUERY_LABELS[value.lower()])
+            else:
+                return None
+        elif op == "from":
+            filters["senders"].append(value)
+        elif op == "subject":
+            filters["subjects"].append(value)
+        elif op in ("newer_than", "older_than"):
+            match = re.fullmatch(r"(\d+)([dmy])", value.lower())
+            if not match:
+                return None
+            bound = now_ms - int(match.group(1)) * _GMAIL_PERIOD_MS[match.group(2)]
+            filters["after_ms" if op == "newer_than" else "before_ms"] = bound
+        elif op in ("after", "before"):
+            bound = _gmail_query_date_ms(value)
+            if bound is None:
+                return None
+            filters["after_ms" if op == "after" else "before_ms"] = bound
+        else:
+            return None
+    return filters
+
+def _search_gmail_mirror(user_id: str, query: str, filters: dict, max_results: int, service=None):
+    """Runs a translated query on the mirror. Returns None when only a live search can answer it."""
+    from gabay.core.database import db
+
+    emails = db.search_gmail_mirror(int(user_id), limit=max_results, **filters)
+    if len(emails) >= max_results:
+        return emails
+    if filters["text"]:
+        # Free text also matches bodies, which the mirror doesn't hold, whatever range it covers
+        return None
+    mirror_since = db.get_gmail_sync_state(int(user_id))["mirror_since"]
+    if mirror_since == 0:
+        return emails
+    if filters["after_ms"] is not None and filters["after_ms"] >= mirror_since:
+        return emails
+    # Only the unsynced range (older than the mirror) can hold more matches
+    older = _search_gmail_api(user_id, f"{query} before:{mirror_since // 1000}", max_results - len(emails), service)
+    return emails + older
+
+def _gmail_mirror_is_fresh(state: dict) -> bool:
+    synced_at = datetime.strptime(state["updated_at"], "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc)
+    return (datetime.now(timezone.utc) - synced_at).total_seconds() < GMAIL_MIRROR_MAX_AGE
+
+def sync_gmail_mirror(user_id: str, service=None, force: bool = False, bootstrap: bool = False) -> bool:
+    """
+    Brings the user's local Gmail mirror up to date through the history API.
+    Syncs at most every GMAIL_MIRROR_MAX_AGE seconds unless `force` is set. A missing or
+    expired mirror is only backfilled with `bootstrap`, so interactive searches never pay for it.
+    Returns True if the mirror can be queried.
+    """
+    from gabay.core.database import db
+    from googleapiclient.errors import HttpError
+
+    uid = int(user_id)
+    with token_manager.lock(f"gmail-mirror-{user_id}"):
+        # Re-read under the lock: a concurrent caller may have just synced
+        state = db.get_gmail_sync_state(uid)
+        ready = bool(state and state["mirror_since"] is not None)
+        if ready and not force and _gmail_mirror_is_fresh(state):
+            return True
+        if not ready and not bootstrap:
+            return False
+
+        service = service or get_google_service(user_id, "gmail", "v1")
+        if not service:
+            return ready
+
+        if ready:
+            try:
+                _apply_gmail_history(uid, service, state["history_id"])
+                return True
+            except HttpError as e:
+                if e.resp.status != 404:
+                    raise
+                logger.info(f"Gmail history cursor expired for user {user_id}, rebuilding mirror.")
+                db.clear_gmail_mirror(uid)
+                if not bootstrap:
+                    return False
+
+        _backfill_gmail_mirror(uid, service)
+        return True
+
+def _apply_gmail_history(user_id: int, service, start_history_id: str):
+    from gabay.core.database import db
+
+    added = []
+    deleted = set()
+    label_changes = []
+    latest_history_id = start_history_id
+    page_token = None
+    while True:
+        resp = service.users().history().list(
+            userId='me',
+            startHistoryId=start_history_id,
+            historyTypes=['messageAdded', 'messageDeleted', 'labelAdded', 'labelRemoved'],
+            pageToken=page_token
+        ).execute()
+        latest_history_id = resp.get('historyId', latest_history_id)
+        for record in resp.get('history', []):
+            for item in record.get('messagesAdded', []):
+                msg_id = item['message']['id']
+                deleted.discard(msg_id)
+                if msg_id not in added:
+                    added.append(msg_id)
+            for item in record.get('messagesDeleted', []):
+                deleted.add(item['message']['id'])
+            for item in record.get('labelsAdded', []):
+                label_changes.append((item['message']['id'], item.get('labelIds', []), []))
+            for item in record.get('labelsRemoved', []):
+                label_changes.append((item['message']['id'], [], item.get('labelIds', [])))
+        page_token = resp.get('nextPageToken')
+        if not page_token:
+            break
+
+    # Fetched metadata is current; replaying label changes on top of it converges to the same state
+    db.upsert_gmail_messages(user_id, _fetch_email_metadata(service, [m for m in added if m not in deleted]))
+    db.update_gmail_labels(user_id, label_changes)
+    db.delete_gmail_messages(user_id, list(deleted))
+    db.set_gmail_history_id(user_id, latest_history_id)
+
+def _backfill_gmail_mirror(user_id: int, service):
+    """Loads the newest GMAIL_MIRROR_BACKFILL messages and starts following history from here."""
+    from gabay.core.database import db
+
+    # Take the cursor first so nothing arriving during the backfill is missed
+    history_id = service.users().getProfile(userId='me').execute()['historyId']
+
+    message_ids = []
+    page_token = None
+    while len(message_ids) < GMAIL_MIRROR_BACKFILL:
+        resp = service.users().messages().list(
+            userId='me', pageToken=page_token,
+            maxResults=min(GMAIL_MIRROR_BACKFILL - len(message_ids), GMAIL_LIST_PAGE_SIZE)
+        ).execute()
+        message_ids.extend(m['id'] for m in resp.get('messages', []))
+        page_token = resp.get('nextPageToken')
+        if not page_token:
+            break
+    messages = _fetch_email_metadata(service, message_ids)
+
+    # Unread inbox mail counts as new on the first sync, like the triage bootstrap always did
+    is_new = lambda m: 'UNREAD' in m['labels'] and 'INBOX' in m['labels']
+    db.upsert_gmail_messages(user_id, [m for m in messages if not is_new(m)], notified=True)
+    db.upsert_gmail_messages(user_id, [m for m in messages if is_new(m)])
+    db.set_gmail_history_id(user_id, history_id)
+    mirror_since = min((m['internal_date'] for m in messages), default=0) if page_token else 0
+    db.set_gmail_mirror_since(user_id, mirror_since)
+    logger.info(f"Gmail mirror for user {user_id} backfilled with {len(messages)} messages")
+
+def sync_new_emails(user_id: str, max_results: int = 10, service=None) -> list[dict]:
+    """
+    Returns unread inbox emails that arrived since the last call. Syncs the local mirror
+    first (backfilling it on the first call) and reports each message only once.
+    Pass `service` to reuse an already-built Gmail service.
+    """
+    from gabay.core.database import db
+
+    try:
+        if not sync_gmail_mirror(user_id, service=service, force=True, bootstrap=True):
+            return []
+        return db.take_new_gmail_messages(int(user_id), max_results)
+    except Exception as e:
+        logger.error(f"Gmail incremental sync error: {e}")
+        return []
+
 def get_thread_messages(user_id: str, thread_id: str) -> list[dict]:
     """Fetches all messages in a Gmail thread and returns simplified metadata."""
     service = get_google_service(user_id, "gmail", "v1")
@@ -99,13 +590,61 @@ def get_thread_messages(user_id: str, thread_id: str) -> list[dict]:
         logger.error(f"Error fetching thread {thread_id}: {e}")
         return []
 
-def get_sheet_values(user_id: str, spreadsheet_id: str, range_name: str = "Sheet1!A1:Z100") -> list[list]:
-    """Reads a range of cells from a Google Sheet."""
+def iter_sheet_rows(user_id: str, spreadsheet_id: str, sheet_title: str = None, page_rows: int = None):
+    """
+    Yields every row of a tab (the first by default), reading SHEETS_READ_PAGE_ROWS rows per
+    request. Blank rows inside the data come back as [] so row positions are kept; a page
+    with no values at all is taken as the end of the data, however large the grid is.
+    """
+    service = get_google_service(user_id, "sheets", "v4")
+    if not service:
+        return
+    sheet = _find_sheet(get_sheet_info(user_id, spreadsheet_id, service), sheet_title)
+    if not sheet:
+        return
+
+    page_rows = page_rows or SHEETS_READ_PAGE_ROWS
+    last_col = _column_letter(max(sheet['columns'], 1) - 1)
+    blank = 0  # blank rows seen but not yet yielded: they only matter if data follows
+    for start in range(1, sheet['rows'] + 1, page_rows):
+        end = min(start + page_rows - 1, sheet['rows'])
+        result = service.spreadsheets().values().get(
+            spreadsheetId=spreadsheet_id,
+            range=f"{_a1_sheet(sheet['title'])}!A{start}:{last_col}{end}",
+            majorDimension='ROWS'
+        ).execute()
+        values = result.get('values', [])
+        if not values:
+            return
+        for row in values:
+            if not row:
+                blank += 1
+                continue
+            for _ in range(blank):
+                yield []
+            blank = 0
+            yield row
+        # The API drops a page's trailing blank rows
+        blank += (end - start + 1) - len(values)
+
+def get_sheet_values(user_id: str, spreadsheet_id: str, range_name: str = None, max_rows: int = None) -> list[list]:
+    """
+    Reads a range of cells from a Google Sheet. Without a range, pages through the
+    whole first tab (up to `max_rows` rows).
+    """
     service = get_google_service(user_id, "sheets", "v4")
     if not service:
         return []
     
     try:
+        if range_name is None:
+            rows = []
+            page_rows = min(max_rows, SHEETS_READ_PAGE_ROWS) if max_rows else None
+            for row in iter_sheet_rows(user_id, spreadsheet_id, page_rows=page_rows):
+                rows.append(row)
+                if max_rows and len(rows) >= max_rows:
+                    break
+            return rows
         result = service.spreadsheets().values().get(
             spreadsheetId=spreadsheet_id, 
             range=range_name
@@ -115,30 +654,288 @@ def get_sheet_values(user_id: str, spreadsheet_id: str, range_name: str = "Sheet
         logger.error(f"Error reading Google Sheet {spreadsheet_id}: {e}")
         return []
 
-def upload_file_to_drive(user_id: str, file_path: str, mime_type: str) -> str:
-    # Minimal implementation for now
-    return "https://drive.google.com/upload/mock"
+def get_gabay_folder_id(user_id: str, service=None):
+    """Returns the ID of the user's "Gabay" Drive folder, creating it on first use. Cached per process."""
+    if str(user_id) in _gabay_folders:
+        return _gabay_folders[str(user_id)]
+    service = service or get_google_service(user_id, "drive", "v3")
+    if not service:
+        return None
+
+    # Serialized so concurrent first uploads don't create two folders
+    with token_manager.lock(f"drive-folder-{user_id}"):
+        if str(user_id) in _gabay_folders:
+            return _gabay_folders[str(user_id)]
+        q = (
+            f"name = '{_drive_query_literal(GABAY_FOLDER_NAME)}' and mimeType = '{DRIVE_FOLDER_MIME}' "
+            "and 'root' in parents and trashed = false"
+        )
+        found = service.files().list(q=q, spaces='drive', fields='files(id)', pageSize=1).execute().get('files', [])
+        if found:
+            folder_id = found[0]['id']
+        else:
+            folder = service.files().create(
+                body={'name': GABAY_FOLDER_NAME, 'mimeType': DRIVE_FOLDER_MIME}, fields='id'
+            ).execute()
+            folder_id = folder['id']
+            logger.info(f"Created Gabay Drive folder for user {user_id}")
+        _gabay_folders[str(user_id)] = folder_id
+        return folder_id
+
+def _is_transient_upload_error(e: Exception) -> bool:
+    from googleapiclient.errors import HttpError
+    if isinstance(e, HttpError):
+        return e.resp.status in (408, 429) or e.resp.status >= 500
+    return isinstance(e, (OSError, TimeoutError))
+
+def upload_stream_to_drive(user_id: str, fh, filename: str, mime_type: str,
+                           folder_id: str = None, progress=None) -> dict:
+    """
+    Uploads a readable binary file object to Drive with a chunked resumable upload, so only
+    one chunk (settings.drive_upload_chunk_bytes) is in memory at a time. Transient failures
+    are retried and the upload resumes from the last byte Drive acknowledged.
+    `progress(fraction)` is called after every chunk. Returns {'id', 'link'}.
+    """
+    from googleapiclient.http import MediaIoBaseUpload
+
+    service = get_google_service(user_id, "drive", "v3")
+    if not service:
+        raise ConnectionError("Not connected to Google Drive.")
+
+    body = {'name': filename}
+    if folder_id:
+        body['parents'] = [folder_id]
+    media = MediaIoBaseUpload(fh, mimetype=mime_type, chunksize=settings.drive_upload_chunk_bytes, resumable=True)
+    request = service.files().create(body=body, media_body=media, fields='id, webViewLink')
+
+    response = None
+    failures = 0
+    while response is None:
+        try:
+            # num_retries covers 5xx/429 inside one chunk with exponential backoff
+            status, response = request.next_chunk(num_retries=DRIVE_UPLOAD_RETRIES)
+        except Exception as e:
+            failures += 1
+            if not _is_transient_upload_error(e) or failures > DRIVE_UPLOAD_RESUMES:
+                raise
+            delay = min(2 ** failures, 30)
+            logger.warning(f"Upload of '{filename}' interrupted ({e}), resuming in {delay}s")
+            time.sleep(delay)
+            continue
+        failures = 0
+        if status:
+            logger.debug(f"Uploading '{filename}': {int(status.progress() * 100)}%")
+            if progress:
+                progress(status.progress())
+    if progress:
+        progress(1.0)
+    return {'id': response['id'], 'link': response.get('webViewLink', '')}
+
+def upload_file_to_drive(user_id: str, file_path: str, mime_type: str, progress=None) -> str:
+    """Streams a local file into the user's Gabay folder. Returns its Drive link, or None on failure."""
+    import os
+
+    filename = os.path.basename(file_path)
+    for attempt in range(2):
+        try:
+            folder_id = get_gabay_folder_id(user_id)
+            with open(file_path, "rb") as fh:
+                uploaded = upload_stream_to_drive(user_id, fh, filename, mime_type, folder_id=folder_id, progress=progress)
+            return uploaded['link'] or f"https://drive.google.com/file/d/{uploaded['id']}/view"
+        except Exception as e:
+            from googleapiclient.errors import HttpError
+            if attempt == 0 and isinstance(e, HttpError) and e.resp.status == 404:
+                # The cached folder was deleted; look it up (or recreate it) once more
+                _gabay_folders.pop(str(user_id), None)
+                continue
+            logger.error(f"Error uploading {file_path} to Drive: {e}")
+            return None
+
+def _drive_query_literal(value: str) -> str:
+    # Drive query strings are single-quoted; backslashes and quotes must be escaped
+    return value.replace("\\", "\\\\").replace("'", "\\'")
+
+def search_drive(user_id: str, query: str, limit: int = 5) -> list[dict]:
+    """
+    Searches Drive file names and contents. The local index answers on its own only when
+    it covers the whole Drive and every indexed file has extracted text; otherwise its hits
+    are merged with a live name/fullText search. Live results are memoized per (user, query)
+    for DRIVE_SEARCH_TTL seconds.
+    """
+    local = []
+    try:
+        if sync_drive_index(user_id):
+            from gabay.core.database import db
+            uid = int(user_id)
+            local = db.search_documents(uid, "drive", query, limit)
+            if (local and db.get_document_sync_state(uid, "drive")["complete"]
+                    and db.count_documents_without_content(uid, "drive") == 0):
+                return local
+    except Exception as e:
+        logger.warning(f"Drive index unavailable for user {user_id}, searching live: {e}")
+
+    return _merge_drive_results(local, _search_drive_live(user_id, query, limit), limit)
+
+def _merge_drive_results(local: list, live: list, limit: int) -> list[dict]:
+    seen = {f['id'] for f in local}
+    return (local + [f for f in live if f['id'] not in seen])[:limit]
+
+def _search_drive_live(user_id: str, query: str, limit: int) -> list[dict]:
+    key = (str(user_id), " ".join(query.lower().split()), limit)
+    with _drive_search_lock:
+        cached = _drive_search_cache.get(key)
+    if cached and cached[0] > time.monotonic():
+        return [dict(f) for f in cached[1]]
 
-def search_drive(user_id: str, query: str) -> list[dict]:
     service = get_google_service(user_id, "drive", "v3")
     if not service:
         return []
     
     try:
-        q = f"name contains '{query}' or fullText contains '{query}'"
-        results = service.files().list(
-            q=q,
-            spaces='drive',
-            fields='files(id, name, mimeType, webViewLink)',
-            pageSize=5
-        ).execute()
+        literal = _drive_query_literal(query)
+        q = f"(name contains '{literal}' or fullText contains '{literal}') and trashed = false"
+        files = []
+        page_token = None
+        while len(files) < limit:
+            results = service.files().list(
+                q=q,
+                spaces='drive',
+                fields=DRIVE_SEARCH_FIELDS,
+                pageSize=min(limit - len(files), DRIVE_PAGE_SIZE),
+                pageToken=page_token
+            ).execute()
+            files.extend(results.get('files', []))
+            page_token = results.get('nextPageToken')
+            if not page_token:
+                break
         
-        files = results.get('files', [])
-        return [{"id": f['id'], "title": f['name'], "mimeType": f.get('mimeType', ''), "link": f.get('webViewLink', '')} for f in files]
+        found = [{"id": f['id'], "title": f['name'], "mimeType": f.get('mimeType', ''), "link": f.get('webViewLink', '')} for f in files[:limit]]
+        with _drive_search_lock:
+            now = time.monotonic()
+            if len(_drive_search_cache) >= DRIVE_SEARCH_CACHE_SIZE:
+                for stale in [k for k, (expires, _) in _drive_search_cache.items() if expires <= now]:
+                    del _drive_search_cache[stale]
+            _drive_search_cache[key] = (now + DRIVE_SEARCH_TTL, found)
+        return [dict(f) for f in found]
     except Exception as e:
         logger.error(f"Drive search error: {e}")
         return []
 
+def search_drive_many(user_id: str, queries: list, limit: int = 5) -> list[dict]:
+    """
+    Runs several Drive searches concurrently and merges them, de-duplicated by file id
+    in query order. Each worker thread uses its own service object.
+    """
+    queries = list(dict.fromkeys(q for q in queries if q))
+    if not queries:
+        return []
+    with ThreadPoolExecutor(max_workers=min(len(queries), DRIVE_SEARCH_WORKERS)) as pool:
+        result_lists = list(pool.map(lambda q: search_drive(user_id, q, limit), queries))
+
+    merged = []
+    seen = set()
+    for results in result_lists:
+        for f in results:
+            if f['id'] not in seen:
+                seen.add(f['id'])
+                merged.append(f)
+    return merged
+
+# --- Local Drive index ---
+
+def clear_google_indexes(user_id: str):
+    """Drops the local Drive index, so a disconnected or replaced account's files stop matching."""
+    from gabay.core.database import db
+
+    if str(user_id).isdigit():
+        with token_manager.lock(f"drive-index-{user_id}"):
+            db.clear_documents(int(user_id), "drive")
+
+def _drive_index_entry(f: dict) -> dict:
+    return {"id": f['id'], "title": f.get('name'), "mimeType": f.get('mimeType', ''),
+            "link": f.get('webViewLink', ''), "modified_at": f.get('modifiedTime')}
+
+def sync_drive_index(user_id: str, service=None, force: bool = False, bootstrap: bool = False) -> bool:
+    """
+    Brings the user's local Drive index up to date from the changes feed.
+    Syncs at most every DRIVE_INDEX_MAX_AGE seconds unless `force` is set; a missing
+    index is only built with `bootstrap`. Returns True if the index can be queried.
+    """
+    from gabay.core.database import db
+
+    uid = int(user_id)
+    with token_manager.lock(f"drive-index-{user_id}"):
+        state = db.get_document_sync_state(uid, "drive")
+        if state and not force and state["age"] < DRIVE_INDEX_MAX_AGE:
+            return True
+        if not state and not bootstrap:
+            return False
+
+        service = service or get_google_service(user_id, "drive", "v3")
+        if not service:
+            return bool(state)
+
+        if state:
+            _apply_drive_changes(uid, service, state["cursor"])
+        else:
+            _backfill_drive_index(uid, service)
+        return True
+
+def _apply_drive_changes(user_id: int, service, page_token: str):
+    from gabay.core.database import db
+
+    changed = {}
+    removed = set()
+    while True:
+        resp = service.changes().list(
+            pageToken=page_token,
+            spaces='drive',
+            pageSize=DRIVE_INDEX_PAGE_SIZE,
+            fields=f"nextPageToken, newStartPageToken, changes(fileId, removed, file({DRIVE_INDEX_FIELDS}))"
+        ).execute()
+        for change in resp.get('changes', []):
+            f = change.get('file')
+            if change.get('removed') or not f or f.get('trashed'):
+                removed.add(change['fileId'])
+                changed.pop(change['fileId'], None)
+            else:
+                removed.discard(f['id'])
+                changed[f['id']] = _drive_index_entry(f)
+        if 'newStartPageToken' in resp:
+            page_token = resp['newStartPageToken']
+            break
+        page_token = resp['nextPageToken']
+
+    db.upsert_documents(user_id, "drive", list(changed.values()))
+    db.delete_documents(user_id, "drive", list(removed))
+    db.set_document_sync_state(user_id, "drive", page_token)
+
+def _backfill_drive_index(user_id: int, service):
+    """Indexes up to DRIVE_INDEX_BACKFILL files and starts following the changes feed from here."""
+    from gabay.core.database import db
+
+    # Take the cursor first so nothing changed during the backfill is missed
+    start_token = service.changes().getStartPageToken().execute()['startPageToken']
+
+    files = []
+    page_token = None
+    while len(files) < DRIVE_INDEX_BACKFILL:
+        resp = service.files().list(
+            q="trashed = false",
+            spaces='drive',
+            pageSize=DRIVE_INDEX_PAGE_SIZE,
+            pageToken=page_token,
+            fields=f"nextPageToken, files({DRIVE_INDEX_FIELDS})"
+        ).execute()
+        files.extend(resp.get('files', []))
+        page_token = resp.get('nextPageToken')
+        if not page_token:
+            break
+
+    db.upsert_documents(user_id, "drive", [_drive_index_entry(f) for f in files])
+    db.set_document_sync_state(user_id, "drive", start_token, complete=not page_token)
+    logger.info(f"Drive index for user {user_id} built with {len(files)} files")
+
 def send_email(user_id: str, recipient: str, subject: str, body: str) -> str:
     # Actually most users prefer SMTP for simple sending if they have credentials,
     # but since this is google_api.py, we could use Gmail API.
@@ -184,68 +981,167 @@ def share_file(user_id: str, file_id: str, email: str = None, role: str = 'reade
         logger.error(f"Error sharing file {file_id}: {e}")
         return {"error": f"Error sharing file: {e}"}
 
-def download_drive_file(user_id: str, file_id: str, mime_type: str) -> str:
+DOCX_MIME = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+
+class DriveDownloadError(Exception):
+    pass
+
+class DriveFileTooLarge(DriveDownloadError):
+    pass
+
+def _drive_media_request(service, file_id: str, mime_type: str):
+    if 'application/vnd.google-apps.document' in mime_type:
+        # Export Google Doc to text
+        return service.files().export_media(fileId=file_id, mimeType='text/plain')
+    if 'text/' in mime_type or 'application/json' in mime_type or 'application/csv' in mime_type or DOCX_MIME in mime_type:
+        # Download regular text file or binary .docx
+        return service.files().get_media(fileId=file_id)
+    return None
+
+@contextmanager
+def _spooled_drive_download(request, max_bytes: int):
     """
-    Downloads or exports a file from Google Drive as plain text.
-    Google Docs ('application/vnd.google-apps.document') must be exported.
-    Standard text files ('text/plain') are downloaded directly.
+    Downloads a Drive media request in chunks into a temp file that stays in memory up to
+    settings.drive_spool_threshold_bytes. Stops after max_bytes; yields (file, truncated).
+    """
+    from tempfile import SpooledTemporaryFile
+    from googleapiclient.http import MediaIoBaseDownload
+
+    with SpooledTemporaryFile(max_size=settings.drive_spool_threshold_bytes) as fh:
+        downloader = MediaIoBaseDownload(fh, request, chunksize=DRIVE_DOWNLOAD_CHUNK)
+        done = False
+        truncated = False
+        while not done:
+            status, done = downloader.next_chunk()
+            if not done and fh.tell() >= max_bytes:
+                truncated = True
+                break
+        if fh.tell() > max_bytes:
+            truncated = True
+            fh.truncate(max_bytes)
+        fh.seek(0)
+        yield fh, truncated
+
+def _stream_drive_download(request, max_bytes: int):
+    """
+    Yields a Drive media request's bytes as each chunk arrives, stopping after max_bytes.
+    Items are (chunk, done); the last one has done=False if the file was cut short.
+    """
+    from io import BytesIO
+    from googleapiclient.http import MediaIoBaseDownload
+
+    buf = BytesIO()
+    downloader = MediaIoBaseDownload(buf, request, chunksize=min(DRIVE_DOWNLOAD_CHUNK, max_bytes))
+    received = 0
+    done = False
+    while not done:
+        _, done = downloader.next_chunk()
+        chunk = buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+        if not done and received + len(chunk) >= max_bytes:
+            yield chunk[:max_bytes - received], False
+            return
+        received += len(chunk)
+        yield chunk, done
+
+def _iter_docx_paragraphs(fh):
+    """Streams paragraph text out of word/document.xml without building the whole tree."""
+    import zipfile
+    import xml.etree.ElementTree as ET
+    WORD_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+    PARA = WORD_NAMESPACE + 'p'
+    TEXT = WORD_NAMESPACE + 't'
+
+    with zipfile.ZipFile(fh) as d, d.open('word/document.xml') as xml_file:
+        for _, elem in ET.iterparse(xml_file, events=('end',)):
+            if elem.tag == PARA:
+                texts = [node.text for node in elem.iter(TEXT) if node.text]
+                if texts:
+                    yield ''.join(texts)
+                elem.clear()
+
+def iter_drive_file_text(user_id: str, file_id: str, mime_type: str, max_bytes: int = None, max_chars: int = None):
+    """
+    Yields a Drive file's text in pieces, downloading at most `max_bytes`
+    (settings.drive_download_max_bytes by default). Text files are decoded as their chunks
+    arrive, and with `max_chars` only the bytes those characters can take are fetched;
+    Word documents are streamed paragraph by paragraph and must fit within the cap.
     """
     service = get_google_service(user_id, "drive", "v3")
     if not service:
-        return "Not connected to Google Drive."
+        raise DriveDownloadError("Not connected to Google Drive.")
+    request = _drive_media_request(service, file_id, mime_type)
+    if request is None:
+        raise DriveDownloadError(f"Unsupported file type for summarization: {mime_type}")
 
-    try:
-        if 'application/vnd.google-apps.document' in mime_type:
-            # Export Google Doc to text
-            request = service.files().export_media(fileId=file_id, mimeType='text/plain')
-        elif 'text/' in mime_type or 'application/json' in mime_type or 'application/csv' in mime_type:
-            # Download regular text file
-            request = service.files().get_media(fileId=file_id)
-        elif 'application/vnd.openxmlformats-officedocument.wordprocessingml.document' in mime_type:
-            # Download binary .docx
-            request = service.files().get_media(fileId=file_id)
-        else:
-            return f"Unsupported file type for summarization: {mime_type}"
+    max_bytes = max_bytes or settings.drive_download_max_bytes
+    if DOCX_MIME in mime_type:
+        with _spooled_drive_download(request, max_bytes) as (fh, truncated):
+            if truncated:
+                # A .docx is a zip with its index at the end; a partial one can't be opened
+                raise DriveFileTooLarge(f"Word document is larger than {max_bytes // (1024 * 1024)} MB")
+            first = True
+            for paragraph in _iter_docx_paragraphs(fh):
+                yield paragraph if first else '\n\n' + paragraph
+                first = False
+        return
 
-        from io import BytesIO
-        from googleapiclient.http import MediaIoBaseDownload
-        
-        fh = BytesIO()
-        downloader = MediaIoBaseDownload(fh, request)
-        done = False
-        while done is False:
-            status, done = downloader.next_chunk()
-            
-        file_bytes = fh.getvalue()
-        
-        # Word docx parsing
-        if 'application/vnd.openxmlformats-officedocument.wordprocessingml.document' in mime_type:
-            import zipfile
-            import xml.etree.ElementTree as ET
-            try:
-                with zipfile.ZipFile(BytesIO(file_bytes)) as d:
-                    xml_content = d.read('word/document.xml')
-                    tree = ET.XML(xml_content)
-                    WORD_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
-                    PARA = WORD_NAMESPACE + 'p'
-                    TEXT = WORD_NAMESPACE + 't'
-                    
-                    paragraphs = []
-                    for paragraph in tree.iter(PARA):
-                        texts = [node.text for node in paragraph.iter(TEXT) if node.text]
-                        if texts:
-                            paragraphs.append(''.join(texts))
-                    return '\n\n'.join(paragraphs)
-            except Exception as e:
-                logger.error(f"Failed to parse docx: {e}")
-                return f"Error extracting text from DOCX: {e}"
+    if max_chars:
+        # UTF-8 takes at most 4 bytes a character; one extra shows the text ran on
+        max_bytes = min(max_bytes, 4 * (max_chars + 1))
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    done = True
+    for chunk, done in _stream_drive_download(request, max_bytes):
+        yield decoder.decode(chunk)
+    yield decoder.decode(b'', final=done)
 
-        # Return the decoded text
-        return file_bytes.decode('utf-8')
-        
+def download_drive_file(user_id: str, file_id: str, mime_type: str, max_chars: int = None) -> str:
+    """
+    Downloads or exports a file from Google Drive as plain text.
+    Google Docs ('application/vnd.google-apps.document') must be exported.
+    Standard text files ('text/plain') are downloaded directly.
+    With `max_chars`, reading stops there and the text is marked as truncated.
+    """
+    parts = []
+    length = 0
+    truncated = False
+    text_stream = iter_drive_file_text(user_id, file_id, mime_type, max_chars=max_chars)
+    try:
+        for piece in text_stream:
+            parts.append(piece)
+            length += len(piece)
+            if max_chars and length > max_chars:
+                truncated = True
+                break
+    except DriveFileTooLarge as e:
+        return f"Error downloading file: {e}"
+    except DriveDownloadError as e:
+        return str(e)
     except Exception as e:
         logger.error(f"Error downloading file {file_id}: {e}")
         return f"Error downloading file: {e}"
+    finally:
+        text_stream.close()
+
+    text = ''.join(parts)
+    if truncated:
+        text = text[:max_chars] + "... [Document Truncated for Length]"
+    return text
+
+def download_drive_file_bytes(user_id: str, file_id: str, max_bytes: int = None) -> bytes:
+    """
+    Downloads a Drive file's raw bytes through the spooled download, refusing files larger
+    than `max_bytes` (settings.drive_download_max_bytes by default).
+    """
+    service = get_google_service(user_id, "drive", "v3")
+    if not service:
+        raise DriveDownloadError("Not connected to Google Drive.")
+    max_bytes = max_bytes or settings.drive_download_max_bytes
+    with _spooled_drive_download(service.files().get_media(fileId=file_id), max_bytes) as (fh, truncated):
+        if truncated:
+            raise DriveFileTooLarge(f"File is larger than {max_bytes // (1024 * 1024)} MB")
+        return fh.read()
 
 def create_google_doc(user_id: str, title: str, initial_text: str = "") -> dict:
     """Creates a new Google Doc with professional formatting."""
@@ -446,169 +1342,235 @@ def create_google_presentation(user_id: str, title: str) -> dict:
         logger.error(f"Error creating Google Slides: {e}")
         return {"error": str(e)}
 
-def add_slide_to_presentation(user_id: str, presentation_id: str, title: str, body: str, image_url: str = None) -> bool:
-    """Adds a slide to a presentation with high-end Professional V3 aesthetics."""
-    service = get_google_service(user_id, "slides", "v1")
-    if not service:
-        return False
-        
-    try:
-        slide_id = str(uuid.uuid4())
-        
-        # Clean the body text for native bulleting
-        cleaned_body = _clean_body_text(body)
-        
-        requests = [
-            {
-                'createSlide': {
-                    'objectId': slide_id,
-                    'insertionIndex': '1',
-                    'slideLayoutReference': {
-                        'predefinedLayout': 'BLANK' # We build from scratch for total control
-                    }
+def _slide_requests(slide_id: str, title: str, body: str, image_url: str = None, insertion_index: int = None) -> list:
+    """Slides API requests that build one slide with high-end Professional V3 aesthetics."""
+    # Clean the body text for native bulleting
+    cleaned_body = _clean_body_text(body)
+    
+    requests = [
+        {
+            'createSlide': {
+                'objectId': slide_id,
+                'slideLayoutReference': {
+                    'predefinedLayout': 'BLANK' # We build from scratch for total control
                 }
-            },
-            # Page Background (Ultra-sleek Deep Navy/Charcoal)
-            {
-                'updatePageProperties': {
-                    'objectId': slide_id,
-                    'pageProperties': {
-                        'pageBackgroundFill': {
-                            'solidFill': {
-                                'color': {
-                                    'rgbColor': {'red': 0.05, 'green': 0.07, 'blue': 0.09} # Modern #0d1117 style
-                                }
+            }
+        },
+        # Page Background (Ultra-sleek Deep Navy/Charcoal)
+        {
+            'updatePageProperties': {
+                'objectId': slide_id,
+                'pageProperties': {
+                    'pageBackgroundFill': {
+                        'solidFill': {
+                            'color': {
+                                'rgbColor': {'red': 0.05, 'green': 0.07, 'blue': 0.09} # Modern #0d1117 style
                             }
                         }
-                    },
-                    'fields': 'pageBackgroundFill.solidFill.color'
-                }
-            }
-        ]
-        
-        # Textbox IDs
-        title_box_id = f"title_{slide_id}"
-        body_box_id = f"body_{slide_id}"
-        
-        # 1. Title Positioning (Shifted slightly and smaller font to avoid overlap)
-        requests.extend([
-            {
-                'createShape': {
-                    'objectId': title_box_id,
-                    'shapeType': 'TEXT_BOX',
-                    'elementProperties': {
-                        'pageObjectId': slide_id,
-                        'size': {'height': {'magnitude': 1200000, 'unit': 'EMU'}, 'width': {'magnitude': 4500000 if image_url else 8500000, 'unit': 'EMU'}},
-                        'transform': {'scaleX': 1, 'scaleY': 1, 'translateX': 400000, 'translateY': 350000, 'unit': 'EMU'}
                     }
-                }
-            },
-            {'insertText': {'objectId': title_box_id, 'text': title}},
-            {'updateTextStyle': {
-                'objectId': title_box_id,
-                'style': {
-                    'foregroundColor': {'opaqueColor': {'rgbColor': {'red': 1.0, 'green': 1.0, 'blue': 1.0}}},
-                    'fontSize': {'magnitude': 26, 'unit': 'PT'}, # Scaled down for professionalism
-                    'bold': True,
-                    'fontFamily': 'Montserrat'
                 },
-                'fields': 'foregroundColor,fontSize,bold,fontFamily'
-            }}
-        ])
-        
-        # 2. Body Positioning (Increased translateY to 1.6M EMU to leave clearance for title)
-        requests.extend([
-            {
-                'createShape': {
-                    'objectId': body_box_id,
-                    'shapeType': 'TEXT_BOX',
-                    'elementProperties': {
-                        'pageObjectId': slide_id,
-                        'size': {
-                            'height': {'magnitude': 3000000, 'unit': 'EMU'}, 
-                            'width': {'magnitude': 4100000 if image_url else 8000000, 'unit': 'EMU'}
-                        },
-                        'transform': {'scaleX': 1, 'scaleY': 1, 'translateX': 400000, 'translateY': 1750000, 'unit': 'EMU'}
-                    }
+                'fields': 'pageBackgroundFill.solidFill.color'
+            }
+        }
+    ]
+    
+    # Textbox IDs
+    title_box_id = f"title_{slide_id}"
+    body_box_id = f"body_{slide_id}"
+    
+    # 1. Title Positioning (Shifted slightly and smaller font to avoid overlap)
+    requests.extend([
+        {
+            'createShape': {
+                'objectId': title_box_id,
+                'shapeType': 'TEXT_BOX',
+                'elementProperties': {
+                    'pageObjectId': slide_id,
+                    'size': {'height': {'magnitude': 1200000, 'unit': 'EMU'}, 'width': {'magnitude': 4500000 if image_url else 8500000, 'unit': 'EMU'}},
+                    'transform': {'scaleX': 1, 'scaleY': 1, 'translateX': 400000, 'translateY': 350000, 'unit': 'EMU'}
                 }
+            }
+        },
+        {'insertText': {'objectId': title_box_id, 'text': title}},
+        {'updateTextStyle': {
+            'objectId': title_box_id,
+            'style': {
+                'foregroundColor': {'opaqueColor': {'rgbColor': {'red': 1.0, 'green': 1.0, 'blue': 1.0}}},
+                'fontSize': {'magnitude': 26, 'unit': 'PT'}, # Scaled down for professionalism
+                'bold': True,
+                'fontFamily': 'Montserrat'
             },
-            {'insertText': {'objectId': body_box_id, 'text': cleaned_body}},
-            {'updateTextStyle': {
-                'objectId': body_box_id,
-                'style': {
-                    'foregroundColor': {'opaqueColor': {'rgbColor': {'red': 0.88, 'green': 0.88, 'blue': 0.92}}},
-                    'fontSize': {'magnitude': 13, 'unit': 'PT'},
-                    'fontFamily': 'Roboto'
-                },
-                'fields': 'foregroundColor,fontSize,fontFamily'
-            }}
-        ])
-        
-        # Apply native Slide bullets
-        requests.append({
-            'createParagraphBullets': {
+            'fields': 'foregroundColor,fontSize,bold,fontFamily'
+        }}
+    ])
+    
+    # 2. Body Positioning (Increased translateY to 1.6M EMU to leave clearance for title)
+    requests.extend([
+        {
+            'createShape': {
                 'objectId': body_box_id,
-                'textRange': {'type': 'ALL'},
-                'bulletPreset': 'BULLET_DISC_CIRCLE_SQUARE'
-            }
-        })
-        
-        # 3. Image (Cinematic Side Banner - Properly proportioned)
-        if image_url:
-            img_id = f"img_{slide_id}"
-            requests.append({
-                'createImage': {
-                    'objectId': img_id,
-                    'url': image_url,
-                    'elementProperties': {
-                        'pageObjectId': slide_id,
-                        'size': {
-                            'height': {'magnitude': 5143500, 'unit': 'EMU'}, 
-                            'width': {'magnitude': 4400000, 'unit': 'EMU'}
-                        },
-                        'transform': {
-                            'scaleX': 1,
-                            'scaleY': 1,
-                            'translateX': 5100000, 
-                            'translateY': 0,
-                            'unit': 'EMU'
-                        }
-                    }
-                }
-            })
-            
-        # 4. Accent Line (Positioned below title for visual structure)
-        line_id = f"line_{slide_id}"
-        requests.append({
-            'createLine': {
-                'objectId': line_id,
-                'lineCategory': 'STRAIGHT',
+                'shapeType': 'TEXT_BOX',
                 'elementProperties': {
                     'pageObjectId': slide_id,
-                    'size': {'height': {'magnitude': 0, 'unit': 'EMU'}, 'width': {'magnitude': 3500000, 'unit': 'EMU'}},
-                    'transform': {'scaleX': 1, 'scaleY': 1, 'translateX': 400000, 'translateY': 1625000, 'unit': 'EMU'}
+                    'size': {
+                        'height': {'magnitude': 3000000, 'unit': 'EMU'}, 
+                        'width': {'magnitude': 4100000 if image_url else 8000000, 'unit': 'EMU'}
+                    },
+                    'transform': {'scaleX': 1, 'scaleY': 1, 'translateX': 400000, 'translateY': 1750000, 'unit': 'EMU'}
                 }
             }
-        })
+        },
+        {'insertText': {'objectId': body_box_id, 'text': cleaned_body}},
+        {'updateTextStyle': {
+            'objectId': body_box_id,
+            'style': {
+                'foregroundColor': {'opaqueColor': {'rgbColor': {'red': 0.88, 'green': 0.88, 'blue': 0.92}}},
+                'fontSize': {'magnitude': 13, 'unit': 'PT'},
+                'fontFamily': 'Roboto'
+            },
+            'fields': 'foregroundColor,fontSize,fontFamily'
+        }}
+    ])
+    
+    # Apply native Slide bullets
+    requests.append({
+        'createParagraphBullets': {
+            'objectId': body_box_id,
+            'textRange': {'type': 'ALL'},
+            'bulletPreset': 'BULLET_DISC_CIRCLE_SQUARE'
+        }
+    })
+    
+    # 3. Image (Cinematic Side Banner - Properly proportioned)
+    if image_url:
+        img_id = f"img_{slide_id}"
         requests.append({
-            'updateLineProperties': {
-                'objectId': line_id,
-                'lineProperties': {
-                    'lineFill': {
-                        'solidFill': {'color': {'rgbColor': {'red': 0.3, 'green': 0.6, 'blue': 1.0}}}
+            'createImage': {
+                'objectId': img_id,
+                'url': image_url,
+                'elementProperties': {
+                    'pageObjectId': slide_id,
+                    'size': {
+                        'height': {'magnitude': 5143500, 'unit': 'EMU'}, 
+                        'width': {'magnitude': 4400000, 'unit': 'EMU'}
                     },
-                    'weight': {'magnitude': 1.5, 'unit': 'PT'}
-                },
-                'fields': 'lineFill,weight'
+                    'transform': {
+                        'scaleX': 1,
+                        'scaleY': 1,
+                        'translateX': 5100000, 
+                        'translateY': 0,
+                        'unit': 'EMU'
+                    }
+                }
             }
         })
+        
+    # 4. Accent Line (Positioned below title for visual structure)
+    line_id = f"line_{slide_id}"
+    requests.append({
+        'createLine': {
+            'objectId': line_id,
+            'lineCategory': 'STRAIGHT',
+            'elementProperties': {
+                'pageObjectId': slide_id,
+                'size': {'height': {'magnitude': 0, 'unit': 'EMU'}, 'width': {'magnitude': 3500000, 'unit': 'EMU'}},
+                'transform': {'scaleX': 1, 'scaleY': 1, 'translateX': 400000, 'translateY': 1625000, 'unit': 'EMU'}
+            }
+        }
+    })
+    requests.append({
+        'updateLineProperties': {
+            'objectId': line_id,
+            'lineProperties': {
+                'lineFill': {
+                    'solidFill': {'color': {'rgbColor': {'red': 0.3, 'green': 0.6, 'blue': 1.0}}}
+                },
+                'weight': {'magnitude': 1.5, 'unit': 'PT'}
+            },
+            'fields': 'lineFill,weight'
+        }
+    })
+    if insertion_index is not None:
+        requests[0]['createSlide']['insertionIndex'] = insertion_index
+    return requests
 
+def add_slide_to_presentation(user_id: str, presentation_id: str, title: str, body: str, image_url: str = None) -> bool:
+    """Appends a slide to a presentation."""
+    service = get_google_service(user_id, "slides", "v1")
+    if not service:
+        return False
+        
+    try:
+        requests = _slide_requests(str(uuid.uuid4()), title, body, image_url)
         service.presentations().batchUpdate(presentationId=presentation_id, body={'requests': requests}).execute()
         return True
     except Exception as e:
         logger.error(f"Error adding slide to {presentation_id}: {e}")
         return False
 
+def _without_images(requests: list) -> list:
+    return [r for r in requests if 'createImage' not in r]
+
+def build_presentation(user_id: str, title: str, slides: list) -> dict:
+    """
+    Creates a presentation holding `slides` (dicts with 'title', 'body' and optional 'image_url')
+    in order. The default title slide is removed and the deck is built with as few
+    batchUpdate calls as SLIDES_MAX_BATCH_REQUESTS allows (one for typical decks).
+    Returns id, link and name, or an error; a deck that fails part-way is deleted again.
+    """
+    if not slides:
+        return {"error": "The presentation has no slides."}
+    service = get_google_service(user_id, "slides", "v1")
+    if not service:
+        return {"error": "Google APIs not connected."}
+
+    presentation_id = None
+    try:
+        presentation = service.presentations().create(body={'title': title}).execute()
+        presentation_id = presentation.get('presentationId')
+
+        batches = [[{'deleteObject': {'objectId': s['objectId']}} for s in presentation.get('slides', [])]]
+        for index, slide in enumerate(slides):
+            # insertText rejects empty strings, which would fail the whole batch
+            slide_requests = _slide_requests(
+                str(uuid.uuid4()), slide.get('title') or ' ', slide.get('body') or ' ',
+                slide.get('image_url'), insertion_index=index
+            )
+            # Split only between slides so each batch leaves the deck consistent
+            if len(batches[-1]) + len(slide_requests) > SLIDES_MAX_BATCH_REQUESTS:
+                batches.append([])
+            batches[-1].extend(slide_requests)
+
+        for requests in batches:
+            try:
+                service.presentations().batchUpdate(presentationId=presentation_id, body={'requests': requests}).execute()
+            except Exception as e:
+                # A batch is atomic, so one unreachable image URL would drop every slide in it
+                if not any('createImage' in r for r in requests):
+                    raise
+                logger.warning(f"Slides batch failed for {presentation_id}, retrying without images: {e}")
+                service.presentations().batchUpdate(
+                    presentationId=presentation_id, body={'requests': _without_images(requests)}
+                ).execute()
+
+        return {
+            "id": presentation_id,
+            "link": f"https://docs.google.com/presentation/d/{presentation_id}/edit",
+            "name": presentation.get('title', title)
+        }
+    except Exception as e:
+        logger.error(f"Error building Google Slides deck: {e}")
+        if presentation_id:
+            _discard_presentation(user_id, presentation_id)
+        return {"error": str(e)}
+
+def _discard_presentation(user_id: str, presentation_id: str):
+    """Deletes a half-built deck so a failed build leaves nothing behind in the user's Drive."""
+    try:
+        get_google_service(user_id, "drive", "v3").files().delete(fileId=presentation_id).execute()
+    except Exception as e:
+        logger.error(f"Could not delete unfinished presentation {presentation_id}: {e}")
+
 def create_google_sheet(user_id: str, title: str) -> dict:
     """Creates a new Google Sheet and returns its ID and link."""
     service = get_google_service(user_id, "sheets", "v4")
@@ -630,52 +1592,164 @@ def create_google_sheet(user_id: str, title: str) -> dict:
         logger.error(f"Error creating Google Sheet: {e}")
         return {"error": str(e)}
 
-def update_sheet_values(user_id: str, spreadsheet_id: str, values: list, range_name: str = "Sheet1!A1") -> bool:
-    """Updates a range of cells in a Google Sheet."""
+def get_sheet_info(user_id: str, spreadsheet_id: str, service=None) -> list[dict]:
+    """Lists a spreadsheet's tabs in order with their real sheetId, title and grid size."""
+    service = service or get_google_service(user_id, "sheets", "v4")
+    if not service:
+        return []
+    result = service.spreadsheets().get(
+        spreadsheetId=spreadsheet_id,
+        fields='sheets.properties(sheetId,title,index,gridProperties(rowCount,columnCount))'
+    ).execute()
+    return [
+        {
+            "sheet_id": props['sheetId'],
+            "title": props['title'],
+            "rows": props.get('gridProperties', {}).get('rowCount', 0),
+            "columns": props.get('gridProperties', {}).get('columnCount', 0),
+        }
+        for props in sorted((s['properties'] for s in result.get('sheets', [])), key=lambda p: p.get('index', 0))
+    ]
+
+def _find_sheet(sheets: list, title: str = None):
+    if not sheets:
+        return None
+    if title:
+        return next((s for s in sheets if s['title'] == title), None)
+    return sheets[0]
+
+def _a1_sheet(title: str) -> str:
+    return "'" + title.replace("'", "''") + "'"
+
+def _column_letter(index: int) -> str:
+    """0-based column index -> A1 letters (0 -> A, 26 -> AA)."""
+    letters = ""
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+def _column_index(letters: str) -> int:
+    index = 0
+    for ch in letters.upper():
+        index = index * 26 + (ord(ch) - 64)
+    return index - 1
+
+def _sheet_cell(value) -> dict:
+    # Same result as valueInputOption RAW: numbers stay numbers, everything else is text
+    if value is None or value == "":
+        return {}
+    if isinstance(value, bool):
+        return {'userEnteredValue': {'boolValue': value}}
+    if isinstance(value, (int, float)):
+        return {'userEnteredValue': {'numberValue': value}}
+    return {'userEnteredValue': {'stringValue': str(value)}}
+
+def _sheet_rows(rows: list) -> list:
+    return [{'values': [_sheet_cell(v) for v in (row if isinstance(row, list) else [row])]} for row in rows]
+
+def _header_format_request(sheet_id: int, row: int, start_col: int, num_cols: int) -> dict:
+    return {
+        'repeatCell': {
+            'range': {
+                'sheetId': sheet_id,
+                'startRowIndex': row,
+                'endRowIndex': row + 1,
+                'startColumnIndex': start_col,
+                'endColumnIndex': start_col + num_cols
+            },
+            'cell': {
+                'userEnteredFormat': {
+                    'textFormat': {'bold': True},
+                    'horizontalAlignment': 'CENTER',
+                    'backgroundColor': {'red': 0.9, 'green': 0.95, 'blue': 1.0}
+                }
+            },
+            'fields': 'userEnteredFormat.textFormat.bold,userEnteredFormat.horizontalAlignment,userEnteredFormat.backgroundColor'
+        }
+    }
+
+def write_sheet_rows(user_id: str, spreadsheet_id: str, rows: list, sheet_title: str = None,
+                     start_row: int = 0, start_col: int = 0, append: bool = False,
+                     format_header: bool = None) -> bool:
+    """
+    Writes (or, with `append`, appends after the last row with data) any number of rows.
+    Values, grid resizing and header formatting go out together in spreadsheets.batchUpdate
+    calls of at most SHEETS_MAX_CELLS_PER_BATCH cells, so large datasets never hit the
+    request size limit. The target tab is looked up by title (first tab by default).
+    The header row is bolded when writing from the top-left cell unless `format_header` says otherwise.
+    """
     service = get_google_service(user_id, "sheets", "v4")
     if not service:
         return False
-    
+    if not rows:
+        return True
+
     try:
-        body = {
-            'values': values
-        }
-        service.spreadsheets().values().update(
-            spreadsheetId=spreadsheet_id, 
-            range=range_name,
-            valueInputOption='RAW', 
-            body=body
-        ).execute()
-        
-        # Professional detail: Bold the header row if it's the start
-        if range_name.endswith("A1"):
-            num_cols = len(values[0]) if values else 0
-            if num_cols > 0:
-                bold_request = {
-                    'repeatCell': {
-                        'range': {
-                            'sheetId': 0, # Assuming first sheet
-                            'startRowIndex': 0,
-                            'endRowIndex': 1,
-                            'startColumnIndex': 0,
-                            'endColumnIndex': num_cols
-                        },
-                        'cell': {
-                            'userEnteredFormat': {
-                                'textFormat': {'bold': True},
-                                'horizontalAlignment': 'CENTER',
-                                'backgroundColor': {'red': 0.9, 'green': 0.95, 'blue': 1.0}
-                            }
-                        },
-                        'fields': 'userEnteredFormat.textFormat.bold,userEnteredFormat.horizontalAlignment,userEnteredFormat.backgroundColor'
-                    }
-                }
-                service.spreadsheets().batchUpdate(spreadsheetId=spreadsheet_id, body={'requests': [bold_request]}).execute()
-        
+        sheet = _find_sheet(get_sheet_info(user_id, spreadsheet_id, service), sheet_title)
+        if not sheet:
+            logger.error(f"Sheet '{sheet_title}' not found in {spreadsheet_id}")
+            return False
+        sheet_id = sheet['sheet_id']
+        width = max(len(row) if isinstance(row, list) else 1 for row in rows)
+        if format_header is None:
+            format_header = not append and start_row == 0 and start_col == 0
+
+        # Grow the grid up front: updateCells can't write past it (appendCells adds rows itself)
+        grid = {}
+        if start_col + width > sheet['columns']:
+            grid['columnCount'] = start_col + width
+        if not append and start_row + len(rows) > sheet['rows']:
+            grid['rowCount'] = start_row + len(rows)
+        requests = []
+        if grid:
+            requests.append({'updateSheetProperties': {
+                'properties': {'sheetId': sheet_id, 'gridProperties': grid},
+                'fields': ','.join(f'gridProperties.{k}' for k in grid)
+            }})
+        if format_header:
+            requests.append(_header_format_request(sheet_id, start_row, start_col, width))
+
+        rows_per_batch = max(1, SHEETS_MAX_CELLS_PER_BATCH // width)
+        for offset in range(0, len(rows), rows_per_batch):
+            chunk = _sheet_rows(rows[offset:offset + rows_per_batch])
+            if append:
+                requests.append({'appendCells': {'sheetId': sheet_id, 'rows': chunk, 'fields': 'userEnteredValue'}})
+            else:
+                requests.append({'updateCells': {
+                    'start': {'sheetId': sheet_id, 'rowIndex': start_row + offset, 'columnIndex': start_col},
+                    'rows': chunk,
+                    'fields': 'userEnteredValue'
+                }})
+            service.spreadsheets().batchUpdate(spreadsheetId=spreadsheet_id, body={'requests': requests}).execute()
+            requests = []
         return True
     except Exception as e:
-        logger.error(f"Error updating Google Sheet {spreadsheet_id}: {e}")
+        logger.error(f"Error writing rows to Google Sheet {spreadsheet_id}: {e}")
+        return False
+
+def update_sheet_values(user_id: str, spreadsheet_id: str, values: list, range_name: str = "A1") -> bool:
+    """
+    Writes rows starting at an A1 cell, optionally prefixed with a tab name ("Data!B2").
+    Without a tab name the first tab is used, whatever its (localized) title.
+    """
+    match = re.fullmatch(r"(?:(.+)!)?\$?([A-Za-z]+)\$?(\d+)", range_name)
+    if not match:
+        logger.error(f"Unsupported start cell '{range_name}' for {spreadsheet_id}")
         return False
+    sheet_title, col, row = match.groups()
+    if sheet_title and sheet_title.startswith("'") and sheet_title.endswith("'"):
+        sheet_title = sheet_title[1:-1].replace("''", "'")
+    return write_sheet_rows(
+        user_id, spreadsheet_id, values, sheet_title=sheet_title,
+        start_row=int(row) - 1, start_col=_column_index(col)
+    )
+
+def append_sheet_rows(user_id: str, spreadsheet_id: str, rows: list, sheet_title: str = None) -> bool:
+    """Appends rows after the last row with data, in size-bounded batches."""
+    return write_sheet_rows(user_id, spreadsheet_id, rows, sheet_title=sheet_title, append=True)
+
 def search_contacts(user_id: str, query: str) -> list[dict]:
     """Searches for contacts by name or email using the People API."""
     service = get_google_service(user_id, "people", "v1")
@@ -718,16 +1792,9 @@ def get_contact_by_name(user_id: str, name: str) -> dict:
 
 def upload_file_binary(user_id: str, content: bytes, filename: str, mime_type: str) -> str:
     """Uploads raw bytes to Google Drive and returns the file ID."""
-    service = get_google_service(user_id, "drive", "v3")
-    if not service:
-        return None
-    from googleapiclient.http import MediaIoBaseUpload
     from io import BytesIO
     try:
-        file_metadata = {'name': filename}
-        media = MediaIoBaseUpload(BytesIO(content), mimetype=mime_type, resumable=True)
-        file = service.files().create(body=file_metadata, media_body=media, fields='id').execute()
-        return file.get('id')
+        return upload_stream_to_drive(user_id, BytesIO(content), filename, mime_type)['id']
     except Exception as e:
         logger.error(f"Error uploading binary file to Drive: {e}")
         return None
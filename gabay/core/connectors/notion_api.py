@@ -6,6 +6,10 @@ from gabay.core.connectors.token_manager import token_manager
 
 logger = logging.getLogger(__name__)
 
+# Local page index: first-sync cap, and how stale a search may read it
+NOTION_INDEX_BACKFILL = 2000
+NOTION_INDEX_MAX_AGE = 60
+
 def get_notion_config(user_id: str = "local"):
     return token_manager.get_token("notion", user_id) or {}
 
@@ -51,30 +55,106 @@ def append_to_database(user_id: str, content: str) -> str:
         logger.error(f"Notion append error: {e}")
         return f"Error appending to Notion: {str(e)}"
 
+def _notion_page_entry(page: dict) -> dict:
+    # Extract title
+    properties = page.get("properties", {})
+    title = "Untitled"
+    for prop in properties.values():
+        if prop.get("type") == "title" and prop.get("title"):
+            title = prop["title"][0]["plain_text"]
+            break
+    return {
+        "id": page.get("id"),
+        "title": title,
+        "link": page.get("url"),
+        "modified_at": page.get("last_edited_time"),
+    }
+
 def search_notion(user_id: str, query: str) -> list[dict]:
-    client = get_notion_client()
+    """Searches Notion pages, trying the local index before the API."""
+    local = []
+    try:
+        if sync_notion_index(user_id):
+            from gabay.core.database import db
+            local = db.search_documents(int(user_id), "notion", query)
+            # A capped first sync may be missing matches, so it only adds to the live results
+            if local and db.get_document_sync_state(int(user_id), "notion")["complete"]:
+                return local
+    except Exception as e:
+        logger.warning(f"Notion index unavailable for user {user_id}, searching live: {e}")
+
+    client = get_notion_client(user_id)
     if not client:
-        return []
+        return local
         
     try:
-        results = client.search(query=query, filter={"property": "object", "value": "page"}).execute()
+        results = client.search(query=query, filter={"property": "object", "value": "page"})
         pages = results.get("results", [])
-        
-        parsed_results = []
-        for page in pages:
-            # Extract title
-            properties = page.get("properties", {})
-            title = "Untitled"
-            for prop in properties.values():
-                if prop.get("type") == "title" and prop.get("title"):
-                    title = prop["title"][0]["plain_text"]
-                    break
-            
-            parsed_results.append({
-                "title": title,
-                "link": page.get("url")
-            })
-        return parsed_results
+        seen = {page["id"] for page in local}
+        return local + [_notion_page_entry(page) for page in pages if page.get("id") not in seen]
     except Exception as e:
         logger.error(f"Notion search error: {e}")
         return []
+
+def sync_notion_index(user_id: str, force: bool = False, bootstrap: bool = False) -> bool:
+    """
+    Brings the user's local Notion index up to date by reading pages newest-edited first
+    and stopping at the last sync's high-water mark. Syncs at most every
+    NOTION_INDEX_MAX_AGE seconds unless `force` is set; a missing index is only built
+    with `bootstrap`. Only users who connected their own workspace are indexed.
+    Returns True if the index can be queried.
+    """
+    from gabay.core.database import db
+
+    # The NOTION_API_KEY fallback belongs to the host's workspace, not to this user
+    if not get_notion_config(user_id).get("api_key"):
+        return False
+
+    uid = int(user_id)
+    with token_manager.lock(f"notion-index-{user_id}"):
+        state = db.get_document_sync_state(uid, "notion")
+        if state and not force and state["age"] < NOTION_INDEX_MAX_AGE:
+            return True
+        if not state and not bootstrap:
+            return False
+
+        client = get_notion_client(user_id)
+        if not client:
+            return bool(state)
+
+        since = state["cursor"] if state else None
+        newest = since
+        pages = {}
+        archived = []
+        start_cursor = None
+        while True:
+            params = {"start_cursor": start_cursor} if start_cursor else {}
+            resp = client.search(
+                filter={"property": "object", "value": "page"},
+                sort={"direction": "descending", "timestamp": "last_edited_time"},
+                page_size=100,
+                **params
+            )
+            reached_since = False
+            for page in resp.get("results", []):
+                edited = page.get("last_edited_time") or ""
+                # Edit times are minute-granular, so pages at the mark itself are re-read
+                if since and edited < since:
+                    reached_since = True
+                    break
+                newest = max(newest or edited, edited)
+                if page.get("archived") or page.get("in_trash"):
+                    archived.append(page["id"])
+                else:
+                    pages[page["id"]] = _notion_page_entry(page)
+            # Only the first sync is capped; an incremental one must reach the mark
+            capped = not state and len(pages) >= NOTION_INDEX_BACKFILL
+            if reached_since or capped or not resp.get("has_more"):
+                break
+            start_cursor = resp.get("next_cursor")
+
+        db.upsert_documents(uid, "notion", list(pages.values()))
+        db.delete_documents(uid, "notion", archived)
+        db.set_document_sync_state(uid, "notion", newest, complete=None if state else not capped)
+        return True
+
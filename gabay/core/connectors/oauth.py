@@ -165,6 +165,9 @@ def google_callback(request: Request):
     # creds.to_json() returns a string, we need a dict for token_manager
     token_data = json.loads(creds.to_json())
     token_manager.save_token("google", user_id, token_data)
+    # The new grant may be for a different account: rebuild the Drive index from scratch
+    from gabay.core.connectors.google_api import clear_google_indexes
+    clear_google_indexes(user_id)
     
     return HTMLResponse("<html><body><h2>Google Account Linked Successfully! You can close this window.</h2></body></html>")
 
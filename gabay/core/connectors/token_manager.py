@@ -1,10 +1,21 @@
 import json
 import logging
+import os
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 from gabay.core.config import settings
 
+try:
+    import fcntl
+except ImportError:  # Windows: locks only cover threads of this process
+    fcntl = None
+
 logger = logging.getLogger(__name__)
 
+_thread_locks = {}
+_thread_locks_guard = threading.Lock()
+
 class TokenManager:
     def __init__(self):
         self.secrets_dir = Path(settings.data_dir) / "secrets"
@@ -14,29 +25,74 @@ class TokenManager:
             with open(self.tokens_file, "w") as f:
                 json.dump({}, f)
 
+    @contextmanager
+    def lock(self, name: str = "tokens"):
+        """
+        Exclusive lock shared by every thread and process using this data dir.
+        Used for read-modify-write of tokens.json and for single-flight token refreshes.
+        """
+        with _thread_locks_guard:
+            thread_lock = _thread_locks.setdefault(name, threading.Lock())
+        with thread_lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self.secrets_dir / f"{name}.lock", "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
     def _read_tokens(self) -> dict:
         with open(self.tokens_file, "r") as f:
             return json.load(f)
 
     def _write_tokens(self, data: dict):
-        with open(self.tokens_file, "w") as f:
+        # Atomic replace so readers never see a half-written file
+        tmp_file = self.tokens_file.with_suffix(".json.tmp")
+        with open(tmp_file, "w") as f:
             json.dump(data, f, indent=4)
+        os.replace(tmp_file, self.tokens_file)
 
     def save_token(self, provider: str, user_id: str, token_data: dict):
         """
         Save OAuth tokens for a specific provider and user.
         """
-        data = self._read_tokens()
-        if user_id not in data:
-            data[user_id] = {}
-        data[user_id][provider] = token_data
-        self._write_tokens(data)
+        with self.lock():
+            data = self._read_tokens()
+            if user_id not in data:
+                data[user_id] = {}
+            data[user_id][provider] = token_data
+            self._write_tokens(data)
         logger.info(f"Saved token for {provider} (user: {user_id})")
 
+    def version(self) -> int:
+        """Changes whenever tokens.json is written (by any process); used to validate caches."""
+        return self.tokens_file.stat().st_mtime_ns
+
     def get_token(self, provider: str, user_id: str) -> dict:
         data = self._read_tokens()
         return data.get(str(user_id), {}).get(provider)
 
+    def mark_invalid(self, provider: str, user_id: str):
+        """
+        Flags a stored token as revoked/expired so background jobs stop using it.
+        The flag is cleared naturally when the user re-pairs (save_token overwrites it).
+        """
+        with self.lock():
+            data = self._read_tokens()
+            token_data = data.get(str(user_id), {}).get(provider)
+            if token_data is None or token_data.get("invalid"):
+                return
+            token_data["invalid"] = True
+            self._write_tokens(data)
+        logger.warning(f"Marked {provider} token invalid (user: {user_id})")
+
+    def is_valid(self, provider: str, user_id: str) -> bool:
+        token_data = self.get_token(provider, user_id)
+        return bool(token_data) and not token_data.get("invalid")
+
     def get_all_users(self) -> list:
         """Returns all user IDs that have at least one token stored."""
         data = self._read_tokens()
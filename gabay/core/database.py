@@ -134,14 +134,179 @@ class DatabaseManager:
                     focus_time_start TEXT, -- e.g. "09:00"
                     focus_time_end TEXT,   -- e.g. "11:00"
                     no_meetings_days TEXT, -- JSON list of strings (e.g ["Friday"])
+                    proactive_enabled INTEGER DEFAULT 1, -- 0 opts out of the proactive heartbeat
                     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             ''')
             
+            # 9. Voice Transcripts (keyed by Telegram's file_unique_id, stable across forwards)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS voice_transcripts (
+                    file_unique_id TEXT PRIMARY KEY,
+                    transcript TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # 10. Bulk Sends (userbot batches, persisted so they resume after a restart)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS bulk_send_batches (
+                    id TEXT PRIMARY KEY,
+                    user_id INTEGER NOT NULL,
+                    message_text TEXT NOT NULL,
+                    status TEXT DEFAULT 'running', -- 'queued', 'running' or 'completed'
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS bulk_send_recipients (
+                    batch_id TEXT NOT NULL,
+                    recipient TEXT NOT NULL,   -- display name
+                    target TEXT NOT NULL,      -- chat_id, username or phone
+                    status TEXT DEFAULT 'pending', -- 'pending', 'sent' or 'failed'
+                    error TEXT,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (batch_id, recipient)
+                )
+            ''')
+            
+            # 11. Gmail Sync Cursor (last seen historyId per user)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS gmail_sync_state (
+                    user_id INTEGER PRIMARY KEY,
+                    history_id TEXT NOT NULL,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # 12. Heartbeat Planner State (adaptive per-user proactive polling)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS heartbeat_state (
+                    user_id INTEGER PRIMARY KEY,
+                    next_run_at REAL DEFAULT 0,      -- unix timestamp of the next proactive run
+                    interval_seconds INTEGER DEFAULT 0,
+                    last_new_mail INTEGER DEFAULT 0, -- new emails found by the last proactive triage
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # 13. Meeting Briefing Ledger (one briefing per event occurrence, plus cached related docs)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS meeting_briefings (
+                    user_id INTEGER NOT NULL,
+                    event_id TEXT NOT NULL,
+                    event_start TEXT NOT NULL,    -- ISO start; a moved meeting gets a new row
+                    status TEXT DEFAULT 'scheduled', -- 'scheduled', 'sending', 'sent' or 'cancelled'
+                    send_at TEXT NOT NULL,        -- ISO time the briefing is due
+                    related_context TEXT,         -- cached search results for the event
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (user_id, event_id, event_start)
+                )
+            ''')
+
+            # 14. Gmail Mirror (local copy of message metadata, kept current by history sync)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS gmail_messages (
+                    user_id INTEGER NOT NULL,
+                    message_id TEXT NOT NULL,
+                    thread_id TEXT,
+                    sender TEXT,
+                    subject TEXT,
+                    date TEXT,                     -- raw Date header
+                    internal_date INTEGER,         -- ms since epoch, used for ordering and ranges
+                    labels TEXT DEFAULT ' ',       -- space-padded label ids, e.g. ' INBOX UNREAD '
+                    snippet TEXT,
+                    notified INTEGER DEFAULT 0,    -- already reported as new mail by triage
+                    PRIMARY KEY (user_id, message_id)
+                )
+            ''')
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_gmail_messages_date ON gmail_messages (user_id, internal_date)")
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='gmail_messages_fts'")
+            if not cursor.fetchone():
+                cursor.execute('''
+                    CREATE VIRTUAL TABLE gmail_messages_fts USING fts5(
+                        sender, subject, snippet,
+                        content='gmail_messages',
+                        content_rowid='rowid'
+                    )
+                ''')
+                cursor.execute('''
+                    CREATE TRIGGER IF NOT EXISTS gmail_messages_ai AFTER INSERT ON gmail_messages BEGIN
+                        INSERT INTO gmail_messages_fts(rowid, sender, subject, snippet) VALUES (new.rowid, new.sender, new.subject, new.snippet);
+                    END;
+                ''')
+                cursor.execute('''
+                    CREATE TRIGGER IF NOT EXISTS gmail_messages_ad AFTER DELETE ON gmail_messages BEGIN
+                        INSERT INTO gmail_messages_fts(gmail_messages_fts, rowid, sender, subject, snippet) VALUES('delete', old.rowid, old.sender, old.subject, old.snippet);
+                    END;
+                ''')
+                cursor.execute('''
+                    CREATE TRIGGER IF NOT EXISTS gmail_messages_au AFTER UPDATE OF sender, subject, snippet ON gmail_messages BEGIN
+                        INSERT INTO gmail_messages_fts(gmail_messages_fts, rowid, sender, subject, snippet) VALUES('delete', old.rowid, old.sender, old.subject, old.snippet);
+                        INSERT INTO gmail_messages_fts(rowid, sender, subject, snippet) VALUES (new.rowid, new.sender, new.subject, new.snippet);
+                    END;
+                ''')
+
+            # 15. Document Index (Drive files and Notion pages, optionally with extracted text)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS documents (
+                    user_id INTEGER NOT NULL,
+                    source TEXT NOT NULL,          -- 'drive' or 'notion'
+                    doc_id TEXT NOT NULL,
+                    title TEXT,
+                    mime_type TEXT,
+                    link TEXT,
+                    modified_at TEXT,
+                    content TEXT,                  -- extracted text, dropped when the document changes
+                    PRIMARY KEY (user_id, source, doc_id)
+                )
+            ''')
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='documents_fts'")
+            if not cursor.fetchone():
+                cursor.execute('''
+                    CREATE VIRTUAL TABLE documents_fts USING fts5(
+                        title, content,
+                        content='documents',
+                        content_rowid='rowid'
+                    )
+                ''')
+                cursor.execute('''
+                    CREATE TRIGGER IF NOT EXISTS documents_ai AFTER INSERT ON documents BEGIN
+                        INSERT INTO documents_fts(rowid, title, content) VALUES (new.rowid, new.title, new.content);
+                    END;
+                ''')
+                cursor.execute('''
+                    CREATE TRIGGER IF NOT EXISTS documents_ad AFTER DELETE ON documents BEGIN
+                        INSERT INTO documents_fts(documents_fts, rowid, title, content) VALUES('delete', old.rowid, old.title, old.content);
+                    END;
+                ''')
+                cursor.execute('''
+                    CREATE TRIGGER IF NOT EXISTS documents_au AFTER UPDATE OF title, content ON documents BEGIN
+                        INSERT INTO documents_fts(documents_fts, rowid, title, content) VALUES('delete', old.rowid, old.title, old.content);
+                        INSERT INTO documents_fts(rowid, title, content) VALUES (new.rowid, new.title, new.content);
+                    END;
+                ''')
+
+            # 16. Document Index Sync State (Drive changes page token / Notion last_edited_time)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS document_sync_state (
+                    user_id INTEGER NOT NULL,
+                    source TEXT NOT NULL,
+                    cursor TEXT,
+                    complete INTEGER DEFAULT 0,    -- 0 if the first sync stopped at its size cap
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (user_id, source)
+                )
+            ''')
+
             conn.commit()
         
         # Run migrations for existing databases
         self._migrate_reminders_table()
+        self._migrate_user_preferences_table()
+        self._migrate_gmail_sync_state_table()
+        self._migrate_bulk_send_batches_table()
 
     def _migrate_reminders_table(self):
         """Add new columns to reminders table if they don't exist."""
@@ -167,6 +332,50 @@ class DatabaseManager:
             
             conn.commit()
 
+    def _migrate_user_preferences_table(self):
+        """Add the proactive opt-out column to user_preferences if it doesn't exist."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("PRAGMA table_info(user_preferences)")
+            columns = [info['name'] for info in cursor.fetchall()]
+            if "proactive_enabled" not in columns:
+                logger.info("Migrating: Adding proactive_enabled to user_preferences table")
+                try:
+                    cursor.execute("ALTER TABLE user_preferences ADD COLUMN proactive_enabled INTEGER DEFAULT 1")
+                except Exception as e:
+                    logger.error(f"Error adding proactive_enabled to user_preferences: {e}")
+            conn.commit()
+
+    def _migrate_gmail_sync_state_table(self):
+        """Add the mirror coverage column to gmail_sync_state if it doesn't exist."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("PRAGMA table_info(gmail_sync_state)")
+            columns = [info['name'] for info in cursor.fetchall()]
+            if "mirror_since" not in columns:
+                logger.info("Migrating: Adding mirror_since to gmail_sync_state table")
+                try:
+                    # ms since epoch the mirror is complete from; NULL = not backfilled, 0 = whole mailbox
+                    cursor.execute("ALTER TABLE gmail_sync_state ADD COLUMN mirror_since INTEGER")
+                except Exception as e:
+                    logger.error(f"Error adding mirror_since to gmail_sync_state: {e}")
+            conn.commit()
+
+    def _migrate_bulk_send_batches_table(self):
+        """Add the owning-process column to bulk_send_batches if it doesn't exist."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("PRAGMA table_info(bulk_send_batches)")
+            columns = [info['name'] for info in cursor.fetchall()]
+            if "owner" not in columns:
+                logger.info("Migrating: Adding owner to bulk_send_batches table")
+                try:
+                    # Id of the userbot process sending the batch; NULL while queued
+                    cursor.execute("ALTER TABLE bulk_send_batches ADD COLUMN owner TEXT")
+                except Exception as e:
+                    logger.error(f"Error adding owner to bulk_send_batches: {e}")
+            conn.commit()
+
     # --- Message Operations ---
 
     def append_message(self, user_id: int, role: str, content: str):
@@ -188,6 +397,15 @@ class DatabaseManager:
             history.reverse()
             return history
 
+    def get_last_user_activity(self, user_id: int):
+        """Returns the UTC timestamp string of the user's latest message, or None."""
+        with self._get_connection() as conn:
+            row = conn.execute(
+                "SELECT MAX(created_at) AS last_at FROM messages WHERE user_id = ? AND role = 'user'",
+                (user_id,)
+            ).fetchone()
+            return row["last_at"] if row else None
+
     def search_messages(self, user_id: int, query: str, limit: int = 5):
         """Perform keyword search across user's history."""
         with self._get_connection() as conn:
@@ -299,6 +517,11 @@ class DatabaseManager:
             rows = conn.execute(query, params).fetchall()
             return [dict(row) for row in rows]
 
+    def get_reminder(self, reminder_id: str):
+        with self._get_connection() as conn:
+            row = conn.execute("SELECT * FROM reminders WHERE id = ?", (reminder_id,)).fetchone()
+            return dict(row) if row else None
+
     def update_reminder(self, reminder_id: str, updates: dict):
         with self._get_connection() as conn:
             fields = []
@@ -371,4 +594,423 @@ class DatabaseManager:
             data["no_meetings_days"] = json.loads(data["no_meetings_days"]) if data.get("no_meetings_days") else []
             return data
 
+    def is_proactive_enabled(self, user_id: int) -> bool:
+        with self._get_connection() as conn:
+            row = conn.execute("SELECT proactive_enabled FROM user_preferences WHERE user_id = ?", (user_id,)).fetchone()
+            return True if not row or row["proactive_enabled"] is None else bool(row["proactive_enabled"])
+
+    def set_proactive_enabled(self, user_id: int, enabled: bool):
+        with self._get_connection() as conn:
+            conn.execute('''
+                INSERT INTO user_preferences (user_id, proactive_enabled, updated_at)
+                VALUES (?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(user_id) DO UPDATE SET proactive_enabled=excluded.proactive_enabled, updated_at=excluded.updated_at
+            ''', (user_id, int(enabled)))
+            conn.commit()
+
+    # --- Voice Transcript Cache ---
+
+    def get_voice_transcript(self, file_unique_id: str):
+        with self._get_connection() as conn:
+            row = conn.execute(
+                "SELECT transcript FROM voice_transcripts WHERE file_unique_id = ?", (file_unique_id,)
+            ).fetchone()
+            return row["transcript"] if row else None
+
+    def save_voice_transcript(self, file_unique_id: str, transcript: str):
+        with self._get_connection() as conn:
+            conn.execute('''
+                INSERT OR REPLACE INTO voice_transcripts (file_unique_id, transcript)
+                VALUES (?, ?)
+            ''', (file_unique_id, transcript))
+            conn.commit()
+
+    # --- Bulk Send Operations ---
+
+    def create_bulk_batch(self, batch_id: str, user_id: int, message_text: str, recipients: dict,
+                          status: str = "running", owner: str = None):
+        with self._get_connection() as conn:
+            conn.execute(
+                "INSERT INTO bulk_send_batches (id, user_id, message_text, status, owner) VALUES (?, ?, ?, ?, ?)",
+                (batch_id, user_id, message_text, status, owner)
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO bulk_send_recipients (batch_id, recipient, target) VALUES (?, ?, ?)",
+                [(batch_id, name, str(target)) for name, target in recipients.items()]
+            )
+            conn.commit()
+
+    def get_bulk_batch(self, batch_id: str):
+        with self._get_connection() as conn:
+            row = conn.execute("SELECT * FROM bulk_send_batches WHERE id = ?", (batch_id,)).fetchone()
+            return dict(row) if row else None
+
+    def get_bulk_batches(self, status: str = None):
+        with self._get_connection() as conn:
+            if status:
+                rows = conn.execute("SELECT * FROM bulk_send_batches WHERE status = ?", (status,)).fetchall()
+            else:
+                rows = conn.execute("SELECT * FROM bulk_send_batches").fetchall()
+            return [dict(row) for row in rows]
+
+    def set_bulk_batch_status(self, batch_id: str, status: str):
+        with self._get_connection() as conn:
+            if status == "queued":
+                # Hand the batch back to whichever process owns the userbot next
+                conn.execute("UPDATE bulk_send_batches SET status = ?, owner = NULL WHERE id = ?", (status, batch_id))
+            else:
+                conn.execute("UPDATE bulk_send_batches SET status = ? WHERE id = ?", (status, batch_id))
+            conn.commit()
+
+    def claim_bulk_batch(self, batch_id: str, owner: str) -> bool:
+        """
+        Atomically takes over a queued batch, or a running one left behind by a previous owner.
+        Returns False if the batch is completed or already being sent by this owner.
+        """
+        with self._get_connection() as conn:
+            cursor = conn.execute('''
+                UPDATE bulk_send_batches SET status = 'running', owner = ?
+                WHERE id = ? AND status IN ('queued', 'running') AND (owner IS NULL OR owner != ?)
+            ''', (owner, batch_id, owner))
+            conn.commit()
+            return cursor.rowcount == 1
+
+    def get_bulk_recipients(self, batch_id: str):
+        with self._get_connection() as conn:
+            rows = conn.execute(
+                "SELECT * FROM bulk_send_recipients WHERE batch_id = ? ORDER BY rowid", (batch_id,)
+            ).fetchall()
+            return [dict(row) for row in rows]
+
+    def update_bulk_recipient(self, batch_id: str, recipient: str, status: str, error: str = None):
+        with self._get_connection() as conn:
+            conn.execute('''
+                UPDATE bulk_send_recipients SET status = ?, error = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE batch_id = ? AND recipient = ?
+            ''', (status, error, batch_id, recipient))
+            conn.commit()
+
+    # --- Gmail Sync Cursor ---
+
+    def get_gmail_history_id(self, user_id: int):
+        with self._get_connection() as conn:
+            row = conn.execute("SELECT history_id FROM gmail_sync_state WHERE user_id = ?", (user_id,)).fetchone()
+            return row["history_id"] if row else None
+
+    def set_gmail_history_id(self, user_id: int, history_id: str):
+        with self._get_connection() as conn:
+            conn.execute('''
+                INSERT INTO gmail_sync_state (user_id, history_id, updated_at)
+                VALUES (?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(user_id) DO UPDATE SET history_id=excluded.history_id, updated_at=excluded.updated_at
+            ''', (user_id, str(history_id)))
+            conn.commit()
+
+    def get_gmail_sync_state(self, user_id: int):
+        with self._get_connection() as conn:
+            row = conn.execute("SELECT * FROM gmail_sync_state WHERE user_id = ?", (user_id,)).fetchone()
+            return dict(row) if row else None
+
+    def set_gmail_mirror_since(self, user_id: int, mirror_since: int):
+        with self._get_connection() as conn:
+            conn.execute("UPDATE gmail_sync_state SET mirror_since = ? WHERE user_id = ?", (mirror_since, user_id))
+            conn.commit()
+
+    # --- Gmail Mirror ---
+
+    def _gmail_row_to_dict(self, row) -> dict:
+        return {
+            "id": row["message_id"],
+            "thread_id": row["thread_id"],
+            "subject": row["subject"],
+            "sender": row["sender"],
+            "date": row["date"],
+            "internal_date": row["internal_date"],
+            "labels": row["labels"].split(),
+            "snippet": row["snippet"],
+        }
+
+    def upsert_gmail_messages(self, user_id: int, messages: list, notified: bool = False):
+        """Stores message metadata; rows that already exist keep their notified flag."""
+        with self._get_connection() as conn:
+            conn.executemany('''
+                INSERT INTO gmail_messages (user_id, message_id, thread_id, sender, subject, date, internal_date, labels, snippet, notified)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(user_id, message_id) DO UPDATE SET
+                    thread_id=excluded.thread_id, sender=excluded.sender, subject=excluded.subject,
+                    date=excluded.date, internal_date=excluded.internal_date, labels=excluded.labels,
+                    snippet=excluded.snippet
+            ''', [
+                (user_id, m["id"], m.get("thread_id"), m.get("sender"), m.get("subject"), m.get("date"),
+                 m.get("internal_date"), f" {' '.join(m.get('labels', []))} ", m.get("snippet"), int(notified))
+                for m in messages
+            ])
+            conn.commit()
+
+    def update_gmail_labels(self, user_id: int, changes: list):
+        """Replays label changes in order; changes is [(message_id, added_ids, removed_ids)]."""
+        with self._get_connection() as conn:
+            for message_id, added, removed in changes:
+                row = conn.execute(
+                    "SELECT labels FROM gmail_messages WHERE user_id = ? AND message_id = ?",
+                    (user_id, message_id)
+                ).fetchone()
+                if not row:
+                    continue  # Older than the mirror
+                labels = [l for l in row["labels"].split() if l not in removed]
+                labels += [l for l in added if l not in labels]
+                conn.execute(
+                    "UPDATE gmail_messages SET labels = ? WHERE user_id = ? AND message_id = ?",
+                    (f" {' '.join(labels)} ", user_id, message_id)
+                )
+            conn.commit()
+
+    def delete_gmail_messages(self, user_id: int, message_ids: list):
+        with self._get_connection() as conn:
+            conn.executemany(
+                "DELETE FROM gmail_messages WHERE user_id = ? AND message_id = ?",
+                [(user_id, message_id) for message_id in message_ids]
+            )
+            conn.commit()
+
+    def clear_gmail_mirror(self, user_id: int):
+        with self._get_connection() as conn:
+            conn.execute("DELETE FROM gmail_messages WHERE user_id = ?", (user_id,))
+            conn.execute("UPDATE gmail_sync_state SET mirror_since = NULL WHERE user_id = ?", (user_id,))
+            conn.commit()
+
+    def search_gmail_mirror(self, user_id: int, labels_all: list = (), labels_none: list = (), senders: list = (),
+                            subjects: list = (), after_ms: int = None, before_ms: int = None,
+                            text: list = (), limit: int = 10):
+        """Newest-first search over the mirror; spam and trash are excluded, as in Gmail."""
+        where = ["m.user_id = ?"]
+        params = [user_id]
+        for label in labels_all:
+            where.append("m.labels LIKE ?")
+            params.append(f"% {label} %")
+        for label in list(labels_none) + ["SPAM", "TRASH"]:
+            where.append("m.labels NOT LIKE ?")
+            params.append(f"% {label} %")
+        for sender in senders:
+            where.append("m.sender LIKE ?")
+            params.append(f"%{sender}%")
+        for subject in subjects:
+            where.append("m.subject LIKE ?")
+            params.append(f"%{subject}%")
+        if after_ms is not None:
+            where.append("m.internal_date >= ?")
+            params.append(after_ms)
+        if before_ms is not None:
+            where.append("m.internal_date < ?")
+            params.append(before_ms)
+
+        join = ""
+        if text:
+            # Quote every term so user input is never parsed as FTS syntax
+            join = "JOIN gmail_messages_fts f ON m.rowid = f.rowid"
+            where.append("gmail_messages_fts MATCH ?")
+            params.append(" ".join('"' + t.replace('"', '""') + '"' for t in text))
+
+        with self._get_connection() as conn:
+            rows = conn.execute(f'''
+                SELECT m.* FROM gmail_messages m {join}
+                WHERE {" AND ".join(where)}
+                ORDER BY m.internal_date DESC
+                LIMIT ?
+            ''', params + [limit])
+            return [self._gmail_row_to_dict(row) for row in rows]
+
+    def take_new_gmail_messages(self, user_id: int, limit: int = 10):
+        """
+        Returns the newest unreported unread inbox messages and marks just those as reported;
+        any beyond `limit` are left for the next call.
+        """
+        with self._get_connection() as conn:
+            rows = conn.execute('''
+                SELECT rowid, * FROM gmail_messages
+                WHERE user_id = ? AND notified = 0 AND labels LIKE '% INBOX %' AND labels LIKE '% UNREAD %'
+                ORDER BY internal_date DESC
+                LIMIT ?
+            ''', (user_id, limit)).fetchall()
+            conn.executemany("UPDATE gmail_messages SET notified = 1 WHERE rowid = ?", [(row["rowid"],) for row in rows])
+            conn.commit()
+            return [self._gmail_row_to_dict(row) for row in rows]
+
+    # --- Document Index ---
+
+    def get_document_sync_state(self, user_id: int, source: str):
+        """Returns the sync cursor, completeness and age in seconds, or None before the first sync."""
+        with self._get_connection() as conn:
+            row = conn.execute('''
+                SELECT cursor, complete, (julianday('now') - julianday(updated_at)) * 86400 AS age
+                FROM document_sync_state WHERE user_id = ? AND source = ?
+            ''', (user_id, source)).fetchone()
+            return dict(row) if row else None
+
+    def set_document_sync_state(self, user_id: int, source: str, cursor: str, complete: bool = None):
+        with self._get_connection() as conn:
+            conn.execute('''
+                INSERT INTO document_sync_state (user_id, source, cursor, complete, updated_at)
+                VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(user_id, source) DO UPDATE SET
+                    cursor=excluded.cursor,
+                    complete=COALESCE(?, document_sync_state.complete),
+                    updated_at=excluded.updated_at
+            ''', (user_id, source, cursor, int(bool(complete)), None if complete is None else int(complete)))
+            conn.commit()
+
+    def upsert_documents(self, user_id: int, source: str, documents: list):
+        """Stores document metadata; extracted text is kept only while the document is unchanged."""
+        with self._get_connection() as conn:
+            conn.executemany('''
+                INSERT INTO documents (user_id, source, doc_id, title, mime_type, link, modified_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(user_id, source, doc_id) DO UPDATE SET
+                    title=excluded.title, mime_type=excluded.mime_type, link=excluded.link,
+                    content=CASE WHEN documents.modified_at IS excluded.modified_at THEN documents.content END,
+                    modified_at=excluded.modified_at
+            ''', [
+                (user_id, source, d["id"], d.get("title"), d.get("mimeType"), d.get("link"), d.get("modified_at"))
+                for d in documents
+            ])
+            conn.commit()
+
+    def delete_documents(self, user_id: int, source: str, doc_ids: list):
+        with self._get_connection() as conn:
+            conn.executemany(
+                "DELETE FROM documents WHERE user_id = ? AND source = ? AND doc_id = ?",
+                [(user_id, source, doc_id) for doc_id in doc_ids]
+            )
+            conn.commit()
+
+    def count_documents_without_content(self, user_id: int, source: str) -> int:
+        """Indexed documents of this source whose text hasn't been extracted (title-only matches)."""
+        with self._get_connection() as conn:
+            row = conn.execute(
+                "SELECT COUNT(*) AS n FROM documents WHERE user_id = ? AND source = ? AND content IS NULL",
+                (user_id, source)
+            ).fetchone()
+            return row["n"]
+
+    def clear_documents(self, user_id: int, source: str):
+        """Forgets a source's index and sync cursor, e.g. after the account is disconnected or replaced."""
+        with self._get_connection() as conn:
+            conn.execute("DELETE FROM documents WHERE user_id = ? AND source = ?", (user_id, source))
+            conn.execute("DELETE FROM document_sync_state WHERE user_id = ? AND source = ?", (user_id, source))
+            conn.commit()
+
+    def set_document_content(self, user_id: int, source: str, doc_id: str, content: str):
+        with self._get_connection() as conn:
+            conn.execute(
+                "UPDATE documents SET content = ? WHERE user_id = ? AND source = ? AND doc_id = ?",
+                (content, user_id, source, doc_id)
+            )
+            conn.commit()
+
+    def search_documents(self, user_id: int, source: str, query: str, limit: int = 5):
+        """Best-ranked documents whose title or text contains every word of the query (as a prefix)."""
+        terms = query.split()
+        if not terms:
+            return []
+        match = " ".join('"' + t.replace('"', '""') + '"*' for t in terms)
+        with self._get_connection() as conn:
+            rows = conn.execute('''
+                SELECT d.doc_id, d.title, d.mime_type, d.link
+                FROM documents d
+                JOIN documents_fts f ON d.rowid = f.rowid
+                WHERE d.user_id = ? AND d.source = ? AND documents_fts MATCH ?
+                ORDER BY rank
+                LIMIT ?
+            ''', (user_id, source, match, limit))
+            return [
+                {"id": row["doc_id"], "title": row["title"], "mimeType": row["mime_type"] or "", "link": row["link"] or ""}
+                for row in rows
+            ]
+
+    # --- Heartbeat Planner State ---
+
+    def get_heartbeat_state(self, user_id: int):
+        with self._get_connection() as conn:
+            row = conn.execute("SELECT * FROM heartbeat_state WHERE user_id = ?", (user_id,)).fetchone()
+            return dict(row) if row else None
+
+    def set_heartbeat_schedule(self, user_id: int, next_run_at: float, interval_seconds: int):
+        with self._get_connection() as conn:
+            conn.execute('''
+                INSERT INTO heartbeat_state (user_id, next_run_at, interval_seconds, updated_at)
+                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(user_id) DO UPDATE SET
+                    next_run_at=excluded.next_run_at,
+                    interval_seconds=excluded.interval_seconds,
+                    updated_at=excluded.updated_at
+            ''', (user_id, next_run_at, interval_seconds))
+            conn.commit()
+
+    def record_heartbeat_mail(self, user_id: int, new_mail: int):
+        with self._get_connection() as conn:
+            conn.execute('''
+                INSERT INTO heartbeat_state (user_id, last_new_mail, updated_at)
+                VALUES (?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(user_id) DO UPDATE SET last_new_mail=excluded.last_new_mail, updated_at=excluded.updated_at
+            ''', (user_id, new_mail))
+            conn.commit()
+
+    # --- Meeting Briefing Ledger ---
+
+    def claim_meeting_briefing(self, user_id: int, event_id: str, event_start: str, send_at: str) -> bool:
+        """Records a briefing for this event occurrence. Returns False if one already exists."""
+        with self._get_connection() as conn:
+            cursor = conn.execute('''
+                INSERT OR IGNORE INTO meeting_briefings (user_id, event_id, event_start, send_at)
+                VALUES (?, ?, ?, ?)
+            ''', (user_id, event_id, event_start, send_at))
+            conn.commit()
+            return cursor.rowcount == 1
+
+    def get_meeting_briefing(self, user_id: int, event_id: str, event_start: str):
+        with self._get_connection() as conn:
+            row = conn.execute(
+                "SELECT * FROM meeting_briefings WHERE user_id = ? AND event_id = ? AND event_start = ?",
+                (user_id, event_id, event_start)
+            ).fetchone()
+            return dict(row) if row else None
+
+    def transition_meeting_briefing(self, user_id: int, event_id: str, event_start: str, from_status: str, to_status: str) -> bool:
+        """Atomically moves a briefing between states; False if it wasn't in `from_status`."""
+        with self._get_connection() as conn:
+            cursor = conn.execute('''
+                UPDATE meeting_briefings SET status = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE user_id = ? AND event_id = ? AND event_start = ? AND status = ?
+            ''', (to_status, user_id, event_id, event_start, from_status))
+            conn.commit()
+            return cursor.rowcount == 1
+
+    def release_stale_meeting_briefings(self, user_id: int, older_than_seconds: int) -> int:
+        """Puts briefings left in 'sending' (worker crashed mid-send) back to 'scheduled'."""
+        with self._get_connection() as conn:
+            cursor = conn.execute('''
+                UPDATE meeting_briefings SET status = 'scheduled', updated_at = CURRENT_TIMESTAMP
+                WHERE user_id = ? AND status = 'sending' AND updated_at < datetime('now', ?)
+            ''', (user_id, f"-{older_than_seconds} seconds"))
+            conn.commit()
+            return cursor.rowcount
+
+    def get_briefing_context(self, user_id: int, event_id: str):
+        """Cached related-docs text for an event, shared across reschedules of the same event."""
+        with self._get_connection() as conn:
+            row = conn.execute('''
+                SELECT related_context FROM meeting_briefings
+                WHERE user_id = ? AND event_id = ? AND related_context IS NOT NULL
+                LIMIT 1
+            ''', (user_id, event_id)).fetchone()
+            return row["related_context"] if row else None
+
+    def save_briefing_context(self, user_id: int, event_id: str, event_start: str, context: str):
+        with self._get_connection() as conn:
+            conn.execute('''
+                UPDATE meeting_briefings SET related_context = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE user_id = ? AND event_id = ? AND event_start = ?
+            ''', (context, user_id, event_id, event_start))
+            conn.commit()
+
 db = DatabaseManager()
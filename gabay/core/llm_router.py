@@ -109,9 +109,11 @@ async def classify_intent(message: str, chat_history: list = None, current_utc:
             "If the intent is 'weather', command_args should be the location name (city/country) or 'current' if not specified. "
             "If the intent is 'message', command_args MUST be another JSON object containing "
             "'contact_name' (the name of the person) and 'message_text' (the message to send). "
+            "To message several people at once, use 'contact_names' (a list of names) instead of 'contact_name'. "
             "If the intent is 'read', command_args should be the source name: 'gmail', 'notion', or 'all'. "
             "If the intent is 'share', command_args MUST be a JSON object containing "
-            "'file_query' (name or keyword of file) and optionally 'contact_name' (who to share with). "
+            "'file_query' (name or keyword of file) and optionally 'contact_name' (who to share with) "
+            "or 'contact_names' (a list, to share with several people). "
             "If the intent is 'calendar', command_args MUST be a JSON object containing "
             "'action' ('read', 'create', or 'briefing'). "
             "For 'read' action, optionally include 'time_min' and 'time_max'. "
@@ -10,6 +10,9 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Starting Gabay Core FastAPI server...")
+    import asyncio
+    from gabay.core.connectors.google_api import preload_discovery_docs
+    await asyncio.to_thread(preload_discovery_docs)
     from gabay.core.telegram_bot import get_telegram_app, start_telegram_polling, stop_telegram_polling
     
     # Initialize the Telegram Bot application
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from gabay.core.connectors.imap_api import get_unread_emails_imap
 from gabay.core.connectors.google_api import get_unread_emails_full
@@ -11,11 +12,11 @@ async def generate_brief(user_id: str) -> str:
     Fetch unread emails via IMAP/Gmail API and Facebook notifications, 
     then use an LLM to summarize and prioritize them for the user.
     """
-    # Fetch from IMAP
-    emails_imap = get_unread_emails_imap()
-    
-    # Fetch from Gmail API
-    emails_google_raw = get_unread_emails_full(user_id)
+    # Fetch from IMAP and the Gmail API concurrently, off the event loop
+    emails_imap, emails_google_raw = await asyncio.gather(
+        asyncio.to_thread(get_unread_emails_imap),
+        asyncio.to_thread(get_unread_emails_full, user_id)
+    )
     emails_google = [f"From: {e['sender']} - Subject: {e['subject']}" for e in emails_google_raw]
     
     # Remove duplicates
@@ -1,6 +1,7 @@
 from gabay.core.connectors.calendar_api import get_events, create_event, get_raw_events
 from gabay.core.connectors.smtp_api import send_smtp_email
 from gabay.core.skills.search import execute_search
+import asyncio
 import logging
 import json
 from datetime import datetime, timezone, timedelta
@@ -66,41 +67,121 @@ def handle_calendar_skill(user_id: int, command_args_str: str) -> str:
         logger.error(f"Error in calendar skill: {e}")
         return f"Error interacting with calendar: {e}"
 
-async def handle_calendar_briefing(user_id: int):
+# How far ahead each sweep looks; covers the longest heartbeat interval plus the lead time
+BRIEFING_LOOKAHEAD = timedelta(hours=2)
+
+# Overdue 'scheduled' briefings older than this are assumed lost (e.g. worker restart) and re-queued
+BRIEFING_REQUEUE_GRACE = timedelta(minutes=5)
+
+# A briefing stuck in 'sending' this long was claimed by a worker that crashed mid-send
+BRIEFING_SENDING_TIMEOUT = timedelta(minutes=10)
+
+# How far ahead an on-demand briefing looks for the next meeting
+BRIEFING_ON_DEMAND_LOOKAHEAD = timedelta(days=1)
+
+async def handle_calendar_briefing(user_id: int, calendar_service=None) -> list[dict]:
     """
-    Proactively checks for upcoming meetings and sends a briefing with related documents.
+    Finds upcoming meetings and records one briefing per event occurrence in the ledger.
+    Returns the briefings the caller should schedule: [{'event_id', 'event_start', 'send_at'}].
     """
-    from gabay.core.utils.telegram import send_telegram_message
-    
+    from gabay.core.config import settings
+    from gabay.core.database import db
+
+    lead = timedelta(minutes=settings.meeting_briefing_lead_minutes)
+    due = []
     try:
-        # Check events in next 45 minutes
+        # Hand abandoned claims back so the overdue check below re-queues them
+        released = db.release_stale_meeting_briefings(user_id, int(BRIEFING_SENDING_TIMEOUT.total_seconds()))
+        if released:
+            logger.info(f"Released {released} stale briefing claim(s) for user {user_id}")
+
         now = datetime.now(timezone.utc)
-        soon = now + timedelta(minutes=45)
+        soon = now + lead + BRIEFING_LOOKAHEAD
         
-        events = get_raw_events(str(user_id), time_min=now.isoformat(), time_max=soon.isoformat())
-        if not events:
-            return
-            
+        events = await asyncio.to_thread(get_raw_events, str(user_id), time_min=now.isoformat(), time_max=soon.isoformat(), service=calendar_service)
         for event in events:
-            summary = event.get('summary', 'Meeting')
-            start_time_str = event['start'].get('dateTime', event['start'].get('date'))
-            
-            # 2. Extract context and search Docs
-            search_query = f"{summary} meeting notes proposal"
-            relevant_docs = await execute_search(str(user_id), search_query)
-            
-            briefing = f"📅 **Upcoming Meeting Briefing**\n\n"
-            briefing += f"**Event:** {summary}\n"
-            briefing += f"**Time:** {start_time_str}\n\n"
-            
-            if "I couldn't find" not in relevant_docs:
-                briefing += f"🔍 **Related Context Found:**\n{relevant_docs}\n"
-            else:
-                briefing += "🔍 No specific related documents found for this meeting.\n"
-                
-            briefing += "\n*Sent 30 mins before your meeting starts.*"
-            
-            send_telegram_message(user_id, briefing)
-            
+            start_time_str = event['start'].get('dateTime')
+            if not start_time_str:
+                continue  # All-day events have no meaningful T-minus
+            start = datetime.fromisoformat(start_time_str.replace("Z", "+00:00"))
+            if start <= now:
+                continue
+
+            send_at = max(start - lead, now)
+            if db.claim_meeting_briefing(user_id, event['id'], start_time_str, send_at.isoformat()):
+                due.append({"event_id": event['id'], "event_start": start_time_str, "send_at": send_at})
+                continue
+
+            entry = db.get_meeting_briefing(user_id, event['id'], start_time_str)
+            if entry and entry["status"] == "scheduled" and datetime.fromisoformat(entry["send_at"]) < now - BRIEFING_REQUEUE_GRACE:
+                logger.info(f"Re-queuing overdue briefing for event {event['id']} (user {user_id})")
+                due.append({"event_id": event['id'], "event_start": start_time_str, "send_at": now})
     except Exception as e:
         logger.error(f"Error in meeting briefing: {e}")
+    return due
+
+async def _compose_briefing(user_id: int, event: dict, event_start: str) -> str:
+    from gabay.core.database import db
+
+    summary = event.get('summary', 'Meeting')
+
+    # Related docs are searched once per event, not once per briefing attempt
+    relevant_docs = db.get_briefing_context(user_id, event['id'])
+    if relevant_docs is None:
+        search_query = f"{summary} meeting notes proposal"
+        relevant_docs = await execute_search(str(user_id), search_query)
+    db.save_briefing_context(user_id, event['id'], event_start, relevant_docs)
+
+    briefing = f"📅 **Upcoming Meeting Briefing**\n\n"
+    briefing += f"**Event:** {summary}\n"
+    briefing += f"**Time:** {event_start}\n\n"
+
+    if "I couldn't find" not in relevant_docs:
+        briefing += f"🔍 **Related Context Found:**\n{relevant_docs}\n"
+    else:
+        briefing += "🔍 No specific related documents found for this meeting.\n"
+    return briefing
+
+async def brief_next_meeting(user_id: int) -> str:
+    """Builds a briefing for the next upcoming meeting right away, whatever the ledger says."""
+    now = datetime.now(timezone.utc)
+    events = await asyncio.to_thread(
+        get_raw_events, str(user_id),
+        time_min=now.isoformat(), time_max=(now + BRIEFING_ON_DEMAND_LOOKAHEAD).isoformat()
+    )
+    for event in events:
+        start_time_str = event['start'].get('dateTime')
+        if start_time_str and datetime.fromisoformat(start_time_str.replace("Z", "+00:00")) > now:
+            return await _compose_briefing(user_id, event, start_time_str)
+    return "📅 You have no meetings coming up in the next day."
+
+async def send_meeting_briefing(user_id: int, event_id: str, event_start: str):
+    """
+    Sends the briefing for one event occurrence, at most once. Skips meetings that were
+    cancelled or moved since they were scheduled.
+    """
+    from gabay.core.config import settings
+    from gabay.core.database import db
+    from gabay.core.utils.telegram import send_telegram_message
+    from gabay.core.connectors.calendar_api import get_event
+
+    # Claim first so duplicate deliveries of the scheduled task don't double-send
+    if not db.transition_meeting_briefing(user_id, event_id, event_start, "scheduled", "sending"):
+        return
+
+    try:
+        event = await asyncio.to_thread(get_event, str(user_id), event_id)
+        if not event or event.get('status') == 'cancelled' or event['start'].get('dateTime') != event_start:
+            db.transition_meeting_briefing(user_id, event_id, event_start, "sending", "cancelled")
+            return
+
+        briefing = await _compose_briefing(user_id, event, event_start)
+        briefing += f"\n*Sent {settings.meeting_briefing_lead_minutes} mins before your meeting starts.*"
+        
+        await asyncio.to_thread(send_telegram_message, user_id, briefing)
+        db.transition_meeting_briefing(user_id, event_id, event_start, "sending", "sent")
+            
+    except Exception as e:
+        logger.error(f"Error sending meeting briefing for {event_id}: {e}")
+        # Hand it back so the next sweep re-queues it
+        db.transition_meeting_briefing(user_id, event_id, event_start, "sending", "scheduled")
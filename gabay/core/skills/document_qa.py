@@ -1,11 +1,16 @@
+import asyncio
 import logging
 import json
 from gabay.core.connectors.google_api import search_drive, download_drive_file
 from gabay.core.config import settings
+from gabay.core.database import db
 from gabay.core.utils.llm import get_llm_response
 
 logger = logging.getLogger(__name__)
 
+# Characters of a read document kept in the search index
+INDEXED_TEXT_LIMIT = 20000
+
 async def handle_document_qa_skill(user_id: int, command_args_str: str) -> str:
     """
     Handles fetching a document from Google Drive and answering a question about it.
@@ -20,7 +25,7 @@ async def handle_document_qa_skill(user_id: int, command_args_str: str) -> str:
             return "Which file would you like me to look at?"
             
         # Search for the file to get ID and MIME type
-        results = search_drive(str(user_id), file_query)
+        results = await asyncio.to_thread(search_drive, str(user_id), file_query)
         if not results:
             return f"I couldn't find any file matching '{file_query}' in your Google Drive."
             
@@ -43,15 +48,14 @@ async def handle_document_qa_skill(user_id: int, command_args_str: str) -> str:
         if not any(t in mime_type for t in supported_mimes):
             return f"The file '{file_name}' is a '{mime_type}', which I cannot read currently. I work best with text files, Google Docs, and Word Documents."
             
-        # Download the file content
-        content = download_drive_file(str(user_id), file_id, mime_type)
+        # Download the file content, capped so we don't blow up the LLM context.
+        # 128k context roughly equates to ~50k words. We'll play it safe at ~15k words/100k chars.
+        content = await asyncio.to_thread(download_drive_file, str(user_id), file_id, mime_type, max_chars=100000)
         if "Error downloading" in content or "Not connected" in content:
             return content
-            
-        # Truncate content if it's monstrously huge so we don't blow up the LLM context
-        # 128k context roughly equates to ~50k words. We'll play it safe at ~15k words/100k chars.
-        if len(content) > 100000:
-            content = content[:100000] + "... [Document Trunkated for Length]"
+
+        # Keep the text in the local index so later searches also match on content
+        await asyncio.to_thread(db.set_document_content, int(user_id), "drive", file_id, content[:INDEXED_TEXT_LIMIT])
             
         # Ask AI about the document
         system_prompt = (
@@ -1,8 +1,9 @@
+import asyncio
 import logging
 import json
 from gabay.core.connectors.smtp_api import send_smtp_email
 from gabay.core.connectors.google_api import (
-    search_drive, share_file, get_unread_emails_full, get_thread_messages
+    search_drive, share_file, get_unread_emails_full, get_thread_messages, sync_new_emails
 )
 from gabay.core.connectors.notion_api import search_notion
 from gabay.core.config import settings
@@ -54,9 +55,10 @@ def send_email_skill(user_id: str, email_data_str: str) -> str:
         logger.error(f"Error in send_email_skill: {e}")
         return "Sorry, I encountered an internal error drafting that email."
 
-async def handle_triage_skill(user_id: str, proactive: bool = False) -> str:
+async def handle_triage_skill(user_id: str, proactive: bool = False, gmail_service=None) -> str:
     """
     Categorizes unread emails based on user priorities and importance.
+    `gmail_service` lets the proactive sweep reuse a service it already built.
     """
     from gabay.core.database import db
     from gabay.core.utils.telegram import send_telegram_message
@@ -66,8 +68,13 @@ async def handle_triage_skill(user_id: str, proactive: bool = False) -> str:
         priorities = db.get_user_priorities(int(user_id))
         priorities_context = f"User Priorities: {', '.join(priorities)}" if priorities else "No specific priorities set."
 
-        # Fetch emails
-        emails = get_unread_emails_full(user_id, max_results=10)
+        # Fetch emails (the heartbeat only looks at mail that arrived since its last run)
+        if proactive:
+            emails = await asyncio.to_thread(sync_new_emails, user_id, max_results=10, service=gmail_service)
+            # Mail volume feeds the heartbeat planner's polling interval
+            db.record_heartbeat_mail(int(user_id), len(emails))
+        else:
+            emails = await asyncio.to_thread(get_unread_emails_full, user_id, max_results=10)
         if not emails:
             return "No unread emails to triage."
 
@@ -109,7 +116,7 @@ async def handle_triage_skill(user_id: str, proactive: bool = False) -> str:
             return "No urgent emails found."
 
         if proactive:
-            send_telegram_message(int(user_id), report)
+            await asyncio.to_thread(send_telegram_message, int(user_id), report)
             return report
         else:
             return report
@@ -124,7 +131,7 @@ async def handle_smart_draft_skill(user_id: str, thread_id: str, prompt: str) ->
     """
     try:
         # Fetch thread history
-        messages = get_thread_messages(user_id, thread_id)
+        messages = await asyncio.to_thread(get_thread_messages, user_id, thread_id)
         if not messages:
             return "I couldn't find that email thread to draft a reply."
             
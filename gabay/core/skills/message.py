@@ -1,7 +1,7 @@
 import logging
 import json
 from gabay.core.memory import get_contacts
-from gabay.core.utils.userbot import send_userbot_message
+from gabay.core.utils.userbot import send_userbot_message, userbot, format_bulk_report, SENT, QUEUED
 
 logger = logging.getLogger(__name__)
 
@@ -12,20 +12,30 @@ async def handle_message_skill(user_id: int, command_args_str: str) -> str:
     try:
         data = json.loads(command_args_str)
         contact_name = data.get("contact_name", "").lower()
+        contact_names = [n.lower() for n in data.get("contact_names") or [] if n]
         message_text = data.get("message_text", "")
         
-        if not contact_name or not message_text:
+        if not (contact_name or contact_names) or not message_text:
             return "Who do you want to message, and what should I say?"
             
         contacts = get_contacts(user_id)
+        
+        if len(contact_names) > 1:
+            recipients = {name: contacts.get(name) or name for name in contact_names}
+            report = await userbot.send_bulk(user_id, recipients, message_text)
+            return format_bulk_report(report)
+        contact_name = contact_name or contact_names[0]
+        
         # Try to get the chat_id from contacts, otherwise try to use the name directly
         recipient = contacts.get(contact_name) or contact_name
         
         # Send the message using Userbot
-        success = await send_userbot_message(recipient, message_text)
+        status = await send_userbot_message(recipient, message_text, user_id=user_id, name=contact_name)
         
-        if success:
+        if status == SENT:
             return f"Successfully sent message to {contact_name.capitalize()} via Userbot!"
+        elif status == QUEUED:
+            return f"Your message to {contact_name.capitalize()} is queued for my Userbot. I'll let you know once it's delivered."
         else:
             return f"I couldn't send the message to '{contact_name}'. Please make sure my API keys are correct and I am logged in."
         
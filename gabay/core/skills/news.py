@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from gabay.core.connectors.rss_api import fetch_feed
 from gabay.core.config import settings
@@ -12,7 +13,7 @@ async def handle_news_skill(topic: str) -> str:
     if not topic or str(topic).strip() == "":
         topic = "world" # Default topic
         
-    rss_text = fetch_feed(topic, max_items=5)
+    rss_text = await asyncio.to_thread(fetch_feed, topic, max_items=5)
     
     if "error" in rss_text.lower() or "couldn't find" in rss_text.lower():
         # Fallback if the feed failed
@@ -1,4 +1,5 @@
 import os
+import asyncio
 import logging
 from io import BytesIO
 from pypdf import PdfReader, PdfWriter
@@ -6,7 +7,7 @@ from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter
 import pytesseract
 from PIL import Image
-from gabay.core.connectors.google_api import get_google_service, download_drive_file, search_drive
+from gabay.core.connectors.google_api import get_google_service, download_drive_file, download_drive_file_bytes, search_drive
 from gabay.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -36,8 +37,9 @@ async def merge_pdfs(user_id: str, queries: list[str], output_name: str) -> str:
     writer = PdfWriter()
     found_files = []
     
-    for q in queries:
-        files = search_drive(user_id, q)
+    # Look every file up at once; each search is also memoized for the follow-up steps
+    searches = await asyncio.gather(*(asyncio.to_thread(search_drive, user_id, q) for q in queries))
+    for q, files in zip(queries, searches):
         pdf_files = [f for f in files if "pdf" in f.get("mimeType", "").lower()]
         if pdf_files:
             found_files.append(pdf_files[0])
@@ -122,11 +124,8 @@ async def ocr_pdf(user_id: str, query: str) -> str:
         return f"OCR Error: {e}. (PDF OCR requires pdf2image, not yet installed.)"
 
 def download_drive_file_binary(user_id: str, file_id: str) -> bytes:
-    """Download raw bytes from Drive."""
-    service = get_google_service(user_id, "drive", "v3")
-    if not service: return "Service missing"
+    """Download raw bytes from Drive, spooled and capped at settings.drive_download_max_bytes."""
     try:
-        request = service.files().get_media(fileId=file_id)
-        return request.execute()
+        return download_drive_file_bytes(user_id, file_id)
     except Exception as e:
         return str(e)
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from gabay.core.connectors.google_api import get_unread_emails_full
 from gabay.core.connectors.notion_api import search_notion
@@ -12,7 +13,7 @@ async def handle_read_skill(user_id: str, source: str = "all") -> str:
     
     if source in ("gmail", "all"):
         try:
-            emails = get_unread_emails_full(user_id)
+            emails = await asyncio.to_thread(get_unread_emails_full, user_id)
             if emails:
                 results.append("📬 **Recent Unread Emails (Gmail):**")
                 results.extend([f"• From: {e['sender']} - {e['subject']}" for e in emails])
@@ -29,7 +30,7 @@ async def handle_read_skill(user_id: str, source: str = "all") -> str:
             # Using search_notion with an empty query might return recent items if the API supports it,
             # but notion-client's search usually requires something or returns everything.
             # Let's try searching for " " or "*" or just empty.
-            notion_items = search_notion(user_id, "")
+            notion_items = await asyncio.to_thread(search_notion, user_id, "")
             if notion_items:
                 results.append("\n📝 **Recent Notion Pages:**")
                 results.extend([f"• [{item['title']}]({item['link']})" for item in notion_items])
@@ -9,6 +9,7 @@ from gabay.core.config import settings
 logger = logging.getLogger(__name__)
 
 from gabay.core.database import db
+from gabay.worker.scheduler import notify_reminders_changed
 
 def parse_relative_time(time_str):
     """
@@ -72,6 +73,7 @@ def handle_reminder_skill(user_id: str, command_args_str: str) -> str:
             }
             
             db.create_reminder(new_reminder)
+            notify_reminders_changed(new_reminder["id"])
             
             target_user = f"to {recipient}" if recipient else "for you"
             
@@ -109,6 +111,7 @@ def handle_reminder_skill(user_id: str, command_args_str: str) -> str:
             if not msg_to_delete:
                 return "Please specify which reminder to delete."
             db.delete_reminder(user_id=int(user_id), message_key=msg_to_delete)
+            notify_reminders_changed()
             return f"Requested deletion of reminders matching: '{msg_to_delete}'"
 
         return "Unknown reminder action."
@@ -7,10 +7,10 @@ logger = logging.getLogger(__name__)
 
 from gabay.core.database import db
 
-def save_file_or_text(user_id: str, file_path: str = None, text_content: str = None) -> str:
+def save_file_or_text(user_id: str, file_path: str = None, text_content: str = None, progress=None) -> str:
     """
     Determines if the payload is a file or text.
-    Files are uploaded to Google Drive.
+    Files are uploaded to Google Drive, calling `progress(fraction)` as chunks go up.
     Text notes are appended to a Notion database.
     """
     try:
@@ -26,7 +26,9 @@ def save_file_or_text(user_id: str, file_path: str = None, text_content: str = N
                 return f"Text file saved to Notion database: {url}"
             else:
                 # Media or binary -> Drive
-                url = upload_file_to_drive(user_id, file_path, mime_type or "application/octet-stream")
+                url = upload_file_to_drive(user_id, file_path, mime_type or "application/octet-stream", progress=progress)
+                if not url:
+                    return "Failed to upload the file to Google Drive. Please try again."
                 db.log_save(int(user_id), "drive", url)
                 return f"File uploaded to Google Drive Gabay folder: {url}"
                 
@@ -1,5 +1,6 @@
+import asyncio
 import logging
-from gabay.core.connectors.google_api import search_drive
+from gabay.core.connectors.google_api import search_drive_many
 from gabay.core.connectors.notion_api import search_notion
 from gabay.core.config import settings
 from gabay.core.utils.llm import get_llm_response
@@ -35,24 +36,19 @@ async def execute_search(user_id: str, query: str) -> str:
             logger.warning(f"Query expansion failed: {e}")
             expanded_queries = [query]
 
-        # 2. Consolidated Search
-        drive_results = []
+        # 2. Consolidated Search (every query against both sources at once)
+        queries = list(dict.fromkeys(q for q in expanded_queries if q))
+        drive_task = asyncio.to_thread(search_drive_many, user_id, queries)
+        notion_tasks = [asyncio.to_thread(search_notion, user_id, q) for q in queries]
+        drive_results, *notion_lists = await asyncio.gather(drive_task, *notion_tasks)
+
         notion_results = []
-        seen_drive_ids = set()
-        seen_notion_ids = set()
-        
-        for q in set(expanded_queries):
-            d_res = search_drive(user_id, q)
-            for r in d_res:
-                if r['id'] not in seen_drive_ids:
-                    drive_results.append(r)
-                    seen_drive_ids.add(r['id'])
-                    
-            n_res = search_notion(user_id, q)
+        seen_notion_links = set()
+        for n_res in notion_lists:
             for r in n_res:
-                if r['id'] not in seen_notion_ids:
+                if r['link'] not in seen_notion_links:
                     notion_results.append(r)
-                    seen_notion_ids.add(r['id'])
+                    seen_notion_links.add(r['link'])
         
         if not drive_results and not notion_results:
             admin_link = f"{settings.base_url}/admin?user_id={user_id}"
@@ -1,8 +1,9 @@
+import asyncio
 import logging
 import json
 from gabay.core.connectors.google_api import search_drive, share_file
 from gabay.core.memory import get_contacts
-from gabay.core.utils.userbot import send_userbot_message
+from gabay.core.utils.userbot import send_userbot_message, userbot, format_bulk_report, SENT, QUEUED
 
 logger = logging.getLogger(__name__)
 
@@ -17,15 +18,17 @@ async def handle_share_skill(user_id: int, command_args_str: str) -> str:
             data = json.loads(command_args_str)
             file_query = data.get("file_query", "")
             contact_name = data.get("contact_name", "").lower()
+            contact_names = [n.lower() for n in data.get("contact_names") or [] if n]
         except:
             file_query = command_args_str
             contact_name = ""
+            contact_names = []
             
         if not file_query:
             return "What file would you like me to share?"
             
         # Search for the file
-        results = search_drive(str(user_id), file_query)
+        results = await asyncio.to_thread(search_drive, str(user_id), file_query)
         if not results:
             return f"I couldn't find any file matching '{file_query}' in your Google Drive."
             
@@ -34,7 +37,7 @@ async def handle_share_skill(user_id: int, command_args_str: str) -> str:
         if not file_id:
             return "File found, but I couldn't retrieve its ID for sharing."
             
-        share_result = share_file(str(user_id), file_id)
+        share_result = await asyncio.to_thread(share_file, str(user_id), file_id)
         if "error" in share_result:
             return share_result["error"]
             
@@ -43,12 +46,21 @@ async def handle_share_skill(user_id: int, command_args_str: str) -> str:
         
         message = f"Here is the link to '{name}':\n{link}"
         
+        if len(contact_names) > 1:
+            contacts = get_contacts(user_id)
+            recipients = {n: contacts.get(n) or n for n in contact_names}
+            report = await userbot.send_bulk(user_id, recipients, message)
+            return f"Shared '{name}':\n{link}\n\n{format_bulk_report(report)}"
+        contact_name = contact_name or (contact_names[0] if contact_names else "")
+        
         if contact_name:
             contacts = get_contacts(user_id)
             recipient = contacts.get(contact_name) or contact_name
-            success = await send_userbot_message(recipient, message)
-            if success:
+            status = await send_userbot_message(recipient, message, user_id=user_id, name=contact_name)
+            if status == SENT:
                 return f"Successfully shared '{name}' with {contact_name.capitalize()}!"
+            elif status == QUEUED:
+                return f"I got the link for '{name}':\n{link}\n\nIt's queued for {contact_name.capitalize()}; I'll let you know once it's delivered."
             else:
                 return f"I got the link for '{name}':\n{link}\n\nBut I failed to send it to '{contact_name}'. Please ensure my Userbot is logged in."
         else:
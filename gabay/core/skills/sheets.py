@@ -1,13 +1,17 @@
+import asyncio
 import logging
 import json
-from gabay.core.connectors.google_api import create_google_sheet, update_sheet_values, share_file, search_gmail_full, get_sheet_values, add_chart_to_sheet
+from gabay.core.connectors.google_api import create_google_sheet, update_sheet_values, share_file, search_gmail_full, get_sheet_values, get_sheet_info, add_chart_to_sheet
 # ... existing imports ...
 
 async def handle_visualize_skill(user_id: int, spreadsheet_id: str, title: str = "Data Visualization") -> str:
     """Adds a chart to an existing Google Sheet."""
     try:
-        # We assume the data is in the first sheet (index 0)
-        success = add_chart_to_sheet(str(user_id), spreadsheet_id, 0, title, "Sheet1!A1:B10")
+        # Chart the first tab, using its real sheetId (only the very first tab is 0)
+        sheets = get_sheet_info(str(user_id), spreadsheet_id)
+        if not sheets:
+            return "I couldn't open that spreadsheet. Please check the link and your Google connection."
+        success = add_chart_to_sheet(str(user_id), spreadsheet_id, sheets[0]["sheet_id"], title, "A1:B10")
         if success:
             return f"✅ **Chart Generated!** I've added a professional visualization to your spreadsheet: [Open Sheet](https://docs.google.com/spreadsheets/d/{spreadsheet_id}/edit)"
         else:
@@ -22,6 +26,9 @@ from gabay.core.utils.telegram import send_telegram_message
 
 logger = logging.getLogger(__name__)
 
+# Sheet rows an automated report shows the LLM
+REPORT_PREVIEW_ROWS = 30
+
 async def handle_sheets_skill(user_id: int, topic: str, title: str = None, email_to: str = None, invite_email: str = None, share_mode: str = 'private', role: str = 'writer') -> str:
     """
     Handles creating a professional Google Sheet.
@@ -175,15 +182,20 @@ async def handle_auto_report_skill(user_id: int, spreadsheet_id: str, report_top
     try:
         # 1. Fetch data
         send_telegram_message(user_id, f"📊 **Generating Report:** I'm reading your spreadsheet for analysis on '{report_topic}'...")
-        values = get_sheet_values(str(user_id), spreadsheet_id)
+        # Only the rows shown to the LLM (plus one, to tell whether there are more) are read
+        values = await asyncio.to_thread(get_sheet_values, str(user_id), spreadsheet_id, max_rows=REPORT_PREVIEW_ROWS + 1)
         if not values:
             return "I couldn't find any data in that spreadsheet to analyze."
             
         # 2. Prepare data for LLM
         # Limiting to 30 rows to fit context nicely while being useful
         data_text = ""
-        for row in values[:30]:
+        for row in values[:REPORT_PREVIEW_ROWS]:
             data_text += " | ".join([str(cell) for cell in row]) + "\n"
+        if len(values) > REPORT_PREVIEW_ROWS:
+            sheets = await asyncio.to_thread(get_sheet_info, str(user_id), spreadsheet_id)
+            size = f"; the sheet has up to {sheets[0]['rows']} rows" if sheets else ""
+            data_text += f"... (only the first {REPORT_PREVIEW_ROWS} rows are shown{size})\n"
             
         # 3. LLM Analysis
         system_prompt = (
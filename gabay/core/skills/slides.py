@@ -1,7 +1,7 @@
 import logging
 import json
 import uuid
-from gabay.core.connectors.google_api import create_google_presentation, add_slide_to_presentation, share_file
+from gabay.core.connectors.google_api import build_presentation, share_file
 from gabay.core.config import settings
 from gabay.core.utils.llm import get_llm_response
 from gabay.core.utils.telegram import send_telegram_message
@@ -52,19 +52,9 @@ async def handle_slides_skill(user_id: int, topic: str, title: str = None, email
         if not slides:
             return "I couldn't generate any slides for this topic. Please try again."
 
-        # 2. Create the Presentation
-        send_telegram_message(user_id, "🔧 Creating Google Slides file...")
-        presentation_result = create_google_presentation(str(user_id), title)
-        if "error" in presentation_result:
-            return f"Failed to create presentation: {presentation_result['error']}"
-            
-        presentation_id = presentation_result["id"]
-        presentation_link = presentation_result["link"]
-
-        # 3. Add Slides Step-by-Step
-        num_slides = len(slides)
+        # 2. Lay out every slide, then create the whole deck in one go
+        deck = []
         for i, s in enumerate(slides):
-            send_telegram_message(user_id, f"✍️ Adding slide {i+1} of {num_slides}: **{s.get('title')}**...")
             s_title = s.get("title", f"Slide {i+1}")
             s_body = s.get("body", "")
             if isinstance(s_body, list):
@@ -73,12 +63,19 @@ async def handle_slides_skill(user_id: int, topic: str, title: str = None, email
             # Use Unsplash Source for beautiful, professional images
             image_query = s.get("image_query", topic).replace(" ", ",")
             image_url = f"https://loremflickr.com/800/600/{image_query}/all"
+            deck.append({"title": s_title, "body": s_body, "image_url": image_url})
 
-            add_slide_to_presentation(str(user_id), presentation_id, s_title, s_body, image_url=image_url)
+        send_telegram_message(user_id, f"🔧 Creating Google Slides file with {len(deck)} slides...")
+        presentation_result = build_presentation(str(user_id), title, deck)
+        if "error" in presentation_result:
+            return f"Failed to create presentation: {presentation_result['error']}"
+            
+        presentation_id = presentation_result["id"]
+        presentation_link = presentation_result["link"]
 
         result_msg = f"Professional presentation '{title}' created successfully!\nLink: {presentation_link}"
 
-        # 4. Hybrid Orchestration: Sharing & Invites
+        # 3. Hybrid Orchestration: Sharing & Invites
         target_invite = invite_email or email_to
         if target_invite:
             share_result = share_file(str(user_id), presentation_id, email=target_invite, role=role)
@@ -88,7 +85,7 @@ async def handle_slides_skill(user_id: int, topic: str, title: str = None, email
             share_file(str(user_id), presentation_id)
             result_msg += "\nI've made the presentation accessible to anyone with the link."
 
-        # 5. Hybrid Orchestration: Email Follow-up
+        # 4. Hybrid Orchestration: Email Follow-up
         if email_to:
             try:
                 subject = f"Presentation: {title}"
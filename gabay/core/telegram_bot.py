@@ -1,12 +1,12 @@
+import asyncio
 import logging
-import os
 from telegram import Update
 from telegram.ext import ApplicationBuilder, CommandHandler, MessageHandler, filters, ContextTypes
 from gabay.core.config import settings
 from gabay.core.memory import append_message, get_recent_history, get_user_state
 from gabay.core.llm_router import classify_intent
 from gabay.core.skills.reminders import handle_reminder_skill
-from gabay.core.utils.voice import transcribe_audio
+from gabay.core.utils.voice import transcribe_voice_note
 from gabay.core.utils.dispatcher import dispatch_task
 from gabay.worker.tasks import (
     process_brief, process_save, process_search, process_read, 
@@ -104,8 +104,8 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE, ove
 
     if intent in INTENT_MAP:
         task_func, response_text = INTENT_MAP[intent]
-        # Dispatch handles local vs worker execution automatically
-        await dispatch_task(task_func, user_id, args)
+        # Dispatch handles local vs worker execution automatically; duplicates get a direct reply
+        response_text = await dispatch_task(task_func, user_id, args, intent=intent) or response_text
     elif intent == "weather":
         from gabay.core.skills.weather import handle_weather_skill
         response_text = handle_weather_skill(args)
@@ -133,24 +133,14 @@ async def handle_voice(update: Update, context: ContextTypes.DEFAULT_TYPE):
     status_msg = await update.effective_message.reply_text("🎤 Listening... (Transcribing voice note)")
     
     try:
-        # 2. Download voice message
-        voice_file = await voice.get_file()
-        voice_path = f"data/voice_{user_id}_{voice_file.file_id}.ogg"
-        os.makedirs("data", exist_ok=True)
-        await voice_file.download_to_drive(voice_path)
+        # 2. Download into memory and transcribe (cached by file_unique_id)
+        transcribed_text = await transcribe_voice_note(voice)
         
-        # 3. Transcribe
-        transcribed_text = transcribe_audio(voice_path)
-        
-        # Cleanup
-        if os.path.exists(voice_path):
-            os.remove(voice_path)
-            
         if not transcribed_text:
             await status_msg.edit_text("❌ Sorry, I couldn't transcribe that voice note.")
             return
 
-        # 4. Process as normal message
+        # 3. Process as normal message
         await status_msg.edit_text(f"📝 Transcribed: {transcribed_text}")
         await handle_message(update, context, overridden_text=transcribed_text)
         
@@ -233,6 +223,18 @@ async def start_telegram_polling(application):
         await application.start()
         await application.updater.start_polling()
         logger.info("Telegram Bot is successfully polling for updates!")
+
+        if settings.embedded_mode:
+            # Tasks, reminders and the heartbeat all run in this process
+            from gabay.worker.embedded import executor
+            await executor.start(periodic=True)
+        
+        # This process owns the userbot: connect once up front so message/share intents skip
+        # the MTProto handshake, then deliver sends queued by workers and interrupted batches
+        from gabay.core.utils.userbot import userbot
+        if userbot.claim_ownership():
+            await userbot.start()
+            userbot.start_outbox()
     except Exception as e:
         logger.error(f"❌ Failed to start Telegram Bot: {e}")
         logger.warning("The Chat API is still running. You can fix your token at http://localhost:8000/setup/config")
@@ -250,6 +252,13 @@ async def stop_telegram_polling(application):
             await application.stop()
             
         await application.shutdown()
+
+        # Finish queued and running tasks before the process exits
+        from gabay.worker.embedded import executor
+        await executor.stop()
+        
+        from gabay.core.utils.userbot import userbot
+        await userbot.stop()
         logger.info("Telegram Bot stopped successfully.")
     except Exception as e:
         logger.warning(f"Error while stopping Telegram Bot: {e}")
@@ -0,0 +1,73 @@
+import hashlib
+import json
+import logging
+from gabay.core.utils.redis_client import get_redis, redis_enabled
+
+logger = logging.getLogger(__name__)
+
+# A resubmission within this window (same user, task and normalized args) is a duplicate
+DEDUP_WINDOW_SECONDS = 300
+
+# How long a finished task's result stays available for duplicates to reuse
+RESULT_TTL_SECONDS = 300
+
+_KEY_PREFIX = "gabay:dedup:"
+_RESULT_PREFIX = "gabay:result:"
+
+def _normalize(value) -> str:
+    if isinstance(value, str):
+        try:
+            # JSON args compare by content, not key order or spacing
+            return json.dumps(json.loads(value), sort_keys=True)
+        except (ValueError, TypeError):
+            return " ".join(value.lower().split())
+    return json.dumps(value, sort_keys=True, default=str)
+
+def dedup_key(task_name: str, args: tuple, kwargs: dict) -> str:
+    """Idempotency key for a submission; args[0] is the user id for every dispatched task."""
+    parts = [task_name] + [_normalize(a) for a in args] + [f"{k}={_normalize(v)}" for k, v in sorted(kwargs.items())]
+    return _KEY_PREFIX + hashlib.sha256("\x1f".join(parts).encode()).hexdigest()
+
+def claim(key: str, task_id: str):
+    """
+    Registers task_id as the owner of key (SET NX). Returns None if the claim succeeded,
+    or the task id that already owns it. Fails open when Redis is unavailable.
+    """
+    if not redis_enabled():
+        return None
+    try:
+        r = get_redis()
+        if r.set(key, task_id, nx=True, ex=DEDUP_WINDOW_SECONDS):
+            return None
+        return r.get(key)
+    except Exception as e:
+        logger.warning(f"Dedup check unavailable, dispatching anyway: {e}")
+        return None
+
+def take_over(key: str, task_id: str):
+    """Reassigns key to a new task, e.g. after the previous attempt failed."""
+    if not redis_enabled():
+        return
+    try:
+        get_redis().set(key, task_id, ex=DEDUP_WINDOW_SECONDS)
+    except Exception as e:
+        logger.warning(f"Could not reassign dedup key: {e}")
+
+def save_result(task_id: str, result, ok: bool = True):
+    if not task_id or not redis_enabled():
+        return
+    try:
+        get_redis().set(_RESULT_PREFIX + task_id, json.dumps({"ok": ok, "result": result}), ex=RESULT_TTL_SECONDS)
+    except Exception as e:
+        logger.warning(f"Could not store result for task {task_id}: {e}")
+
+def get_result(task_id: str):
+    """Returns {'ok': bool, 'result': ...} once the task has finished, else None."""
+    if not redis_enabled():
+        return None
+    try:
+        raw = get_redis().get(_RESULT_PREFIX + task_id)
+        return json.loads(raw) if raw else None
+    except Exception as e:
+        logger.warning(f"Could not read result for task {task_id}: {e}")
+        return None
@@ -1,52 +1,90 @@
 import logging
-import asyncio
-from typing import Callable, Any
-from gabay.worker.celery_app import celery_app
+import uuid
+from typing import Callable
+from gabay.worker.celery_app import celery_app, QUEUE_INTERACTIVE, QUEUE_HEAVY
 from gabay.core.config import settings
+from gabay.core.utils import dedup
+from gabay.worker.embedded import executor
 
 logger = logging.getLogger(__name__)
 
-async def dispatch_task(task_func: Callable, *args, **kwargs):
+# Queue per chat intent; intents not listed fall back to the task's static route
+INTENT_QUEUES = {
+    "brief": QUEUE_INTERACTIVE,
+    "search": QUEUE_INTERACTIVE,
+    "read": QUEUE_INTERACTIVE,
+    "email": QUEUE_INTERACTIVE,
+    "save": QUEUE_INTERACTIVE,
+    "calendar": QUEUE_INTERACTIVE,
+    "share": QUEUE_INTERACTIVE,
+    "news": QUEUE_INTERACTIVE,
+    "docs": QUEUE_INTERACTIVE,
+    "file_qa": QUEUE_HEAVY,
+    "slides": QUEUE_HEAVY,
+    "sheets": QUEUE_HEAVY,
+}
+
+async def dispatch_task(task_func: Callable, *args, intent: str = None, **kwargs):
     """
-    Dispatches a task to Celery if available, otherwise runs it in a background asyncio task.
+    Dispatches a task to Celery if a worker is available, otherwise to the embedded executor.
     This ensures reliability in local development environments without workers.
+    `intent` selects the priority queue (see INTENT_QUEUES).
+
+    Repeated submissions (same user, task and normalized args within the dedup window)
+    don't start new work. Returns a reply to send instead, or None if the task was queued.
     """
     user_id = args[0] if args else "unknown"
     task_name = getattr(task_func, "__name__", "unknown_task")
 
-    # 1. Try to check for active workers
-    worker_available = False
+    # 0. Idempotency: attach duplicates to the run that already owns this key
+    task_id = str(uuid.uuid4())
+    key = dedup.dedup_key(task_name, args, kwargs)
+    owner = dedup.claim(key, task_id)
+    if owner:
+        previous = dedup.get_result(owner)
+        if previous is None:
+            logger.info(f"Duplicate '{task_name}' for user {user_id}; task {owner} is still running")
+            return "⏳ I'm already working on that — I'll send the result as soon as it's ready."
+        if previous["ok"] and previous["result"]:
+            logger.info(f"Duplicate '{task_name}' for user {user_id}; reusing result of task {owner}")
+            return previous["result"]
+        # The earlier attempt failed: this submission takes over and runs again
+        dedup.take_over(key, task_id)
+
     try:
-        # inspect().active() returns a dict if workers are online
-        i = celery_app.control.inspect()
-        active = i.active()
-        if active:
-            worker_available = True
+        return await _submit(task_func, task_name, user_id, args, kwargs, intent, task_id)
     except Exception:
-        # If Redis or Celery connection fails, we assume no worker
-        pass
+        # Nothing runs under this id: let the next submission take over instead of waiting on it
+        dedup.save_result(task_id, None, ok=False)
+        raise
 
+async def _submit(task_func: Callable, task_name: str, user_id, args: tuple, kwargs: dict, intent: str, task_id: str):
+    """Hands the task to a Celery worker or the embedded executor under task_id."""
+    # 1. Embedded mode never uses Celery; otherwise check for active workers
+    worker_available = False
+    if not settings.embedded_mode:
+        try:
+            # inspect().active() returns a dict if workers are online
+            i = celery_app.control.inspect()
+            active = i.active()
+            if active:
+                worker_available = True
+        except Exception:
+            # If Redis or Celery connection fails, we assume no worker
+            pass
+
+    queue = INTENT_QUEUES.get(intent)
     if worker_available:
         logger.info(f"Dispatching task '{task_name}' to Celery worker for user {user_id}")
-        # Assuming the task_func has a .delay attribute (is a Celery task)
-        if hasattr(task_func, "delay"):
-            task_func.delay(*args, **kwargs)
-            return
-        else:
-             logger.warning(f"Task '{task_name}' is not a Celery task but worker is available. Running locally.")
-
-    # 2. Local Fallback (Run as background asyncio task)
-    logger.info(f"Running task '{task_name}' locally in background for user {user_id}")
-    
-    # We use a wrapper to handle potential sync/async mismatches in the background
-    async def local_wrapper():
-        try:
-            if asyncio.iscoroutinefunction(task_func):
-                await task_func(*args, **kwargs)
-            else:
-                # If it's a synchronous function, run it in a thread to avoid blocking loop
-                await asyncio.to_thread(task_func, *args, **kwargs)
-        except Exception as e:
-            logger.error(f"Local background task '{task_name}' failed: {e}")
-
-    asyncio.create_task(local_wrapper())
+        options = {"queue": queue} if queue else {}
+        task_func.apply_async(args, kwargs, task_id=task_id, **options)
+        return None
+
+    # 2. Embedded executor (bounded queue and worker pool in this process)
+    logger.info(f"Running task '{task_name}' in the embedded executor for user {user_id}")
+    if not executor.running:
+        await executor.start()
+    if not await executor.enqueue(task_func.name, args, kwargs, queue=queue, task_id=task_id):
+        dedup.save_result(task_id, None, ok=False)
+        return "🚦 I'm handling a lot of requests right now. Please try again in a minute."
+    return None
@@ -0,0 +1,46 @@
+import logging
+import time
+import redis
+from gabay.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_client = None
+
+def redis_enabled() -> bool:
+    """False when REDIS_URL is empty (embedded single-process deployments)."""
+    return bool(settings.redis_url)
+
+def get_redis():
+    """Returns a shared Redis client for coordination (locks, notifications, dedup keys)."""
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(settings.redis_url, decode_responses=True)
+    return _client
+
+class RedisSemaphore:
+    """
+    Cluster-wide counting semaphore. Holders are members of a sorted set scored by
+    lease expiry, so slots held by a crashed worker free themselves after `lease` seconds.
+    """
+
+    def __init__(self, name: str, limit: int, lease: int):
+        self.key = f"gabay:sem:{name}"
+        self.limit = limit
+        self.lease = lease
+
+    def acquire(self, token: str) -> bool:
+        now = time.time()
+        pipe = get_redis().pipeline()
+        pipe.zremrangebyscore(self.key, "-inf", now)
+        pipe.zadd(self.key, {token: now + self.lease})
+        pipe.zrank(self.key, token)
+        pipe.expire(self.key, self.lease)
+        _, _, rank, _ = pipe.execute()
+        if rank is not None and rank < self.limit:
+            return True
+        get_redis().zrem(self.key, token)
+        return False
+
+    def release(self, token: str):
+        get_redis().zrem(self.key, token)
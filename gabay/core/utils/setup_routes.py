@@ -259,6 +259,10 @@ async def handle_notion_setup(
             "api_key": notion_api_key,
             "database_id": notion_database_id
         })
+        # A new key may point at another workspace: rebuild the page index from scratch
+        if str(user_id).isdigit():
+            from gabay.core.database import db
+            db.clear_documents(int(user_id), "notion")
         
         # Still save to .env for local backup
         save_to_env("NOTION_API_KEY", notion_api_key)
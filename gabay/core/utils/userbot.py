@@ -1,12 +1,28 @@
 from telethon import TelegramClient
+from telethon.errors import FloodWaitError
+import asyncio
 import logging
 import os
+import uuid
 from gabay.core.config import settings, save_to_env
+from gabay.core.database import db
+
+try:
+    import fcntl
+except ImportError:  # Windows: ownership is not enforced across processes
+    fcntl = None
 
 logger = logging.getLogger(__name__)
 
 # Session file path in data directory
 SESSION_PATH = os.path.join(settings.data_dir, "gabay_userbot.session")
+# Held for its whole lifetime by the one process that connects the session
+OWNER_LOCK_PATH = SESSION_PATH + ".owner"
+
+# send_message() outcomes; QUEUED means another process will deliver it and report back
+SENT = "sent"
+QUEUED = "queued"
+FAILED = "failed"
 
 async def get_userbot_client():
     """
@@ -19,29 +35,300 @@ async def get_userbot_client():
         logger.warning("Userbot API keys are missing. Userbot features will be disabled.")
         return None
 
-    client = TelegramClient(SESSION_PATH, api_id, api_hash)
+    client = TelegramClient(SESSION_PATH, api_id, api_hash, auto_reconnect=True, connection_retries=5)
     return client
 
-async def send_userbot_message(recipient_id: str, message_text: str) -> bool:
+class UserbotManager:
+    """
+    Owns the single long-lived Telethon connection for the whole deployment.
+    Only the process holding the session's owner lock (the bot process) ever connects;
+    other processes (Celery workers) queue their sends in the database and the owner
+    delivers them, so no two clients ever open the shared .session SQLite file.
+    """
+
+    # How many recent dialogs to pre-resolve into the peer cache on startup
+    DIALOG_WARMUP_LIMIT = 200
+
+    # Bulk send pacing (seconds between messages); widened on FloodWaitError, narrowed on success
+    BULK_MIN_INTERVAL = 0.5
+    BULK_MAX_INTERVAL = 10.0
+
+    # How often the owner picks up sends queued by other processes (seconds)
+    OUTBOX_POLL_INTERVAL = 5
+
+    def __init__(self):
+        self._client = None
+        self._loop = None
+        # Guards connecting
+        self._lock = None
+        # Serializes sends through the shared client; held per message, never across a flood wait
+        self._send_lock = None
+        self._peers = {}
+        self._owner_file = None
+        self._owner_id = None
+        self._outbox_task = None
+
+    @property
+    def is_owner(self) -> bool:
+        return self._owner_file is not None
+
+    def claim_ownership(self) -> bool:
+        """Makes this process the only one allowed to connect the userbot. Never blocks."""
+        if self._owner_file is not None:
+            return True
+        lock_file = open(OWNER_LOCK_PATH, "a")
+        if fcntl is not None:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                lock_file.close()
+                logger.info("Userbot session is owned by another process; sends will be queued for it.")
+                return False
+        self._owner_file = lock_file
+        # Recorded on the batches this process sends, so a successor can tell they were orphaned
+        self._owner_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        return True
+
+    async def start(self):
+        """Connects once and warms the peer cache. Safe to call repeatedly; no-op outside the owner."""
+        if not self.is_owner:
+            return None
+
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Telethon clients are bound to the loop they were created on
+            stale_client, stale_loop = self._client, self._loop
+            self._client = None
+            self._peers = {}
+            self._loop = loop
+            self._lock = asyncio.Lock()
+            self._send_lock = asyncio.Lock()
+            if stale_client:
+                await self._disconnect(stale_client, stale_loop)
+
+        async with self._lock:
+            if self._client and self._client.is_connected():
+                return self._client
+            if self._client:
+                # Telethon gave up reconnecting; release the session before opening it again
+                await self._disconnect(self._client, loop)
+                self._client = None
+                self._peers = {}
+
+            client = await get_userbot_client()
+            if not client:
+                return None
+
+            try:
+                await client.connect()
+                if not await client.is_user_authorized():
+                    logger.error("Userbot is not authorized. Messaging disabled.")
+                    await client.disconnect()
+                    return None
+            except Exception as e:
+                logger.error(f"Userbot failed to connect: {e}")
+                await self._disconnect(client, loop)
+                return None
+
+            self._client = client
+            await self._warm_peer_cache()
+            logger.info(f"Userbot connected ({len(self._peers)} peers cached).")
+            return client
+
+    async def stop(self):
+        if self._outbox_task:
+            self._outbox_task.cancel()
+            self._outbox_task = None
+        if self._client:
+            await self._disconnect(self._client, self._loop)
+        self._client = None
+        self._peers = {}
+        if self._owner_file is not None:
+            self._owner_file.close()  # releases the owner lock
+            self._owner_file = None
+            self._owner_id = None
+
+    async def _disconnect(self, client, loop):
+        """Disconnects a client on the loop it was created on."""
+        try:
+            if loop is None or loop is asyncio.get_running_loop():
+                await client.disconnect()
+            elif loop.is_running():
+                future = asyncio.run_coroutine_threadsafe(client.disconnect(), loop)
+                await asyncio.wait_for(asyncio.wrap_future(future), timeout=10)
+            else:
+                # Telethon runs the disconnect to completion on its own idle loop
+                client.disconnect()
+        except Exception as e:
+            logger.warning(f"Error while disconnecting userbot: {e}")
+
+    async def _on_owner_loop(self, coro_func, *args):
+        """Runs coro_func on the loop the client lives on (e.g. when called from an embedded task thread)."""
+        loop = self._loop
+        if loop is not None and loop.is_running() and loop is not asyncio.get_running_loop():
+            future = asyncio.run_coroutine_threadsafe(coro_func(*args), loop)
+            return await asyncio.wrap_future(future)
+        return await coro_func(*args)
+
+    async def _warm_peer_cache(self):
+        """Caches name/username -> InputPeer for recent dialogs (also fills Telethon's session cache)."""
+        try:
+            async for dialog in self._client.iter_dialogs(limit=self.DIALOG_WARMUP_LIMIT):
+                peer = dialog.input_entity
+                self._peers[str(dialog.id)] = peer
+                if dialog.name:
+                    self._peers.setdefault(dialog.name.lower(), peer)
+                username = getattr(dialog.entity, "username", None)
+                if username:
+                    self._peers[username.lower()] = peer
+        except Exception as e:
+            logger.warning(f"Userbot peer cache warm-up failed: {e}")
+
+    async def _resolve_peer(self, recipient):
+        key = str(recipient).lower().lstrip("@")
+        peer = self._peers.get(key)
+        if peer is None:
+            target = int(recipient) if key.lstrip("-").isdigit() else recipient
+            peer = await self._client.get_input_entity(target)
+            self._peers[key] = peer
+        return peer
+
+    async def send_message(self, recipient_id, message_text: str, user_id: int = 0, name: str = None) -> str:
+        """
+        Sends one message. Returns SENT or FAILED, or QUEUED outside the owner process:
+        the owner then delivers it from its outbox and tells `user_id` how it went.
+        """
+        if not self.is_owner:
+            db.create_bulk_batch(str(uuid.uuid4()), user_id, message_text, {name or str(recipient_id): recipient_id}, status="queued")
+            return QUEUED
+        return await self._on_owner_loop(self._send_message, recipient_id, message_text)
+
+    async def _send_message(self, recipient_id, message_text: str) -> str:
+        client = await self.start()
+        if not client:
+            return FAILED
+
+        peer = await self._resolve_peer(recipient_id)
+        async with self._send_lock:
+            await client.send_message(peer, message_text)
+        return SENT
+
+    async def send_bulk(self, user_id: int, recipients: dict, message_text: str) -> dict:
+        """
+        Sends one message to many recipients ({display_name: chat_id/username}).
+        Progress is persisted per recipient so an interrupted batch can be resumed.
+        Outside the owner process the batch is only queued for the owner to send.
+        Returns {display_name: 'sent' | 'pending' | 'failed: <reason>'}.
+        """
+        batch_id = str(uuid.uuid4())
+        if not self.is_owner:
+            db.create_bulk_batch(batch_id, user_id, message_text, recipients, status="queued")
+            return self._bulk_report(batch_id)
+        db.create_bulk_batch(batch_id, user_id, message_text, recipients, owner=self._owner_id)
+        return await self._on_owner_loop(self._run_bulk_batch, batch_id)
+
+    def start_outbox(self):
+        """Starts delivering queued sends and finishing interrupted batches (owner process only)."""
+        if self.is_owner and self._outbox_task is None:
+            self._outbox_task = asyncio.create_task(self._run_outbox())
+
+    async def _run_outbox(self):
+        while True:
+            try:
+                await self._drain_outbox()
+            except Exception as e:
+                logger.error(f"Userbot outbox failed: {e}")
+            await asyncio.sleep(self.OUTBOX_POLL_INTERVAL)
+
+    async def _drain_outbox(self):
+        """Sends queued batches and takes over running ones orphaned by a previous owner."""
+        batches = db.get_bulk_batches(status="queued") + db.get_bulk_batches(status="running")
+        for batch in batches:
+            if batch["owner"] == self._owner_id:
+                continue
+            if not await self.start():
+                return
+            # The claim is atomic, so a batch is never picked up twice
+            if db.claim_bulk_batch(batch["id"], self._owner_id):
+                logger.info(f"Sending {batch['status']} bulk send batch {batch['id']}")
+                report = await self._run_bulk_batch(batch["id"])
+                if batch["user_id"] and db.get_bulk_batch(batch["id"])["status"] == "completed":
+                    await self._report_delivery(batch["user_id"], report)
+
+    async def _report_delivery(self, user_id: int, report: dict):
+        """Tells the requesting user how a send queued by another process turned out."""
+        from gabay.core.utils.telegram import send_telegram_message
+        try:
+            await asyncio.to_thread(send_telegram_message, user_id, f"📨 Queued message delivery:\n\n{format_bulk_report(report)}")
+        except Exception as e:
+            logger.warning(f"Could not report delivery to user {user_id}: {e}")
+
+    async def _run_bulk_batch(self, batch_id: str) -> dict:
+        batch = db.get_bulk_batch(batch_id)
+        client = await self.start()
+        if not client:
+            # Offline: leave it for the outbox to retry once the userbot reconnects
+            db.set_bulk_batch_status(batch_id, "queued")
+            return self._bulk_report(batch_id)
+
+        interval = self.BULK_MIN_INTERVAL
+        for row in db.get_bulk_recipients(batch_id):
+            if row["status"] != "pending":
+                continue
+            while True:
+                try:
+                    peer = await self._resolve_peer(row["target"])
+                    async with self._send_lock:
+                        await client.send_message(peer, batch["message_text"])
+                    db.update_bulk_recipient(batch_id, row["recipient"], "sent")
+                    interval = max(self.BULK_MIN_INTERVAL, interval * 0.8)
+                    break
+                except FloodWaitError as e:
+                    # Telegram tells us exactly how long to back off; slow down afterwards too
+                    logger.warning(f"Flood wait of {e.seconds}s during bulk send {batch_id}")
+                    interval = min(self.BULK_MAX_INTERVAL, interval * 2)
+                    await asyncio.sleep(e.seconds)
+                except Exception as e:
+                    logger.error(f"Bulk send to {row['recipient']} failed: {e}")
+                    db.update_bulk_recipient(batch_id, row["recipient"], "failed", str(e))
+                    break
+            await asyncio.sleep(interval)
+        db.set_bulk_batch_status(batch_id, "completed")
+        return self._bulk_report(batch_id)
+
+    def _bulk_report(self, batch_id: str) -> dict:
+        report = {}
+        for row in db.get_bulk_recipients(batch_id):
+            status = row["status"]
+            report[row["recipient"]] = f"failed: {row['error']}" if status == "failed" else status
+        return report
+
+userbot = UserbotManager()
+
+def format_bulk_report(report: dict) -> str:
+    """Renders a send_bulk() result as a per-recipient status list."""
+    sent = sum(1 for status in report.values() if status == "sent")
+    lines = [f"Sent to {sent} of {len(report)} contacts:"]
+    for name, status in report.items():
+        if status == "sent":
+            lines.append(f"✅ {name.capitalize()}")
+        elif status == "pending":
+            lines.append(f"⏳ {name.capitalize()} (queued)")
+        else:
+            lines.append(f"❌ {name.capitalize()} ({status[len('failed: '):]})")
+    return "\n".join(lines)
+
+async def send_userbot_message(recipient_id: str, message_text: str, user_id: int = 0, name: str = None) -> str:
     """
     Sends a message using the Userbot (MTProto).
     recipient_id can be a phone number, username, or chat ID.
+    Returns SENT, QUEUED (delivered later; `user_id` is told the outcome) or FAILED.
     """
-    client = await get_userbot_client()
-    if not client:
-        return False
-
     try:
-        async with client:
-            if not await client.is_user_authorized():
-                logger.error("Userbot is not authorized. Messaging disabled.")
-                return False
-            
-            await client.send_message(recipient_id, message_text)
-            return True
+        return await userbot.send_message(recipient_id, message_text, user_id=user_id, name=name)
     except Exception as e:
         logger.error(f"Userbot failed to send message: {e}")
-        return False
+        return FAILED
 
 if __name__ == "__main__":
     import asyncio
@@ -1,23 +1,40 @@
+import asyncio
 import logging
 import os
-from groq import Groq
+import tempfile
+from groq import Groq, AsyncGroq
 from gabay.core.config import settings
+from gabay.core.database import db
 
 logger = logging.getLogger(__name__)
 
+# Reused across voice notes so the HTTP connection pool survives between calls
+_async_client = None
+
+def _get_async_client() -> AsyncGroq:
+    global _async_client
+    if _async_client is None or _async_client.api_key != settings.groq_api_key:
+        _async_client = AsyncGroq(api_key=settings.groq_api_key)
+    return _async_client
+
+def _groq_key_missing() -> bool:
+    if not settings.groq_api_key or settings.groq_api_key == "your_groq_api_key_here":
+        logger.error("Groq API Key is missing. Cannot transcribe audio.")
+        return True
+    return False
+
 def transcribe_audio(file_path: str) -> str:
     """
     Transcribes an audio file (e.g., .oga, .mp3, .wav) using Groq's Whisper API.
     """
-    if not settings.groq_api_key or settings.groq_api_key == "your_groq_api_key_here":
-        logger.error("Groq API Key is missing. Cannot transcribe audio.")
+    if _groq_key_missing():
         return ""
 
     try:
         client = Groq(api_key=settings.groq_api_key)
         with open(file_path, "rb") as file:
             transcription = client.audio.transcriptions.create(
-                file=(os.path.basename(file_path), file.read()),
+                file=(os.path.basename(file_path), file),
                 model="whisper-large-v3",
                 response_format="json",
             )
@@ -25,3 +42,48 @@ def transcribe_audio(file_path: str) -> str:
     except Exception as e:
         logger.error(f"Error transcribing audio: {e}")
         return ""
+
+async def transcribe_audio_async(audio, filename: str = "voice.ogg") -> str:
+    """
+    Transcribes in-memory audio (bytes or a binary file object) without blocking the event loop.
+    File objects are streamed to Groq rather than read into memory first.
+    """
+    if _groq_key_missing():
+        return ""
+
+    try:
+        transcription = await _get_async_client().audio.transcriptions.create(
+            file=(filename, audio),
+            model="whisper-large-v3",
+            response_format="json",
+        )
+        return transcription.text
+    except Exception as e:
+        logger.error(f"Error transcribing audio: {e}")
+        return ""
+
+async def transcribe_voice_note(voice) -> str:
+    """
+    Downloads a Telegram voice note and transcribes it, caching the result by file_unique_id.
+    Notes up to VOICE_STREAM_THRESHOLD_BYTES stay in memory; larger ones spill to a temp file.
+    """
+    unique_id = voice.file_unique_id
+    # sqlite calls run off the event loop so a busy database doesn't stall the bot
+    cached = await asyncio.to_thread(db.get_voice_transcript, unique_id)
+    if cached:
+        logger.info(f"Voice transcript cache hit for {unique_id}")
+        return cached
+
+    threshold = settings.voice_stream_threshold_bytes
+    voice_file = await voice.get_file()
+    with tempfile.SpooledTemporaryFile(max_size=threshold) as buffer:
+        # Known-large notes go straight to disk; others roll over only if the size was under-reported
+        if voice.file_size and voice.file_size > threshold:
+            buffer.rollover()
+        await voice_file.download_to_memory(buffer)
+        buffer.seek(0)
+        text = await transcribe_audio_async(buffer, filename=f"{unique_id}.ogg")
+
+    if text:
+        await asyncio.to_thread(db.save_voice_transcript, unique_id, text)
+    return text
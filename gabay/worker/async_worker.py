@@ -0,0 +1,172 @@
+import asyncio
+import functools
+import logging
+import queue
+import random
+import signal
+import socket
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from kombu import Consumer
+from gabay.worker.celery_app import celery_app, task_profile
+from gabay.worker import tasks
+from gabay.core.utils.dedup import save_result
+
+logger = logging.getLogger(__name__)
+
+async def _run_profiled(task_name: str, handler, args: list, kwargs: dict, task_id: str, executor):
+    """Applies the task's resource profile: cluster-wide cap and hard time limit."""
+    _, profile = task_profile(task_name)
+    semaphore = tasks.profile_semaphore(task_name)
+    token = task_id or str(uuid.uuid4())
+    if semaphore:
+        while not await asyncio.to_thread(semaphore.acquire, token):
+            await asyncio.sleep(random.uniform(*tasks.PROFILE_BUSY_RETRY))
+    try:
+        if task_name in tasks.BLOCKING_HANDLERS:
+            # Its skill still blocks on sync API calls: keep it off the shared loop
+            work = asyncio.get_running_loop().run_in_executor(
+                executor, functools.partial(tasks.run_isolated, handler, *args, **kwargs)
+            )
+        else:
+            work = handler(*args, **kwargs)
+        return await asyncio.wait_for(work, timeout=profile["time_limit"])
+    finally:
+        if semaphore:
+            await asyncio.to_thread(semaphore.release, token)
+
+async def _execute(task_name: str, args: list, kwargs: dict, task_id: str, executor):
+    handler = tasks.ASYNC_HANDLERS.get(task_name)
+    try:
+        if handler:
+            result = await _run_profiled(task_name, handler, args, kwargs, task_id, executor)
+            save_result(task_id, result)
+        else:
+            # Plain sync tasks (reminders, heartbeat) get a thread from the worker's own pool,
+            # never the loop's default executor, so their run_async calls back onto this
+            # loop can't starve the to_thread work other coroutines are waiting on.
+            await asyncio.get_running_loop().run_in_executor(
+                executor, functools.partial(celery_app.tasks[task_name], *args, **kwargs)
+            )
+    except Exception as e:
+        logger.error(f"Async worker task '{task_name}' failed: {e}")
+        save_result(task_id, None, ok=False)
+
+def run_async_worker(concurrency: int, queues: list = None):
+    """
+    Consumes the Celery queues from Redis and runs task coroutines concurrently on one
+    event loop. At most `concurrency` tasks are in flight; further messages stay in the
+    broker until a slot frees up. Messages are acked once their task finishes; on
+    SIGTERM/Ctrl+C in-flight tasks are drained and countdown/eta tasks not yet started
+    are requeued.
+    """
+    queues = queues or [celery_app.conf.task_default_queue]
+    loop = tasks._start_worker_loop()
+    # One thread per in-flight task at most, for sync tasks and blocking handlers
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="gabay-async-task")
+    slots = threading.BoundedSemaphore(concurrency)
+    # kombu channels aren't thread-safe: finished messages are acked from this thread
+    finished = queue.SimpleQueue()
+    # delivery_tag -> (timer, message) for countdown/eta tasks still waiting to start
+    delayed = {}
+    delayed_lock = threading.Lock()
+    stopping = threading.Event()
+
+    def run(message, task_name, args, kwargs, task_id):
+        logger.info(f"Async worker running '{task_name}' ({task_id})")
+        future = asyncio.run_coroutine_threadsafe(_execute(task_name, args, kwargs, task_id, executor), loop)
+
+        def done(_):
+            finished.put(message)
+            slots.release()
+        future.add_done_callback(done)
+
+    def run_later(message, task_name, args, kwargs, task_id):
+        with delayed_lock:
+            if delayed.pop(message.delivery_tag, None) is None:
+                return  # requeued by shutdown
+        slots.acquire()
+        run(message, task_name, args, kwargs, task_id)
+
+    def ack_finished():
+        while True:
+            try:
+                finished.get_nowait().ack()
+            except queue.Empty:
+                return
+
+    def on_message(body, message):
+        task_name = message.headers.get("task")
+        if task_name not in celery_app.tasks:
+            logger.error(f"Async worker received unknown task '{task_name}', rejecting.")
+            message.reject()
+            return
+
+        args, kwargs, _embed = body
+        task_id = message.headers.get("id")
+
+        # Honour countdown/eta without holding a slot while waiting
+        eta = message.headers.get("eta")
+        if eta:
+            eta_dt = datetime.fromisoformat(eta)
+            if eta_dt.tzinfo is None:
+                eta_dt = eta_dt.replace(tzinfo=timezone.utc)
+            delay = (eta_dt - datetime.now(timezone.utc)).total_seconds()
+            if delay > 0:
+                timer = threading.Timer(delay, run_later, (message, task_name, args, kwargs, task_id))
+                timer.daemon = True
+                with delayed_lock:
+                    delayed[message.delivery_tag] = (timer, message)
+                timer.start()
+                return
+
+        slots.acquire()
+        run(message, task_name, args, kwargs, task_id)
+
+    def request_stop(signum, frame):
+        stopping.set()
+
+    signal.signal(signal.SIGTERM, request_stop)
+
+    logger.info(f"Async worker consuming {queues} with up to {concurrency} in-flight tasks")
+    with celery_app.connection_for_read() as conn:
+        consumer_queues = [celery_app.amqp.queues[name] for name in queues]
+        with Consumer(conn, queues=consumer_queues, callbacks=[on_message],
+                      accept=["json"], prefetch_count=concurrency) as consumer:
+            waiting = 0
+            try:
+                while not stopping.is_set():
+                    try:
+                        conn.drain_events(timeout=1)
+                    except socket.timeout:
+                        pass
+                    ack_finished()
+                    # Unacked eta messages don't hold a slot, so they mustn't hold prefetch either
+                    with delayed_lock:
+                        now_waiting = len(delayed)
+                    if now_waiting != waiting:
+                        waiting = now_waiting
+                        consumer.qos(prefetch_count=concurrency + waiting)
+            except KeyboardInterrupt:
+                pass
+
+        logger.info("Async worker stopping, waiting for in-flight tasks...")
+        with delayed_lock:
+            pending = list(delayed.values())
+            delayed.clear()
+        for timer, message in pending:
+            timer.cancel()
+            message.requeue()
+
+        # Drain: every slot comes back once its task finishes
+        acquired = 0
+        while acquired < concurrency:
+            if slots.acquire(timeout=1):
+                acquired += 1
+            ack_finished()
+        ack_finished()
+
+    executor.shutdown(wait=False)
+    loop.call_soon_threadsafe(loop.stop)
@@ -1,4 +1,5 @@
 from celery import Celery
+from kombu import Queue
 import os
 
 # Default to the docker-compose redis service name if not set
@@ -8,15 +9,117 @@ celery_app = Celery(
     "gabay_worker",
     broker=redis_url,
     backend=redis_url,
-    include=["gabay.worker.tasks"]
+    include=["gabay.worker.tasks"],
+    # Hands tasks to the in-process executor instead of the broker in embedded mode
+    task_cls="gabay.worker.embedded:EmbeddedAwareTask",
 )
 
+# Queues, from most to least latency-sensitive. Each can get its own worker
+# (`gabay worker --queues heavy`) so long jobs never sit in front of chat replies.
+QUEUE_INTERACTIVE = "interactive"
+QUEUE_BACKGROUND = "background"
+QUEUE_HEAVY = "heavy"
+
+# Default worker concurrency per queue
+QUEUE_CONCURRENCY = {
+    QUEUE_INTERACTIVE: 4,
+    QUEUE_BACKGROUND: 2,
+    QUEUE_HEAVY: 1,
+}
+
+# Messages each worker process reserves ahead; heavy workers take one job at a time
+# so a queued OCR job can still be picked up by an idle worker elsewhere
+QUEUE_PREFETCH_MULTIPLIER = {
+    QUEUE_INTERACTIVE: 4,
+    QUEUE_BACKGROUND: 4,
+    QUEUE_HEAVY: 1,
+}
+
+# Static routing by task name; dispatch_task can still override per intent
+TASK_ROUTES = {
+    # Multi-minute generation / document parsing
+    "worker.tasks.process_slides": {"queue": QUEUE_HEAVY},
+    "worker.tasks.process_sheets": {"queue": QUEUE_HEAVY},
+    "worker.tasks.process_file_qa": {"queue": QUEUE_HEAVY},
+    # Periodic and proactive sweeps
+    "worker.tasks.proactive_heartbeat": {"queue": QUEUE_BACKGROUND},
+    "worker.tasks.proactive_sweep": {"queue": QUEUE_BACKGROUND},
+    "worker.tasks.triage_gmail_proactive": {"queue": QUEUE_BACKGROUND},
+    "worker.tasks.check_meeting_briefings": {"queue": QUEUE_BACKGROUND},
+    "worker.tasks.check_reminders": {"queue": QUEUE_BACKGROUND},
+    "worker.tasks.sync_document_indexes": {"queue": QUEUE_BACKGROUND},
+    "worker.tasks.sync_document_index": {"queue": QUEUE_BACKGROUND},
+    # Everything else (user requests, and timed deliveries like execute_reminder
+    # and send_meeting_briefing) goes to the default interactive queue
+}
+
+# Resource profiles. max_concurrency is enforced cluster-wide with a Redis semaphore
+# shared by every task in the profile (None = unlimited); time limits are in seconds.
+# acks_late is only enabled where re-running after a worker crash is safe or worth it.
+RESOURCE_PROFILES = {
+    "light": {"max_concurrency": None, "soft_time_limit": 120, "time_limit": 150, "acks_late": False},
+    "background": {"max_concurrency": 10, "soft_time_limit": 120, "time_limit": 180, "acks_late": True},
+    "heavy": {"max_concurrency": 2, "soft_time_limit": 540, "time_limit": 600, "acks_late": True},
+    # Heartbeat sweeps pace users across a slice of the 15-minute window
+    "sweep": {"max_concurrency": None, "soft_time_limit": 900, "time_limit": 960, "acks_late": True},
+    # Userbot bulk sends can spend a long time sleeping through flood waits
+    "bulk": {"max_concurrency": None, "soft_time_limit": 1800, "time_limit": 1900, "acks_late": False},
+}
+
+# How often every user's local Drive/Notion index is refreshed in the background
+DOCUMENT_INDEX_INTERVAL = 600
+
+# Tasks not listed here use the "light" profile
+TASK_PROFILES = {
+    "worker.tasks.process_slides": "heavy",
+    "worker.tasks.process_sheets": "heavy",
+    "worker.tasks.process_file_qa": "heavy",
+    "worker.tasks.proactive_heartbeat": "background",
+    "worker.tasks.proactive_sweep": "sweep",
+    "worker.tasks.triage_gmail_proactive": "background",
+    "worker.tasks.check_meeting_briefings": "background",
+    "worker.tasks.check_reminders": "background",
+    "worker.tasks.sync_document_indexes": "background",
+    "worker.tasks.sync_document_index": "background",
+    "worker.tasks.execute_reminder": "bulk",
+}
+
+def task_profile(task_name: str) -> tuple[str, dict]:
+    profile_name = TASK_PROFILES.get(task_name, "light")
+    return profile_name, RESOURCE_PROFILES[profile_name]
+
+def _task_annotations() -> dict:
+    """Celery-native options (time limits, acks_late) for every profiled task."""
+    annotations = {}
+    for task_name in TASK_PROFILES:
+        _, profile = task_profile(task_name)
+        annotations[task_name] = {
+            "soft_time_limit": profile["soft_time_limit"],
+            "time_limit": profile["time_limit"],
+            "acks_late": profile["acks_late"],
+        }
+    return annotations
+
 celery_app.conf.update(
     task_serializer="json",
     accept_content=["json"],
     result_serializer="json",
     timezone="UTC",
     enable_utc=True,
+    task_queues=[Queue(name) for name in QUEUE_CONCURRENCY],
+    task_default_queue=QUEUE_INTERACTIVE,
+    task_routes=TASK_ROUTES,
+    task_annotations=_task_annotations(),
+    # Defaults for unprofiled tasks ("light")
+    task_soft_time_limit=RESOURCE_PROFILES["light"]["soft_time_limit"],
+    task_time_limit=RESOURCE_PROFILES["light"]["time_limit"],
+    # Tasks deliver their output over Telegram; nothing reads the result backend
+    task_ignore_result=True,
+    result_expires=3600,
+    # Redundant beat replicas elect one leader; only it sends periodic tasks
+    beat_scheduler="gabay.worker.leader:LeaderElectedScheduler",
+    # Reminders are fired by the heap-based scheduler (gabay.worker.scheduler); the
+    # per-minute poll only does the work while no scheduler holds the reminders lease
     beat_schedule={
         "check-reminders-every-minute": {
             "task": "worker.tasks.check_reminders",
@@ -26,5 +129,9 @@ celery_app.conf.update(
             "task": "worker.tasks.proactive_heartbeat",
             "schedule": 900.0, # 15 minutes
         },
+        "document-index-sync": {
+            "task": "worker.tasks.sync_document_indexes",
+            "schedule": float(DOCUMENT_INDEX_INTERVAL),
+        },
     },
 )
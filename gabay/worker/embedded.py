@@ -0,0 +1,223 @@
+import asyncio
+import functools
+import itertools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from celery import Task
+from celery.utils import uuid
+from gabay.core.config import settings
+from gabay.worker.celery_app import (
+    celery_app, task_profile, TASK_ROUTES, DOCUMENT_INDEX_INTERVAL,
+    QUEUE_INTERACTIVE, QUEUE_HEAVY, QUEUE_BACKGROUND,
+)
+
+logger = logging.getLogger(__name__)
+
+# Lower runs first; FIFO within a priority
+QUEUE_PRIORITY = {
+    QUEUE_INTERACTIVE: 0,
+    QUEUE_HEAVY: 1,
+    QUEUE_BACKGROUND: 2,
+}
+
+# How long shutdown waits for queued and running tasks to finish
+DRAIN_TIMEOUT = 60
+
+class EmbeddedExecutor:
+    """
+    Runs Gabay tasks inside the current process, for single-node deployments without
+    Celery workers. Tasks wait in a bounded priority queue and are executed by a fixed
+    number of worker coroutines; synchronous tasks get a dedicated, bounded thread pool.
+    Resource profiles apply locally (per-profile concurrency caps, hard time limits).
+    """
+
+    def __init__(self):
+        self._loop = None
+        self._queue = None
+        self._workers = []
+        self._threads = None
+        self._seq = itertools.count()
+        self._profile_slots = {}
+        self._delayed = set()
+        self._accepting = False
+        self._periodic = []
+
+    @property
+    def running(self) -> bool:
+        return self._loop is not None
+
+    async def start(self, periodic: bool = False):
+        """Starts the worker pool on the running loop; `periodic` also runs reminders, the heartbeat and index syncs."""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.PriorityQueue(maxsize=settings.embedded_queue_size)
+        self._threads = ThreadPoolExecutor(max_workers=settings.embedded_threads, thread_name_prefix="gabay-embedded")
+        self._workers = [asyncio.create_task(self._work()) for _ in range(settings.embedded_workers)]
+        self._accepting = True
+        logger.info(
+            f"Embedded executor started: {settings.embedded_workers} workers, "
+            f"{settings.embedded_threads} threads, queue size {settings.embedded_queue_size}"
+        )
+
+        if periodic:
+            from gabay.worker.scheduler import start_local_scheduler
+            from gabay.worker.heartbeat import HEARTBEAT_WINDOW
+            start_local_scheduler()
+            self._periodic.append(asyncio.create_task(self._periodic_loop("worker.tasks.proactive_heartbeat", HEARTBEAT_WINDOW)))
+            self._periodic.append(asyncio.create_task(self._periodic_loop("worker.tasks.sync_document_indexes", DOCUMENT_INDEX_INTERVAL)))
+
+    async def stop(self):
+        """Stops accepting work, then drains everything already queued or running."""
+        if not self.running:
+            return
+        self._accepting = False
+
+        from gabay.worker.scheduler import stop_local_scheduler
+        stop_local_scheduler()
+        for task in self._periodic:
+            task.cancel()
+        self._periodic = []
+
+        for handle in self._delayed:
+            handle.cancel()
+        if self._delayed:
+            # Reminders and briefings are persisted and get re-queued on the next start
+            logger.info(f"Dropping {len(self._delayed)} delayed task(s) on shutdown")
+        self._delayed.clear()
+
+        logger.info(f"Draining embedded executor ({self._queue.qsize()} queued)...")
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=DRAIN_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning(f"Embedded executor drain timed out after {DRAIN_TIMEOUT}s")
+
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        await asyncio.to_thread(self._threads.shutdown)
+        self._workers = []
+        self._loop = None
+        logger.info("Embedded executor stopped.")
+
+    def _item(self, task_name: str, args, kwargs, queue: str, task_id: str):
+        queue = queue or TASK_ROUTES.get(task_name, {}).get("queue", QUEUE_INTERACTIVE)
+        return (QUEUE_PRIORITY.get(queue, 0), next(self._seq), task_name, list(args or ()), dict(kwargs or {}), task_id)
+
+    async def enqueue(self, task_name: str, args=(), kwargs=None, queue: str = None,
+                      task_id: str = None, timeout: float = 2.0) -> bool:
+        """Queues a task from the event loop. Returns False if the queue stayed full (backpressure)."""
+        if not self._accepting:
+            return False
+        try:
+            await asyncio.wait_for(self._queue.put(self._item(task_name, args, kwargs, queue, task_id)), timeout)
+            return True
+        except asyncio.TimeoutError:
+            logger.warning(f"Embedded queue full, rejecting '{task_name}'")
+            return False
+
+    def submit(self, task_name: str, args=(), kwargs=None, queue: str = None,
+               task_id: str = None, delay: float = 0):
+        """Thread-safe, fire-and-forget submission (used for apply_async/delay in embedded mode)."""
+        item = self._item(task_name, args, kwargs, queue, task_id)
+
+        def put():
+            if not self._accepting:
+                logger.warning(f"Embedded executor is shutting down, dropping '{task_name}'")
+                return
+            try:
+                self._queue.put_nowait(item)
+            except asyncio.QueueFull:
+                logger.error(f"Embedded queue full, dropping '{task_name}'")
+
+        def schedule():
+            if delay > 0:
+                handle = None
+
+                def fire():
+                    self._delayed.discard(handle)
+                    put()
+                handle = self._loop.call_later(delay, fire)
+                self._delayed.add(handle)
+            else:
+                put()
+
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is self._loop:
+            schedule()
+        else:
+            self._loop.call_soon_threadsafe(schedule)
+
+    def _slots(self, profile_name: str, limit: int) -> asyncio.Semaphore:
+        if profile_name not in self._profile_slots:
+            self._profile_slots[profile_name] = asyncio.Semaphore(limit)
+        return self._profile_slots[profile_name]
+
+    async def _run(self, task_name: str, args: list, kwargs: dict, task_id: str):
+        from gabay.worker import tasks
+        from gabay.core.utils.dedup import save_result
+
+        profile_name, profile = task_profile(task_name)
+        handler = tasks.ASYNC_HANDLERS.get(task_name)
+
+        async def call():
+            if handler and task_name not in tasks.BLOCKING_HANDLERS:
+                return await handler(*args, **kwargs)
+            if handler:
+                # Its skill still makes sync API calls: a private loop on a pool thread keeps
+                # them from freezing Telegram polling on this one
+                task = functools.partial(tasks.run_isolated, handler, *args, **kwargs)
+            else:
+                task = functools.partial(celery_app.tasks[task_name], *args, **kwargs)
+            return await self._loop.run_in_executor(self._threads, task)
+
+        try:
+            if profile["max_concurrency"]:
+                async with self._slots(profile_name, profile["max_concurrency"]):
+                    result = await asyncio.wait_for(call(), timeout=profile["time_limit"])
+            else:
+                result = await asyncio.wait_for(call(), timeout=profile["time_limit"])
+            save_result(task_id, result)
+        except Exception as e:
+            logger.error(f"Embedded task '{task_name}' failed: {e!r}")
+            save_result(task_id, None, ok=False)
+
+    async def _work(self):
+        while True:
+            _, _, task_name, args, kwargs, task_id = await self._queue.get()
+            try:
+                await self._run(task_name, args, kwargs, task_id)
+            finally:
+                self._queue.task_done()
+
+    async def _periodic_loop(self, task_name: str, interval: int):
+        while True:
+            self.submit(task_name)
+            await asyncio.sleep(interval)
+
+executor = EmbeddedExecutor()
+
+class EmbeddedAwareTask(Task):
+    """
+    Celery task base class: while the embedded executor is running in this process,
+    apply_async/delay hand the task to it instead of publishing to the broker. The
+    returned AsyncResult only carries the task id; results go through dedup.get_result.
+    """
+
+    def apply_async(self, args=None, kwargs=None, task_id=None, **options):
+        if not executor.running:
+            return super().apply_async(args, kwargs, task_id=task_id, **options)
+
+        task_id = task_id or uuid()
+        delay = options.get("countdown") or 0
+        eta = options.get("eta")
+        if eta:
+            if eta.tzinfo is None:
+                eta = eta.replace(tzinfo=timezone.utc)
+            delay = (eta - datetime.now(timezone.utc)).total_seconds()
+        executor.submit(self.name, args, kwargs, queue=options.get("queue"), task_id=task_id, delay=delay)
+        return self.AsyncResult(task_id)
@@ -0,0 +1,136 @@
+import hashlib
+import logging
+import random
+import time
+from datetime import datetime, timezone
+from gabay.core.database import db
+from gabay.core.connectors.token_manager import token_manager
+from gabay.core.utils.redis_client import get_redis, redis_enabled
+
+logger = logging.getLogger(__name__)
+
+# Must match the proactive-heartbeat beat schedule in celery_app
+HEARTBEAT_WINDOW = 900
+
+# Random spread added on top of each user's stable slot
+MAX_JITTER = 30
+
+# A user counts as due if their next run falls before this point past their slot,
+# so jitter and beat drift never push them into the following window
+DUE_TOLERANCE = HEARTBEAT_WINDOW // 2
+
+# Polling intervals, from busiest to quietest user
+ACTIVE_INTERVAL = HEARTBEAT_WINDOW
+IDLE_INTERVAL = 2 * HEARTBEAT_WINDOW
+DORMANT_INTERVAL = 4 * HEARTBEAT_WINDOW
+
+# Due users are split across this many sweep tasks, each owning a slice of the window
+SWEEP_COUNT = 3
+
+# Users processed concurrently inside one sweep
+SWEEP_CONCURRENCY = 10
+
+# Checkpoints must outlive any redelivery of an interrupted sweep
+CHECKPOINT_TTL = 2 * 3600
+
+def _stable_offset(user_id: int) -> float:
+    """Spreads users evenly over the window; the same user always lands in the same slot."""
+    digest = hashlib.sha1(str(user_id).encode()).digest()
+    return int.from_bytes(digest[:4], "big") % HEARTBEAT_WINDOW
+
+def _seconds_since(db_timestamp: str, now: float):
+    if not db_timestamp:
+        return None
+    # SQLite CURRENT_TIMESTAMP is UTC without a zone
+    dt = datetime.strptime(db_timestamp, "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc)
+    return now - dt.timestamp()
+
+def next_interval(user_id: int, state: dict, now: float) -> int:
+    """
+    Picks how often to poll a user:
+    - talked to the bot in the last day, or got several new emails last run -> every window
+    - active this week, or any new mail last run -> every 2 windows
+    - otherwise -> every 4 windows
+    """
+    idle_for = _seconds_since(db.get_last_user_activity(user_id), now)
+    new_mail = (state or {}).get("last_new_mail") or 0
+
+    if (idle_for is not None and idle_for < 86400) or new_mail >= 3:
+        return ACTIVE_INTERVAL
+    if (idle_for is not None and idle_for < 7 * 86400) or new_mail > 0:
+        return IDLE_INTERVAL
+    return DORMANT_INTERVAL
+
+def is_eligible(user_id: int) -> bool:
+    if not token_manager.is_valid("google", str(user_id)):
+        return False
+    return db.is_proactive_enabled(user_id)
+
+def plan_heartbeat(user_ids: list, now: float = None) -> list:
+    """
+    Decides which users to poll during the window starting at `now` and when.
+    Returns [(user_id, countdown_seconds)] and records each user's next due time.
+    """
+    now = now or time.time()
+    plan = []
+    for uid_str in user_ids:
+        try:
+            user_id = int(uid_str)
+        except ValueError:
+            continue
+        if not is_eligible(user_id):
+            logger.debug(f"Heartbeat skipping user {user_id} (no valid token or proactive disabled)")
+            continue
+
+        countdown = _stable_offset(user_id) + random.uniform(-MAX_JITTER, MAX_JITTER)
+        countdown = min(max(countdown, 0), HEARTBEAT_WINDOW - 1)
+        run_at = now + countdown
+
+        state = db.get_heartbeat_state(user_id)
+        if state and state["next_run_at"] > run_at + DUE_TOLERANCE:
+            continue
+
+        interval = next_interval(user_id, state, now)
+        db.set_heartbeat_schedule(user_id, run_at + interval, interval)
+        plan.append((user_id, countdown))
+    return plan
+
+def build_sweeps(plan: list, now: float = None) -> list:
+    """
+    Groups a heartbeat plan into SWEEP_COUNT sweeps by slot.
+    Returns [(sweep_id, countdown, [[user_id, run_at], ...])] for the non-empty ones.
+    """
+    now = now or time.time()
+    slice_len = HEARTBEAT_WINDOW / SWEEP_COUNT
+    groups = {}
+    for user_id, countdown in plan:
+        index = min(int(countdown // slice_len), SWEEP_COUNT - 1)
+        groups.setdefault(index, []).append([user_id, now + countdown])
+    return [
+        (f"{int(now)}-{index}", index * slice_len, sorted(users, key=lambda u: u[1]))
+        for index, users in sorted(groups.items())
+    ]
+
+def _checkpoint_key(sweep_id: str) -> str:
+    return f"gabay:sweep:{sweep_id}:done"
+
+def completed_users(sweep_id: str) -> set:
+    """Users a previous (interrupted) run of this sweep already finished."""
+    if not redis_enabled():
+        return set()
+    try:
+        return {int(u) for u in get_redis().smembers(_checkpoint_key(sweep_id))}
+    except Exception as e:
+        logger.warning(f"Could not read sweep checkpoint {sweep_id}: {e}")
+        return set()
+
+def mark_user_done(sweep_id: str, user_id: int):
+    if not redis_enabled():
+        return
+    try:
+        pipe = get_redis().pipeline()
+        pipe.sadd(_checkpoint_key(sweep_id), user_id)
+        pipe.expire(_checkpoint_key(sweep_id), CHECKPOINT_TTL)
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"Could not checkpoint user {user_id} in sweep {sweep_id}: {e}")
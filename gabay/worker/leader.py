@@ -0,0 +1,117 @@
+import logging
+import socket
+import uuid
+from celery.beat import PersistentScheduler
+from gabay.core.utils.redis_client import get_redis, redis_enabled
+
+logger = logging.getLogger(__name__)
+
+# Acquire the lease, or renew it if this node already holds it. The fencing token
+# increases every time leadership changes hands and is returned to the holder.
+_ACQUIRE_SCRIPT = """
+local current = redis.call('GET', KEYS[1])
+if current then
+    local owner, token = string.match(current, '^(.*):(%d+)$')
+    if owner == ARGV[1] then
+        redis.call('PEXPIRE', KEYS[1], ARGV[2])
+        return tonumber(token)
+    end
+    return false
+end
+local token = redis.call('INCR', KEYS[2])
+redis.call('SET', KEYS[1], ARGV[1] .. ':' .. token, 'PX', ARGV[2])
+return token
+"""
+
+def _lease_key(name: str) -> str:
+    return f"gabay:leader:{name}"
+
+def _fence_key(name: str) -> str:
+    return f"gabay:leader:{name}:fence"
+
+class LeaderLease:
+    """
+    Redis lease for electing a single leader among redundant schedulers. The holder
+    must renew it within `ttl` seconds; if it stops (crash, partition) another node
+    takes over with a higher fencing token.
+    """
+
+    def __init__(self, name: str, ttl: int = 30):
+        self.name = name
+        self.ttl = ttl
+        self.node_id = f"{socket.gethostname()}-{uuid.uuid4().hex[:8]}"
+        self.token = None
+
+    @property
+    def renew_interval(self) -> float:
+        return self.ttl / 3
+
+    def acquire(self):
+        """Acquires or renews leadership. Returns the fencing token, or None if another node leads."""
+        if not redis_enabled():
+            # Single-process deployments have nobody to compete with
+            self.token = 0
+            return self.token
+        previous = self.token
+        try:
+            token = get_redis().eval(
+                _ACQUIRE_SCRIPT, 2, _lease_key(self.name), _fence_key(self.name),
+                self.node_id, int(self.ttl * 1000),
+            )
+        except Exception as e:
+            logger.warning(f"Leader lease '{self.name}' unavailable: {e}")
+            token = None
+        self.token = int(token) if token else None
+        if self.token != previous:
+            if self.token is None:
+                logger.info(f"{self.node_id} is standing by for '{self.name}'")
+            else:
+                logger.info(f"{self.node_id} is now leader for '{self.name}' (fence {self.token})")
+        return self.token
+
+def is_current_fence(name: str, token) -> bool:
+    """
+    True unless a newer leader has been elected since `token` was issued.
+    Jobs check this before acting so work enqueued by a deposed leader is dropped.
+    """
+    if token is None or not redis_enabled():
+        return True
+    try:
+        current = get_redis().get(_fence_key(name))
+    except Exception as e:
+        logger.warning(f"Could not verify fencing token for '{name}': {e}")
+        return True
+    return current is None or int(current) <= int(token)
+
+def is_lease_held(name: str) -> bool:
+    """True while some node holds the lease (always False without Redis, where nothing is shared)."""
+    if not redis_enabled():
+        return False
+    try:
+        return get_redis().get(_lease_key(name)) is not None
+    except Exception as e:
+        logger.warning(f"Could not check leader lease '{name}': {e}")
+        return False
+
+# Lease name shared by every beat replica
+BEAT_LEASE = "beat"
+
+class LeaderElectedScheduler(PersistentScheduler):
+    """
+    Celery beat scheduler that only sends periodic tasks while holding the beat lease.
+    Standby replicas keep ticking so they can take over within one lease TTL.
+    Every task sent carries the fencing token as a `fence` kwarg.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.lease = LeaderLease(BEAT_LEASE)
+        super().__init__(*args, **kwargs)
+
+    def tick(self, *args, **kwargs):
+        if self.lease.acquire() is None:
+            return self.lease.renew_interval
+        return min(super().tick(*args, **kwargs), self.lease.renew_interval)
+
+    def apply_async(self, entry, producer=None, advance=True, **kwargs):
+        entry.kwargs = {**(entry.kwargs or {}), "fence": self.lease.token}
+        return super().apply_async(entry, producer=producer, advance=advance, **kwargs)
@@ -0,0 +1,182 @@
+import heapq
+import logging
+import threading
+import time
+from gabay.core.database import db
+from gabay.core.utils.redis_client import get_redis, redis_enabled
+from gabay.worker.leader import LeaderLease, is_current_fence
+
+logger = logging.getLogger(__name__)
+
+# Redis pub/sub channel carrying reminder ids that changed ("*" = reload everything)
+REMINDERS_CHANNEL = "gabay:reminders:changed"
+
+# Leader lease shared by every reminder scheduler replica
+REMINDERS_LEASE = "reminders"
+
+# Scheduler running in this process (embedded mode), notified directly
+_local_scheduler = None
+
+def notify_reminders_changed(reminder_id: str = "*"):
+    """Tells the running scheduler to resync one reminder (or all of them)."""
+    if _local_scheduler is not None:
+        _local_scheduler.notify(reminder_id)
+    if not redis_enabled():
+        return
+    try:
+        get_redis().publish(REMINDERS_CHANNEL, reminder_id)
+    except Exception as e:
+        # The scheduler's periodic full resync will still pick the change up
+        logger.warning(f"Could not publish reminder change: {e}")
+
+class ReminderScheduler:
+    """
+    Fires reminders at their exact trigger time from an in-memory min-heap.
+    The loop sleeps until the earliest deadline and is woken early by change
+    notifications, so idle cost stays near zero regardless of how many reminders exist.
+    Stale heap entries are skipped lazily instead of being removed.
+    """
+
+    # Safety net in case a pub/sub notification was missed
+    FULL_RESYNC_SECONDS = 600
+
+    def __init__(self):
+        self._heap = []
+        self._deadlines = {}  # reminder id -> trigger timestamp currently scheduled
+        self._pending_changes = set()
+        self._changes_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._last_full_sync = 0.0
+        # Only the lease holder fires reminders; a replica that takes over reloads the table first
+        self._lease = LeaderLease(REMINDERS_LEASE)
+
+    def _schedule(self, reminder: dict):
+        from gabay.worker.tasks import parse_trigger_time
+        ts = parse_trigger_time(reminder["trigger_time"]).timestamp()
+        self._deadlines[reminder["id"]] = ts
+        heapq.heappush(self._heap, (ts, reminder["id"]))
+
+    def reload(self):
+        self._heap = []
+        self._deadlines = {}
+        for r in db.get_reminders(status="pending"):
+            self._schedule(r)
+        self._last_full_sync = time.time()
+        logger.info(f"Reminder scheduler loaded {len(self._deadlines)} pending reminders")
+
+    def _resync(self, reminder_id: str):
+        reminder = db.get_reminder(reminder_id)
+        if reminder and reminder["status"] == "pending":
+            self._schedule(reminder)
+        else:
+            self._deadlines.pop(reminder_id, None)
+
+    def _apply_changes(self):
+        with self._changes_lock:
+            changes, self._pending_changes = self._pending_changes, set()
+        if "*" in changes or time.time() - self._last_full_sync > self.FULL_RESYNC_SECONDS:
+            self.reload()
+            return
+        for reminder_id in changes:
+            self._resync(reminder_id)
+
+    def _check_leadership(self) -> bool:
+        """Acquires or renews the lease. A node that just became leader queues a full reload."""
+        was_leading = self._lease.token is not None
+        if self._lease.acquire() is None:
+            return False
+        if not was_leading:
+            # Notifications may have been missed while standing by
+            self.notify()
+        return True
+
+    def _fire_due(self):
+        """Fires every due reminder and returns seconds until the next one (None if idle)."""
+        from gabay.worker.tasks import fire_reminder, parse_trigger_time
+        if self._lease.token is None:
+            return None
+        while self._heap:
+            ts, reminder_id = self._heap[0]
+            if self._deadlines.get(reminder_id) != ts:
+                heapq.heappop(self._heap)  # stale entry
+                continue
+            delay = ts - time.time()
+            if delay > 0:
+                return delay
+
+            heapq.heappop(self._heap)
+            del self._deadlines[reminder_id]
+            reminder = db.get_reminder(reminder_id)
+            if not reminder or reminder["status"] != "pending":
+                continue
+            if parse_trigger_time(reminder["trigger_time"]).timestamp() > time.time():
+                # Moved later and the change notification hasn't arrived yet
+                self._schedule(reminder)
+                continue
+            if not is_current_fence(REMINDERS_LEASE, self._lease.token):
+                # Deposed mid-batch; the new leader's own heap covers this reminder
+                logger.warning("Lost reminder scheduler leadership, standing by")
+                self._lease.token = None
+                return None
+            try:
+                updates = fire_reminder(reminder, parse_trigger_time(reminder["trigger_time"]))
+            except Exception as e:
+                logger.error(f"Failed to fire reminder {reminder_id}: {e}")
+                continue
+            if "trigger_time" in updates:
+                # Recurring: re-arm in place with the next occurrence
+                self._schedule({**reminder, **updates})
+        return None
+
+    def notify(self, reminder_id: str = "*"):
+        with self._changes_lock:
+            self._pending_changes.add(reminder_id)
+        self._wake.set()
+
+    def _listen(self):
+        while not self._stop.is_set():
+            try:
+                pubsub = get_redis().pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(REMINDERS_CHANNEL)
+                for message in pubsub.listen():
+                    self.notify(message["data"])
+            except Exception as e:
+                logger.warning(f"Reminder notification listener error: {e}; retrying in 5s")
+                time.sleep(5)
+
+    def run(self):
+        if redis_enabled():
+            threading.Thread(target=self._listen, name="gabay-reminder-listener", daemon=True).start()
+        while not self._stop.is_set():
+            self._wake.clear()
+            leading = self._check_leadership()
+            self._apply_changes()
+            delay = self._fire_due() if leading else None
+            timeout = self.FULL_RESYNC_SECONDS if delay is None else min(delay, self.FULL_RESYNC_SECONDS)
+            # Wake up in time to renew the lease (or to retry taking it over)
+            self._wake.wait(min(timeout, self._lease.renew_interval))
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+def run_scheduler():
+    ReminderScheduler().run()
+
+def start_local_scheduler() -> ReminderScheduler:
+    """Runs the scheduler on a daemon thread of this process and routes notifications to it."""
+    global _local_scheduler
+    _local_scheduler = ReminderScheduler()
+    threading.Thread(target=_local_scheduler.run, name="gabay-reminder-scheduler", daemon=True).start()
+    return _local_scheduler
+
+def stop_local_scheduler():
+    global _local_scheduler
+    if _local_scheduler is not None:
+        _local_scheduler.stop()
+        _local_scheduler = None
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    run_scheduler()
@@ -1,51 +1,165 @@
 import asyncio
-from gabay.worker.celery_app import celery_app
+import functools
+import logging
+import random
+import threading
+import time
+import uuid
+from celery.signals import worker_init, worker_process_init, worker_process_shutdown
+from gabay.worker.celery_app import celery_app, task_profile
 from gabay.core.skills.brief import generate_brief
 from gabay.core.skills.save import save_file_or_text
 from gabay.core.skills.search import execute_search
 from gabay.core.memory import append_message
+from gabay.core.utils.dedup import save_result
+from gabay.core.utils.redis_client import RedisSemaphore
+
+logger = logging.getLogger(__name__)
+
+# Each worker process keeps one event loop alive in a background thread so pooled
+# async clients (Groq, httpx) and caches survive between tasks.
+_worker_loop = None
+_worker_loop_lock = threading.Lock()
+
+def _start_worker_loop():
+    global _worker_loop
+    with _worker_loop_lock:
+        if _worker_loop is None or _worker_loop.is_closed():
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="gabay-worker-loop", daemon=True).start()
+            _worker_loop = loop
+    return _worker_loop
+
+@worker_init.connect
+def preload_google_apis(**kwargs):
+    # Parsed once in the parent so every forked child inherits the documents
+    from gabay.core.connectors.google_api import preload_discovery_docs
+    preload_discovery_docs()
+
+@worker_process_init.connect
+def init_worker_loop(**kwargs):
+    global _worker_loop
+    # Never reuse a loop inherited from the parent: its thread didn't survive the fork
+    _worker_loop = None
+    _start_worker_loop()
+
+@worker_process_shutdown.connect
+def stop_worker_loop(**kwargs):
+    if _worker_loop is not None:
+        _worker_loop.call_soon_threadsafe(_worker_loop.stop)
 
 # We need a synchronous wrapper for async functions since Celery tasks are typically synchronous
 def run_async(coro):
     """
-    Synchronous wrapper for async functions with better event loop management.
+    Runs a coroutine on this process's persistent event loop and waits for the result.
+    The loop is started lazily when tasks run outside a prefork child (solo pool, local fallback).
     """
+    loop = _worker_loop or _start_worker_loop()
+    future = asyncio.run_coroutine_threadsafe(coro, loop)
     try:
-        return asyncio.get_event_loop().run_until_complete(coro)
-    except RuntimeError:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        return loop.run_until_complete(coro)
-
-@celery_app.task(name="worker.tasks.process_brief")
-def process_brief(user_id: int):
-    # Generate the brief
-    result = run_async(generate_brief(str(user_id)))
-        
-    # We would ideally send this back to Telegram via the Bot API
-    # For now, we save it to memory so the core can serve it or the bot can send it
-    append_message(user_id, "assistant", result)
-    
-    # Send message to user
-    send_telegram_message(user_id, result)
-    return result
+        return future.result()
+    except BaseException:
+        # e.g. SoftTimeLimitExceeded raised into this thread: stop the coroutine as well
+        future.cancel()
+        raise
 
-@celery_app.task(name="worker.tasks.process_save")
-def process_save(user_id: int, file_path: str = None, text_content: str = None):
-    result = save_file_or_text(str(user_id), file_path, text_content)
-    append_message(user_id, "assistant", result)
-    send_telegram_message(user_id, result)
-    return result
+# Coroutine bodies of async tasks, keyed by task name, for the asyncio-native worker
+ASYNC_HANDLERS = {}
+
+# Handlers whose skills still make synchronous Google API / OCR calls. Runners that share
+# one loop between tasks (`gabay worker --async`, embedded mode) give each run its own
+# thread and event loop via run_isolated instead of awaiting it on the shared loop.
+BLOCKING_HANDLERS = set()
+
+# Seconds to wait before retrying a task whose profile is at its concurrency cap
+PROFILE_BUSY_RETRY = (5, 15)
+
+# Fraction of a /save upload between progress messages
+UPLOAD_PROGRESS_STEP = 0.25
+
+def profile_semaphore(task_name: str):
+    """Cluster-wide semaphore for the task's resource profile, or None if it's uncapped."""
+    profile_name, profile = task_profile(task_name)
+    if not profile["max_concurrency"]:
+        return None
+    # Lease outlives the hard time limit so only crashed holders ever expire
+    return RedisSemaphore(profile_name, profile["max_concurrency"], lease=profile["time_limit"] + 60)
+
+def run_isolated(coro_func, *args, **kwargs):
+    """Runs a blocking handler to completion on a private event loop in the calling thread."""
+    return asyncio.run(coro_func(*args, **kwargs))
+
+def async_task(name: str, blocking: bool = False, **options):
+    """
+    Registers a coroutine as a Celery task. Prefork workers run it on the persistent
+    worker loop via run_async; `gabay worker --async` awaits the coroutine directly,
+    or runs it in a thread of its own when `blocking` is set.
+    """
+    def decorator(coro_func):
+        ASYNC_HANDLERS[name] = coro_func
+        if blocking:
+            BLOCKING_HANDLERS.add(name)
+
+        @celery_app.task(name=name, bind=True, **options)
+        @functools.wraps(coro_func)
+        def task(self, *args, **kwargs):
+            # Local fallback runs (called directly, outside a worker) aren't capped
+            semaphore = None if self.request.called_directly else profile_semaphore(name)
+            token = self.request.id or str(uuid.uuid4())
+            if semaphore and not semaphore.acquire(token):
+                logger.info(f"Profile for '{name}' is at capacity, retrying later")
+                raise self.retry(countdown=random.uniform(*PROFILE_BUSY_RETRY), max_retries=None)
+            try:
+                result = run_async(coro_func(*args, **kwargs))
+            except Exception:
+                save_result(self.request.id, None, ok=False)
+                raise
+            finally:
+                if semaphore:
+                    semaphore.release(token)
+            # Lets duplicate submissions reuse this run instead of redoing it
+            save_result(self.request.id, result)
+            return result
+        return task
+    return decorator
 
-@celery_app.task(name="worker.tasks.process_search")
-def process_search(user_id: int, query: str):
-    result = run_async(execute_search(str(user_id), query))
+async def _deliver(user_id: int, result: str) -> str:
+    """Records the skill result in history and sends it to the user."""
     append_message(user_id, "assistant", result)
-    send_telegram_message(user_id, result)
+    await asyncio.to_thread(send_telegram_message, user_id, result)
     return result
 
-@celery_app.task(name="worker.tasks.process_email")
-def process_email(user_id: int, email_data_str: str):
+@async_task("worker.tasks.process_brief")
+async def process_brief(user_id: int):
+    # Generate the brief
+    result = await generate_brief(str(user_id))
+    return await _deliver(user_id, result)
+
+def _upload_progress_reporter(user_id: int, step: float = UPLOAD_PROGRESS_STEP):
+    """Returns a progress callback that messages the user each time another `step` of an upload is done."""
+    reported = [0.0]
+
+    def report(fraction: float):
+        # The finished upload is announced by the result itself
+        if fraction < 1.0 and fraction - reported[0] >= step:
+            reported[0] = fraction
+            send_telegram_message(user_id, f"⏫ Uploading to Google Drive... {int(fraction * 100)}%")
+    return report
+
+@async_task("worker.tasks.process_save")
+async def process_save(user_id: int, file_path: str = None, text_content: str = None):
+    result = await asyncio.to_thread(
+        save_file_or_text, str(user_id), file_path, text_content, _upload_progress_reporter(user_id)
+    )
+    return await _deliver(user_id, result)
+
+@async_task("worker.tasks.process_search")
+async def process_search(user_id: int, query: str):
+    result = await execute_search(str(user_id), query)
+    return await _deliver(user_id, result)
+
+@async_task("worker.tasks.process_email")
+async def process_email(user_id: int, email_data_str: str):
     from gabay.core.skills.email import send_email_skill, handle_triage_skill, handle_smart_draft_skill
     import json
     
@@ -54,84 +168,73 @@ def process_email(user_id: int, email_data_str: str):
         action = data.get("action", "send")
         
         if action == "triage":
-            result = run_async(handle_triage_skill(str(user_id)))
+            result = await handle_triage_skill(str(user_id))
         elif action == "smart_draft":
             thread_id = data.get("thread_id")
             prompt = data.get("prompt")
-            result = run_async(handle_smart_draft_skill(str(user_id), thread_id, prompt))
+            result = await handle_smart_draft_skill(str(user_id), thread_id, prompt)
         else:
-            result = send_email_skill(str(user_id), email_data_str)
+            result = await asyncio.to_thread(send_email_skill, str(user_id), email_data_str)
     except Exception as e:
         result = f"I failed to process that email request: {e}"
         
-    append_message(user_id, "assistant", result)
-    send_telegram_message(user_id, result)
-    return result
+    return await _deliver(user_id, result)
 
-@celery_app.task(name="worker.tasks.process_read")
-def process_read(user_id: int, source: str = "all"):
+@async_task("worker.tasks.process_read")
+async def process_read(user_id: int, source: str = "all"):
     from gabay.core.skills.read import handle_read_skill
-    result = run_async(handle_read_skill(str(user_id), source))
-        
-    append_message(user_id, "assistant", result)
-    send_telegram_message(user_id, result)
-    return result
+    result = await handle_read_skill(str(user_id), source)
+    return await _deliver(user_id, result)
 
-@celery_app.task(name="worker.tasks.process_calendar")
-def process_calendar(user_id: int, command_args: str):
-    from gabay.core.skills.calendar import handle_calendar_skill, handle_calendar_briefing
+@async_task("worker.tasks.process_calendar")
+async def process_calendar(user_id: int, command_args: str):
+    from gabay.core.skills.calendar import handle_calendar_skill, handle_calendar_briefing, brief_next_meeting
     import json
     try:
         data = json.loads(command_args)
         action = data.get("action")
         if action == "briefing":
-            result = run_async(handle_calendar_briefing(user_id))
+            # Asked for now: brief the next meeting immediately, then queue the lead-time briefings
+            result = await brief_next_meeting(user_id)
+            scheduled = _schedule_briefings(user_id, await handle_calendar_briefing(user_id))
+            if scheduled:
+                result += f"\n\n📅 I'll also brief you before your next {scheduled} meeting(s)."
         else:
-            result = handle_calendar_skill(user_id, command_args)
+            result = await asyncio.to_thread(handle_calendar_skill, user_id, command_args)
     except Exception:
-        result = handle_calendar_skill(user_id, command_args)
+        result = await asyncio.to_thread(handle_calendar_skill, user_id, command_args)
         
-    append_message(user_id, "assistant", result)
-    send_telegram_message(user_id, result)
-    return result
+    return await _deliver(user_id, result)
 
-@celery_app.task(name="worker.tasks.process_share")
-def process_share(user_id: int, command_args: str):
+@async_task("worker.tasks.process_share")
+async def process_share(user_id: int, command_args: str):
     from gabay.core.skills.share import handle_share_skill
-    result = run_async(handle_share_skill(user_id, command_args))
-    append_message(user_id, "assistant", result)
-    send_telegram_message(user_id, result)
-    return result
+    result = await handle_share_skill(user_id, command_args)
+    return await _deliver(user_id, result)
 
-@celery_app.task(name="worker.tasks.process_file_qa")
-def process_file_qa(user_id: int, command_args: str):
+@async_task("worker.tasks.process_file_qa")
+async def process_file_qa(user_id: int, command_args: str):
     from gabay.core.skills.document_qa import handle_document_qa_skill
-    result = run_async(handle_document_qa_skill(user_id, command_args))
-    append_message(user_id, "assistant", result)
-    send_telegram_message(user_id, result)
-    return result
+    result = await handle_document_qa_skill(user_id, command_args)
+    return await _deliver(user_id, result)
 
-@celery_app.task(name="worker.tasks.process_news")
-def process_news(user_id: int, topic: str):
+@async_task("worker.tasks.process_news")
+async def process_news(user_id: int, topic: str):
     from gabay.core.skills.news import handle_news_skill
-    result = run_async(handle_news_skill(topic))
-    append_message(user_id, "assistant", result)
-    send_telegram_message(user_id, result)
-    return result
+    result = await handle_news_skill(topic)
+    return await _deliver(user_id, result)
 
-@celery_app.task(name="worker.tasks.process_docs")
-def process_docs(user_id: int, command_args: str):
+@async_task("worker.tasks.process_docs", blocking=True)
+async def process_docs(user_id: int, command_args: str):
     from gabay.core.skills.docs import handle_docs_skill
-    result = run_async(handle_docs_skill(user_id, command_args))
-    append_message(user_id, "assistant", result)
-    send_telegram_message(user_id, result)
-    return result
+    result = await handle_docs_skill(user_id, command_args)
+    return await _deliver(user_id, result)
 
-@celery_app.task(name="worker.tasks.process_slides")
-def process_slides(user_id: int, command_args: str):
+@async_task("worker.tasks.process_slides", blocking=True)
+async def process_slides(user_id: int, command_args: str):
     from gabay.core.skills.slides import handle_slides_skill
     import json
-    def run_skill(args_str):
+    async def run_skill(args_str):
         data = json.loads(args_str)
         topic = data.get("topic")
         title = data.get("title")
@@ -140,40 +243,38 @@ def process_slides(user_id: int, command_args: str):
         share_mode = data.get("share_mode", "private")
         role = data.get("role", "writer")
         
-        return run_async(handle_slides_skill(
+        return await handle_slides_skill(
             user_id, topic, title=title, 
             email_to=email_to, invite_email=invite_email, 
             share_mode=share_mode, role=role
-        ))
+        )
 
     try:
-        result = run_skill(command_args)
+        result = await run_skill(command_args)
     except Exception as e:
         logger.error(f"Error processing slides task: {e}")
         result = f"I couldn't process the slides request content: {e}"
         
-    append_message(user_id, "assistant", result)
-    send_telegram_message(user_id, result)
-    return result
+    return await _deliver(user_id, result)
 
-@celery_app.task(name="worker.tasks.process_sheets")
-def process_sheets(user_id: int, command_args: str):
+@async_task("worker.tasks.process_sheets", blocking=True)
+async def process_sheets(user_id: int, command_args: str):
     from gabay.core.skills.sheets import handle_sheets_skill, handle_data_extraction_skill, handle_auto_report_skill
     import json
     
-    def run_skill(args_str):
+    async def run_skill(args_str):
         data = json.loads(args_str)
         action = data.get("action", "create")
         
         if action == "extract":
             gmail_query = data.get("gmail_query")
             sheet_title = data.get("title")
-            return run_async(handle_data_extraction_skill(user_id, gmail_query, sheet_title))
+            return await handle_data_extraction_skill(user_id, gmail_query, sheet_title)
         
         elif action == "report":
             spreadsheet_id = data.get("spreadsheet_id")
             report_topic = data.get("topic")
-            return run_async(handle_auto_report_skill(user_id, spreadsheet_id, report_topic))
+            return await handle_auto_report_skill(user_id, spreadsheet_id, report_topic)
         
         # Default create logic
         topic = data.get("topic")
@@ -183,61 +284,86 @@ def process_sheets(user_id: int, command_args: str):
         share_mode = data.get("share_mode", "private")
         role = data.get("role", "writer")
         
-        return run_async(handle_sheets_skill(
+        return await handle_sheets_skill(
             user_id, topic, title=title, 
             email_to=email_to, invite_email=invite_email, 
             share_mode=share_mode, role=role
-        ))
+        )
 
     try:
-        result = run_skill(command_args)
+        result = await run_skill(command_args)
     except Exception as e:
         logger.error(f"Error processing sheets task: {e}")
         result = f"I couldn't process the spreadsheet request content: {e}"
         
-    append_message(user_id, "assistant", result)
-    send_telegram_message(user_id, result)
-    return result
+    return await _deliver(user_id, result)
+
+def parse_trigger_time(value: str):
+    """Parses a stored trigger_time into an aware UTC datetime."""
+    from datetime import datetime, timezone
+    trigger_dt = datetime.fromisoformat(value)
+    # Ensure trigger_dt is aware (in case it was stored without TZ info)
+    if trigger_dt.tzinfo is None:
+        trigger_dt = trigger_dt.replace(tzinfo=timezone.utc)
+    return trigger_dt
+
+def fire_reminder(r: dict, trigger_dt) -> dict:
+    """
+    Enqueues a due reminder and advances it to its next occurrence (or completes it).
+    Returns the updates written to the reminders table.
+    """
+    from gabay.core.database import db
+    from datetime import timedelta
+    
+    logger.info(f"Triggering reminder: {r['id']} - {r['message']}")
+    execute_reminder.delay(r["id"])
+    
+    # Update status immediately to prevent double firing
+    updates = {}
+    interval = r.get("interval_seconds")
+    remaining = r.get("remaining_count")
+
+    if interval and (remaining is None or remaining > 0):
+        # Reschedule
+        next_trigger = trigger_dt + timedelta(seconds=interval)
+        updates["trigger_time"] = next_trigger.isoformat()
+        if remaining is not None:
+            updates["remaining_count"] = remaining - 1
+    elif r["frequency"] == "daily":
+        updates["trigger_time"] = (trigger_dt + timedelta(days=1)).isoformat()
+    elif r["frequency"] == "weekly":
+        updates["trigger_time"] = (trigger_dt + timedelta(weeks=1)).isoformat()
+    else:
+        updates["status"] = "completed"
+    
+    db.update_reminder(r["id"], updates)
+    return updates
 
 @celery_app.task(name="worker.tasks.check_reminders")
-def check_reminders():
+def check_reminders(fence: int = None):
+    """
+    Polling fallback for deployments without the reminder scheduler (`gabay scheduler`).
+    Sent every minute by beat, but does nothing while a scheduler holds the reminders lease.
+    """
     from gabay.core.database import db
-    from datetime import datetime, timedelta, timezone
-    import logging
+    from gabay.worker.leader import BEAT_LEASE, is_current_fence, is_lease_held
+    from gabay.worker.scheduler import REMINDERS_LEASE
+    from datetime import datetime, timezone
+
+    if is_lease_held(REMINDERS_LEASE):
+        return
     
-    logger = logging.getLogger("gabay.worker.tasks")
     reminders = db.get_reminders(status="pending")
     now = datetime.now(timezone.utc)
     
     for r in reminders:
-        trigger_dt = datetime.fromisoformat(r["trigger_time"])
-        # Ensure trigger_dt is aware (in case it was stored without TZ info)
-        if trigger_dt.tzinfo is None:
-            trigger_dt = trigger_dt.replace(tzinfo=timezone.utc)
-            
+        trigger_dt = parse_trigger_time(r["trigger_time"])
         if now >= trigger_dt:
-            logger.info(f"Triggering reminder: {r['id']} - {r['message']}")
-            execute_reminder.delay(r["id"])
-            
-            # Update status immediately to prevent double firing
-            updates = {}
-            interval = r.get("interval_seconds")
-            remaining = r.get("remaining_count")
-
-            if interval and (remaining is None or remaining > 0):
-                # Reschedule
-                next_trigger = trigger_dt + timedelta(seconds=interval)
-                updates["trigger_time"] = next_trigger.isoformat()
-                if remaining is not None:
-                    updates["remaining_count"] = remaining - 1
-            elif r["frequency"] == "daily":
-                updates["trigger_time"] = (trigger_dt + timedelta(days=1)).isoformat()
-            elif r["frequency"] == "weekly":
-                updates["trigger_time"] = (trigger_dt + timedelta(weeks=1)).isoformat()
-            else:
-                updates["status"] = "completed"
-            
-            db.update_reminder(r["id"], updates)
+            # Re-checked per reminder: a newer beat leader may have taken over meanwhile
+            if not is_current_fence(BEAT_LEASE, fence):
+                logger.warning(f"check_reminders: fence {fence} is stale, stopping")
+                return
+            fire_reminder(r, trigger_dt)
 
 @celery_app.task(name="worker.tasks.execute_reminder")
 def execute_reminder(reminder_id: str):
@@ -246,10 +372,7 @@ def execute_reminder(reminder_id: str):
     from gabay.core.utils.telegram import send_telegram_message
     
     # Query specific reminder by ID
-    with db._get_connection() as conn:
-        row = conn.execute("SELECT * FROM reminders WHERE id = ?", (reminder_id,)).fetchone()
-    
-    reminder = dict(row) if row else None
+    reminder = db.get_reminder(reminder_id)
     
     if not reminder:
         return
@@ -260,6 +383,16 @@ def execute_reminder(reminder_id: str):
     
     target_chat_id = user_id # Default to self
     
+    # Group reminders ("alice, bob") fan out through the userbot's paced bulk sender
+    recipient_names = [n.strip().lower() for n in (recipient_name or "").split(",") if n.strip()]
+    if len(recipient_names) > 1 and reminder.get("action") != "email":
+        from gabay.core.utils.userbot import userbot, format_bulk_report
+        contacts = get_contacts(user_id)
+        recipients = {name: contacts.get(name) or name for name in recipient_names}
+        report = run_async(userbot.send_bulk(user_id, recipients, message))
+        send_telegram_message(user_id, f"🔔 **Reminder sent:** {message}\n\n{format_bulk_report(report)}")
+        return
+    
     if recipient_name:
         contacts = get_contacts(user_id)
         target_chat_id = contacts.get(recipient_name.lower(), user_id)
@@ -277,31 +410,114 @@ def execute_reminder(reminder_id: str):
         send_telegram_message(target_chat_id, f"{prefix}{message}")
 
 @celery_app.task(name="worker.tasks.proactive_heartbeat")
-def proactive_heartbeat():
+def proactive_heartbeat(fence: int = None):
     from gabay.core.connectors.token_manager import token_manager
-    import logging
-    logger = logging.getLogger("gabay.worker.tasks")
+    from gabay.worker.heartbeat import plan_heartbeat, build_sweeps
+    from gabay.worker.leader import BEAT_LEASE, is_current_fence
+
+    if not is_current_fence(BEAT_LEASE, fence):
+        logger.warning(f"proactive_heartbeat: fence {fence} is stale (sent by a deposed beat leader), skipping")
+        return
     
     user_ids = token_manager.get_all_users()
-    logger.info(f"Running proactive heartbeat for users: {user_ids}")
-    for uid_str in user_ids:
+    plan = plan_heartbeat(user_ids)
+    sweeps = build_sweeps(plan)
+    logger.info(f"Proactive heartbeat: {len(plan)} of {len(user_ids)} users due this window, {len(sweeps)} sweep(s)")
+    for sweep_id, countdown, users in sweeps:
+        proactive_sweep.apply_async((sweep_id, users), countdown=countdown)
+
+@celery_app.task(name="worker.tasks.sync_document_indexes")
+def sync_document_indexes(fence: int = None):
+    """Fans out a Drive/Notion index sync for every connected user."""
+    from gabay.core.connectors.token_manager import token_manager
+    from gabay.worker.leader import BEAT_LEASE, is_current_fence
+
+    if not is_current_fence(BEAT_LEASE, fence):
+        logger.warning(f"sync_document_indexes: fence {fence} is stale (sent by a deposed beat leader), skipping")
+        return
+
+    for uid_str in token_manager.get_all_users():
+        if uid_str.isdigit():
+            sync_document_index.delay(uid_str)
+
+@celery_app.task(name="worker.tasks.sync_document_index")
+def sync_document_index(user_id: str):
+    """Builds or refreshes one user's local Drive and Notion index."""
+    from gabay.core.connectors.google_api import sync_drive_index
+    from gabay.core.connectors.notion_api import sync_notion_index
+
+    for source, sync in (("Drive", sync_drive_index), ("Notion", sync_notion_index)):
         try:
-            user_id = int(uid_str)
-            # 1. Triage Gmail
-            triage_gmail_proactive.delay(user_id)
-            # 2. Check Upcoming Meetings
-            check_meeting_briefings.delay(user_id)
+            sync(user_id, force=True, bootstrap=True)
         except Exception as e:
-            logger.error(f"Heartbeat failed for user {uid_str}: {e}")
+            logger.error(f"{source} index sync failed for user {user_id}: {e}")
+
+@async_task("worker.tasks.proactive_sweep")
+async def proactive_sweep(sweep_id: str, users: list):
+    """
+    Runs the proactive checks for a slice of users concurrently. Each user starts at
+    their planned time; finished users are checkpointed so a redelivered sweep resumes.
+    """
+    from gabay.worker.heartbeat import SWEEP_CONCURRENCY, completed_users, mark_user_done
 
-@celery_app.task(name="worker.tasks.triage_gmail_proactive")
-def triage_gmail_proactive(user_id: int):
+    done = completed_users(sweep_id)
+    if done:
+        logger.info(f"Resuming sweep {sweep_id}: {len(done)} of {len(users)} users already done")
+    semaphore = asyncio.Semaphore(SWEEP_CONCURRENCY)
+
+    async def run_user(user_id: int, run_at: float):
+        await asyncio.sleep(max(0, run_at - time.time()))
+        async with semaphore:
+            try:
+                await _proactive_checks(user_id)
+            except Exception as e:
+                logger.error(f"Proactive checks failed for user {user_id}: {e}")
+        # Failures count as done too: the next window retries, a redelivery shouldn't
+        mark_user_done(sweep_id, user_id)
+
+    await asyncio.gather(*(run_user(uid, run_at) for uid, run_at in users if uid not in done))
+
+async def _proactive_checks(user_id: int):
+    """Gmail triage and meeting briefings for one user, sharing one credential load."""
+    from gabay.core.connectors.google_api import get_google_credentials, build_google_service
+    from gabay.core.skills.email import handle_triage_skill
+    from gabay.core.skills.calendar import handle_calendar_briefing
+
+    creds = await asyncio.to_thread(get_google_credentials, str(user_id))
+    if not creds:
+        return
+    # One service (and HTTP connection) per API, since each check runs in its own thread
+    gmail, calendar = await asyncio.gather(
+        asyncio.to_thread(build_google_service, creds, "gmail", "v1"),
+        asyncio.to_thread(build_google_service, creds, "calendar", "v3"),
+    )
+    _, briefings = await asyncio.gather(
+        handle_triage_skill(str(user_id), proactive=True, gmail_service=gmail),
+        handle_calendar_briefing(user_id, calendar_service=calendar),
+    )
+    _schedule_briefings(user_id, briefings)
+
+@async_task("worker.tasks.triage_gmail_proactive")
+async def triage_gmail_proactive(user_id: int):
     from gabay.core.skills.email import handle_triage_skill
-    run_async(handle_triage_skill(str(user_id), proactive=True))
+    await handle_triage_skill(str(user_id), proactive=True)
 
-@celery_app.task(name="worker.tasks.check_meeting_briefings")
-def check_meeting_briefings(user_id: int):
+@async_task("worker.tasks.check_meeting_briefings")
+async def check_meeting_briefings(user_id: int):
     from gabay.core.skills.calendar import handle_calendar_briefing
-    run_async(handle_calendar_briefing(user_id))
+    _schedule_briefings(user_id, await handle_calendar_briefing(user_id))
+
+def _schedule_briefings(user_id: int, briefings: list) -> int:
+    for briefing in briefings:
+        send_meeting_briefing.apply_async(
+            (user_id, briefing["event_id"], briefing["event_start"]),
+            eta=briefing["send_at"],
+        )
+    return len(briefings)
+
+@async_task("worker.tasks.send_meeting_briefing")
+async def send_meeting_briefing(user_id: int, event_id: str, event_start: str):
+    from gabay.core.skills.calendar import send_meeting_briefing as send_briefing
+    await send_briefing(user_id, event_id, event_start)
 
 from gabay.core.utils.telegram import send_telegram_message
@@ -0,0 +1,68 @@
+import time
+from gabay.worker import leader
+
+
+class FakeRedis:
+    """
+    In-memory stand-in for the few Redis commands Gabay uses for coordination.
+    Keys expire against `now`, which tests advance instead of sleeping.
+    """
+
+    def __init__(self):
+        self.now = time.time()
+        self.data = {}
+        self.expires = {}
+        self.published = []
+
+    def _alive(self, key):
+        expires_at = self.expires.get(key)
+        if expires_at is not None and expires_at <= self.now:
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return key in self.data
+
+    def get(self, key):
+        return self.data.get(key) if self._alive(key) else None
+
+    def set(self, key, value, nx=False, ex=None, px=None):
+        if nx and self._alive(key):
+            return None
+        self.data[key] = str(value)
+        self.expires.pop(key, None)
+        if ex is not None:
+            self.expires[key] = self.now + ex
+        if px is not None:
+            self.expires[key] = self.now + px / 1000
+        return True
+
+    def incr(self, key):
+        value = int(self.get(key) or 0) + 1
+        self.data[key] = str(value)
+        return value
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+
+    def publish(self, channel, message):
+        self.published.append((channel, message))
+
+    def eval(self, script, numkeys, *keys_and_args):
+        keys, args = keys_and_args[:numkeys], keys_and_args[numkeys:]
+        if script == leader._ACQUIRE_SCRIPT:
+            return self._acquire_lease(keys[0], keys[1], args[0], int(args[1]))
+        raise NotImplementedError("FakeRedis only runs the leader lease script")
+
+    def _acquire_lease(self, lease_key, fence_key, node_id, ttl_ms):
+        # Same steps as leader._ACQUIRE_SCRIPT
+        current = self.get(lease_key)
+        if current:
+            owner, token = current.rsplit(":", 1)
+            if owner == node_id:
+                self.expires[lease_key] = self.now + ttl_ms / 1000
+                return int(token)
+            return None
+        token = self.incr(fence_key)
+        self.set(lease_key, f"{node_id}:{token}", px=ttl_ms)
+        return token
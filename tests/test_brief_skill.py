@@ -1,56 +1,23 @@
 import asyncio
-import sys
-import os
-from unittest.mock import MagicMock, patch, AsyncMock
+import pytest
+from unittest.mock import patch, AsyncMock
 
-# Mock ALL core dependencies
-sys.modules["pydantic"] = MagicMock()
-sys.modules["pydantic_settings"] = MagicMock()
-sys.modules["googleapiclient"] = MagicMock()
-sys.modules["googleapiclient.discovery"] = MagicMock()
-sys.modules["google"] = MagicMock()
-sys.modules["google.oauth2"] = MagicMock()
-sys.modules["google.oauth2.credentials"] = MagicMock()
-sys.modules["notion_client"] = MagicMock()
-sys.modules["groq"] = MagicMock()
-
-# Mock core submodules
-sys.modules["core.config"] = MagicMock()
-sys.modules["core.connectors.token_manager"] = MagicMock()
-sys.modules["core.connectors.google_api"] = MagicMock()
-sys.modules["core.connectors.imap_api"] = MagicMock()
-sys.modules["core.connectors.meta_api"] = MagicMock()
-
-# Add the project root to sys.path
-sys.path.append(os.getcwd())
-
-from core.skills.brief import generate_brief
+from gabay.core.skills.brief import generate_brief
 
+@pytest.mark.asyncio
 async def test_generate_brief():
     print("Testing generate_brief...")
-    with patch("core.skills.brief.get_unread_emails_imap") as mock_imap, \
-         patch("core.skills.brief.get_unread_emails") as mock_google, \
-         patch("core.skills.brief.get_unread_notifications") as mock_meta, \
-         patch("core.skills.brief.AsyncGroq") as mock_groq:
+    with patch("gabay.core.skills.brief.get_unread_emails_imap") as mock_imap, \
+         patch("gabay.core.skills.brief.get_unread_emails_full") as mock_google, \
+         patch("gabay.core.skills.brief.get_unread_notifications") as mock_meta, \
+         patch("gabay.core.utils.llm.get_llm_response", new_callable=AsyncMock) as mock_llm:
         
         mock_imap.return_value = ["IMAP Email"]
-        mock_google.return_value = ["Google API Email"]
+        mock_google.return_value = [{"sender": "Google API", "subject": "Email"}]
         mock_meta.return_value = ["Meta Notification"]
         
-        # Mock Groq response
-        mock_client = MagicMock()
-        mock_groq.return_value = mock_client
-        
-        # Create a mock response object
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock(message=MagicMock(content="Mocked Briefing"))]
-        
-        # Mock the async call
-        mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
-        
-        # Set settings.groq_api_key to something non-empty
-        from core.config import settings
-        settings.groq_api_key = "test_key"
+        # Mock the LLM response
+        mock_llm.return_value = "Mocked Briefing"
         
         result = await generate_brief("test_user")
         print(f"Result: {result}")
@@ -0,0 +1,43 @@
+from unittest.mock import MagicMock, patch
+from gabay.core.connectors import google_api
+
+
+def services(batch_errors=()):
+    """Fake Slides and Drive services; batchUpdate raises the given errors in turn, then succeeds."""
+    slides, drive = MagicMock(), MagicMock()
+    presentations = slides.presentations.return_value
+    presentations.create.return_value.execute.return_value = {
+        "presentationId": "p1", "title": "Deck", "slides": [{"objectId": "default"}],
+    }
+    presentations.batchUpdate.return_value.execute.side_effect = list(batch_errors) + [{}] * 10
+    by_api = {"slides": slides, "drive": drive}
+    return slides, drive, patch.object(google_api, "get_google_service", side_effect=lambda uid, api, version: by_api[api])
+
+
+def test_deck_is_built_in_one_batch_replacing_the_default_slide():
+    slides, drive, patched = services()
+    with patched:
+        result = google_api.build_presentation("1", "Deck", [{"title": "A", "body": "a"}, {"title": "B", "body": "b"}])
+
+    assert result["id"] == "p1"
+    batch = slides.presentations.return_value.batchUpdate.call_args.kwargs["body"]["requests"]
+    assert batch[0] == {"deleteObject": {"objectId": "default"}}
+    assert sum("createSlide" in r for r in batch) == 2
+    drive.files.return_value.delete.assert_not_called()
+
+
+def test_empty_deck_is_refused_before_anything_is_created():
+    slides, _, patched = services()
+    with patched:
+        assert "error" in google_api.build_presentation("1", "Deck", [])
+    slides.presentations.return_value.create.assert_not_called()
+
+
+def test_failed_build_deletes_the_half_built_deck():
+    slides, drive, patched = services(batch_errors=[None, RuntimeError("quota exceeded")])
+    deck = [{"title": f"S{i}", "body": "x"} for i in range(40)]
+    with patched, patch.object(google_api, "SLIDES_MAX_BATCH_REQUESTS", 20):
+        result = google_api.build_presentation("1", "Deck", deck)
+
+    assert result == {"error": "quota exceeded"}
+    drive.files.return_value.delete.assert_called_once_with(fileId="p1")
@@ -0,0 +1,102 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from gabay.core.utils import dedup, dispatcher, redis_client
+from fakes import FakeRedis
+
+
+@pytest.fixture
+def fake_redis():
+    fake = FakeRedis()
+    with patch.object(redis_client.settings, "redis_url", "redis://fake"), \
+         patch.object(dedup, "get_redis", return_value=fake):
+        yield fake
+
+
+@pytest.fixture
+def celery_task():
+    """A task as dispatch_task sees it, with Celery reported online."""
+    task = MagicMock(__name__="process_search")
+    inspect = MagicMock()
+    inspect.return_value.active.return_value = {"worker@host": []}
+    with patch.object(dispatcher.settings, "embedded_mode", False), \
+         patch.object(dispatcher.celery_app.control, "inspect", inspect):
+        yield task
+
+
+def test_keys_ignore_json_key_order_case_and_spacing():
+    a = dedup.dedup_key("process_docs", (1, '{"topic": "Q3", "title": "Plan"}'), {})
+    b = dedup.dedup_key("process_docs", (1, '{"title":"Plan","topic":"Q3"}'), {})
+    assert a == b
+    assert dedup.dedup_key("process_search", (1, "Budget  Report"), {}) == \
+        dedup.dedup_key("process_search", (1, "budget report"), {})
+    assert dedup.dedup_key("process_search", (1, "budget"), {}) != dedup.dedup_key("process_search", (2, "budget"), {})
+
+
+def test_first_claim_wins_until_the_window_passes(fake_redis):
+    key = dedup.dedup_key("process_search", (1, "budget"), {})
+
+    assert dedup.claim(key, "t1") is None
+    assert dedup.claim(key, "t2") == "t1"
+    fake_redis.now += dedup.DEDUP_WINDOW_SECONDS + 1
+    assert dedup.claim(key, "t3") is None
+
+
+def test_claims_fail_open_without_redis():
+    with patch.object(redis_client.settings, "redis_url", ""):
+        assert dedup.claim("k", "t1") is None
+        assert dedup.claim("k", "t2") is None
+        assert dedup.get_result("t1") is None
+
+
+@pytest.mark.asyncio
+async def test_duplicate_while_running_is_not_queued_again(fake_redis, celery_task):
+    assert await dispatcher.dispatch_task(celery_task, 1, "budget") is None
+    reply = await dispatcher.dispatch_task(celery_task, 1, "  Budget ")
+
+    assert reply.startswith("⏳")
+    celery_task.apply_async.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_duplicate_after_success_reuses_the_result(fake_redis, celery_task):
+    await dispatcher.dispatch_task(celery_task, 1, "budget")
+    dedup.save_result(celery_task.apply_async.call_args.kwargs["task_id"], "Found 3 files")
+
+    assert await dispatcher.dispatch_task(celery_task, 1, "budget") == "Found 3 files"
+    celery_task.apply_async.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_duplicate_after_failure_runs_again(fake_redis, celery_task):
+    await dispatcher.dispatch_task(celery_task, 1, "budget")
+    first_id = celery_task.apply_async.call_args.kwargs["task_id"]
+    dedup.save_result(first_id, None, ok=False)
+
+    assert await dispatcher.dispatch_task(celery_task, 1, "budget") is None
+    second_id = celery_task.apply_async.call_args.kwargs["task_id"]
+    assert second_id != first_id
+    # Later duplicates now wait on the retry, not the failed run
+    assert dedup.claim(dedup.dedup_key("process_search", (1, "budget"), {}), "t3") == second_id
+
+
+@pytest.mark.asyncio
+async def test_failed_publish_does_not_block_the_retry(fake_redis, celery_task):
+    celery_task.apply_async.side_effect = [ConnectionError("broker down"), None]
+    with pytest.raises(ConnectionError):
+        await dispatcher.dispatch_task(celery_task, 1, "budget")
+
+    assert await dispatcher.dispatch_task(celery_task, 1, "budget") is None
+    assert celery_task.apply_async.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_full_embedded_queue_does_not_block_the_retry(fake_redis):
+    task = MagicMock(__name__="process_search")
+    task.name = "worker.tasks.process_search"
+    executor = MagicMock(running=True)
+    executor.enqueue = AsyncMock(side_effect=[False, True])
+    with patch.object(dispatcher.settings, "embedded_mode", True), \
+         patch.object(dispatcher, "executor", executor):
+        assert (await dispatcher.dispatch_task(task, 1, "budget")).startswith("🚦")
+        assert await dispatcher.dispatch_task(task, 1, "budget") is None
+    assert executor.enqueue.await_count == 2
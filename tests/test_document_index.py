@@ -0,0 +1,160 @@
+import pytest
+from unittest.mock import MagicMock, patch
+import gabay.core.database as database
+from gabay.core.connectors import google_api, notion_api
+from gabay.core.database import DatabaseManager
+
+
+def doc(doc_id, title, modified_at="2024-03-01T00:00:00Z"):
+    return {"id": doc_id, "title": title, "mimeType": "text/plain", "link": f"https://x/{doc_id}", "modified_at": modified_at}
+
+
+@pytest.fixture
+def test_db(tmp_path):
+    test_db = DatabaseManager(db_path=str(tmp_path / "test.db"))
+    with patch.object(database, "db", test_db):
+        yield test_db
+
+
+@pytest.fixture
+def drive_files():
+    """Fake Drive service: files().list() answers with whatever the test puts in the list."""
+    files = []
+    service = MagicMock()
+    service.files.return_value.list.return_value.execute.side_effect = lambda: {"files": list(files)}
+    with patch.object(google_api, "get_google_service", return_value=service), \
+         patch.object(google_api, "sync_drive_index", return_value=True), \
+         patch.dict(google_api._drive_search_cache, clear=True):
+        yield files
+
+
+def test_search_matches_title_prefixes_and_indexed_text(test_db):
+    test_db.upsert_documents(1, "drive", [doc("a", "Quarterly budget"), doc("b", "Team offsite")])
+    test_db.set_document_content(1, "drive", "b", "venue shortlist and budget notes")
+
+    assert [d["id"] for d in test_db.search_documents(1, "drive", "budg")] == ["a", "b"]
+    assert [d["id"] for d in test_db.search_documents(1, "drive", "venue")] == ["b"]
+    assert test_db.search_documents(2, "drive", "budget") == []
+
+
+def test_search_input_is_not_parsed_as_fts_syntax(test_db):
+    test_db.upsert_documents(1, "drive", [doc("a", 'Plan "B" OR NOT')])
+    assert [d["id"] for d in test_db.search_documents(1, "drive", 'Plan "B" OR NOT')] == ["a"]
+
+
+def test_changed_document_drops_its_stale_text(test_db):
+    test_db.upsert_documents(1, "drive", [doc("a", "Notes")])
+    test_db.set_document_content(1, "drive", "a", "old words")
+    test_db.upsert_documents(1, "drive", [doc("a", "Notes")])
+    assert test_db.count_documents_without_content(1, "drive") == 0
+
+    test_db.upsert_documents(1, "drive", [doc("a", "Notes", modified_at="2024-03-02T00:00:00Z")])
+    assert test_db.search_documents(1, "drive", "old") == []
+    assert test_db.count_documents_without_content(1, "drive") == 1
+
+
+def test_clear_documents_forgets_index_and_cursor(test_db):
+    test_db.upsert_documents(1, "drive", [doc("a", "Notes")])
+    test_db.set_document_sync_state(1, "drive", "token-1", complete=True)
+
+    test_db.clear_documents(1, "drive")
+
+    assert test_db.search_documents(1, "drive", "notes") == []
+    assert test_db.get_document_sync_state(1, "drive") is None
+
+
+def test_sync_state_keeps_completeness_across_incremental_syncs(test_db):
+    test_db.set_document_sync_state(1, "drive", "token-1", complete=False)
+    test_db.set_document_sync_state(1, "drive", "token-2")
+
+    state = test_db.get_document_sync_state(1, "drive")
+    assert state["cursor"] == "token-2"
+    assert state["complete"] == 0
+
+
+def test_title_only_index_is_topped_up_from_live_search(test_db, drive_files):
+    test_db.upsert_documents(1, "drive", [doc("a", "Budget")])
+    test_db.set_document_sync_state(1, "drive", "token", complete=True)
+    # Only the server can see that "b" mentions the budget in its body
+    drive_files.extend([{"id": "a", "name": "Budget"}, {"id": "b", "name": "Minutes"}])
+
+    found = google_api.search_drive("1", "budget")
+
+    assert [f["id"] for f in found] == ["a", "b"]
+
+
+def test_complete_index_with_text_answers_without_the_api(test_db, drive_files):
+    test_db.upsert_documents(1, "drive", [doc("a", "Budget"), doc("b", "Minutes")])
+    test_db.set_document_content(1, "drive", "a", "figures")
+    test_db.set_document_content(1, "drive", "b", "budget approved")
+    test_db.set_document_sync_state(1, "drive", "token", complete=True)
+
+    with patch.object(google_api, "_search_drive_live") as live:
+        found = google_api.search_drive("1", "budget")
+
+    assert [f["id"] for f in found] == ["a", "b"]
+    live.assert_not_called()
+
+
+def test_capped_index_is_merged_with_live_results(test_db, drive_files):
+    test_db.upsert_documents(1, "drive", [doc("a", "Budget")])
+    test_db.set_document_content(1, "drive", "a", "budget")
+    test_db.set_document_sync_state(1, "drive", "token", complete=False)
+    drive_files.append({"id": "old", "name": "Budget 2019"})
+
+    assert [f["id"] for f in google_api.search_drive("1", "budget")] == ["a", "old"]
+
+
+def test_partly_extracted_index_still_searches_live(test_db, drive_files):
+    # "a" has text, but "b" and "c" were only ever indexed by title
+    test_db.upsert_documents(1, "drive", [doc("a", "Budget"), doc("b", "Minutes"), doc("c", "Notes")])
+    test_db.set_document_content(1, "drive", "a", "budget")
+    test_db.set_document_sync_state(1, "drive", "token", complete=True)
+    drive_files.append({"id": "b", "name": "Minutes"})
+
+    assert [f["id"] for f in google_api.search_drive("1", "budget")] == ["a", "b"]
+
+
+def test_full_page_of_title_hits_still_searches_live(test_db, drive_files):
+    test_db.upsert_documents(1, "drive", [doc(str(i), f"Budget {i}") for i in range(3)])
+    test_db.set_document_sync_state(1, "drive", "token", complete=True)
+    drive_files.append({"id": "body-match", "name": "Minutes"})
+
+    with patch.object(google_api, "_search_drive_live", wraps=google_api._search_drive_live) as live:
+        found = google_api.search_drive("1", "budget", limit=3)
+    live.assert_called_once()
+    assert len(found) == 3
+
+
+def test_repairing_google_clears_the_drive_index(test_db):
+    test_db.upsert_documents(1, "drive", [doc("a", "Budget")])
+    test_db.upsert_documents(1, "notion", [doc("n", "Budget")])
+
+    google_api.clear_google_indexes("1")
+
+    assert test_db.search_documents(1, "drive", "budget") == []
+    assert [d["id"] for d in test_db.search_documents(1, "notion", "budget")] == ["n"]
+
+
+def test_notion_index_skips_users_without_their_own_key(test_db, monkeypatch):
+    monkeypatch.setenv("NOTION_API_KEY", "host-workspace-key")
+    with patch.object(notion_api, "get_notion_config", return_value={}), \
+         patch.object(notion_api, "Client") as client:
+        assert not notion_api.sync_notion_index("1", force=True, bootstrap=True)
+    client.assert_not_called()
+    assert test_db.get_document_sync_state(1, "notion") is None
+
+
+def test_notion_index_is_built_with_the_users_own_client(test_db):
+    page = {"id": "p1", "url": "https://notion.so/p1", "last_edited_time": "2024-03-01T00:00:00.000Z",
+            "properties": {"Name": {"type": "title", "title": [{"plain_text": "Roadmap"}]}}}
+    client = MagicMock()
+    client.search.return_value = {"results": [page], "has_more": False}
+
+    with patch.object(notion_api, "get_notion_config", return_value={"api_key": "user-key"}), \
+         patch.object(notion_api, "get_notion_client", return_value=client) as get_client:
+        assert notion_api.sync_notion_index("7", bootstrap=True)
+
+    get_client.assert_called_once_with("7")
+    assert [d["id"] for d in test_db.search_documents(7, "notion", "road")] == ["p1"]
+    assert test_db.get_document_sync_state(7, "notion")["complete"] == 1
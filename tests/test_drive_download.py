@@ -0,0 +1,91 @@
+import io
+import zipfile
+import pytest
+from unittest.mock import MagicMock, patch
+from gabay.core.connectors import google_api
+from gabay.core.connectors.google_api import DOCX_MIME, DriveFileTooLarge
+
+
+class FakeDownload:
+    """Stands in for MediaIoBaseDownload: writes the request's payload `chunksize` bytes per call."""
+    calls = 0
+
+    def __init__(self, fd, request, chunksize):
+        self.fd, self.payload, self.chunksize = fd, request.payload, chunksize
+        self.offset = 0
+
+    def next_chunk(self):
+        FakeDownload.calls += 1
+        chunk = self.payload[self.offset:self.offset + self.chunksize]
+        self.fd.write(chunk)
+        self.offset += len(chunk)
+        return None, self.offset >= len(self.payload)
+
+
+@pytest.fixture
+def drive_file():
+    """Serves whatever bytes the test assigns to `request.payload`, in 4-byte chunks."""
+    request = MagicMock()
+    service = MagicMock()
+    service.files.return_value.get_media.return_value = request
+    FakeDownload.calls = 0
+    with patch.object(google_api, "get_google_service", return_value=service), \
+         patch.object(google_api, "DRIVE_DOWNLOAD_CHUNK", 4), \
+         patch("googleapiclient.http.MediaIoBaseDownload", FakeDownload):
+        yield request
+
+
+def test_text_is_yielded_as_chunks_arrive(drive_file):
+    drive_file.payload = b"hello world, this is long"
+    stream = google_api.iter_drive_file_text("1", "f", "text/plain")
+
+    assert next(stream) == "hell"
+    assert FakeDownload.calls == 1
+    assert "".join(stream) == "o world, this is long"
+
+
+def test_multibyte_characters_split_across_chunks_decode(drive_file):
+    drive_file.payload = "añoñ€".encode()
+    assert "".join(google_api.iter_drive_file_text("1", "f", "text/plain")) == "añoñ€"
+
+
+def test_max_chars_limits_the_bytes_fetched(drive_file):
+    drive_file.payload = b"x" * 1000
+
+    text = google_api.download_drive_file("1", "f", "text/plain", max_chars=10)
+
+    assert text == "x" * 10 + "... [Document Truncated for Length]"
+    # 4 bytes a character at most, plus one character: never more than 44 bytes
+    assert FakeDownload.calls <= 11
+
+
+def test_short_file_is_not_marked_truncated(drive_file):
+    drive_file.payload = b"short"
+    assert google_api.download_drive_file("1", "f", "text/plain", max_chars=10) == "short"
+
+
+def test_docx_over_the_cap_is_refused(drive_file):
+    drive_file.payload = b"x" * 100
+    with pytest.raises(DriveFileTooLarge):
+        list(google_api.iter_drive_file_text("1", "f", DOCX_MIME, max_bytes=10))
+
+
+def test_docx_paragraphs_are_streamed(drive_file):
+    buf = io.BytesIO()
+    ns = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+    with zipfile.ZipFile(buf, "w") as docx:
+        docx.writestr("word/document.xml", (
+            f'<w:document xmlns:w="{ns}"><w:body>'
+            '<w:p><w:r><w:t>First</w:t></w:r></w:p><w:p><w:r><w:t>Second</w:t></w:r></w:p>'
+            '</w:body></w:document>'
+        ))
+    drive_file.payload = buf.getvalue()
+
+    assert "".join(google_api.iter_drive_file_text("1", "f", DOCX_MIME)) == "First\n\nSecond"
+
+
+def test_binary_download_is_capped(drive_file):
+    drive_file.payload = b"%PDF-1.7 body"
+    assert google_api.download_drive_file_bytes("1", "f") == b"%PDF-1.7 body"
+    with pytest.raises(DriveFileTooLarge):
+        google_api.download_drive_file_bytes("1", "f", max_bytes=8)
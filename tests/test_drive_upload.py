@@ -0,0 +1,59 @@
+import io
+import pytest
+from unittest.mock import MagicMock, patch
+from gabay.core.connectors import google_api
+from gabay.worker import tasks
+
+
+class FakeStatus:
+    def __init__(self, fraction):
+        self.fraction = fraction
+
+    def progress(self):
+        return self.fraction
+
+
+@pytest.fixture
+def upload_request():
+    """Fake resumable upload: next_chunk() plays back whatever the test puts in `steps`."""
+    request = MagicMock()
+    service = MagicMock()
+    service.files.return_value.create.return_value = request
+    with patch.object(google_api, "get_google_service", return_value=service), \
+         patch.object(google_api.time, "sleep"):
+        yield request
+
+
+def test_upload_resumes_after_transient_failure_and_reports_progress(upload_request):
+    upload_request.next_chunk.side_effect = [
+        (FakeStatus(0.5), None),
+        ConnectionResetError("connection dropped"),
+        (None, {"id": "f1", "webViewLink": "https://drive/f1"}),
+    ]
+    seen = []
+
+    uploaded = google_api.upload_stream_to_drive("1", io.BytesIO(b"data"), "a.bin", "application/octet-stream",
+                                                 progress=seen.append)
+
+    assert uploaded == {"id": "f1", "link": "https://drive/f1"}
+    assert seen == [0.5, 1.0]
+
+
+def test_upload_gives_up_on_permanent_errors(upload_request):
+    upload_request.next_chunk.side_effect = ValueError("bad request")
+    with pytest.raises(ValueError):
+        google_api.upload_stream_to_drive("1", io.BytesIO(b"data"), "a.bin", "application/octet-stream")
+    assert upload_request.next_chunk.call_count == 1
+
+
+def test_save_progress_is_reported_in_steps():
+    with patch.object(tasks, "send_telegram_message") as send:
+        report = tasks._upload_progress_reporter(1, step=0.25)
+        for fraction in (0.1, 0.3, 0.4, 0.6, 0.9, 1.0):
+            report(fraction)
+
+    assert [call.args[1] for call in send.call_args_list] == [
+        "⏫ Uploading to Google Drive... 30%",
+        "⏫ Uploading to Google Drive... 60%",
+        "⏫ Uploading to Google Drive... 90%",
+    ]
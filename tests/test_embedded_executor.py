@@ -0,0 +1,116 @@
+import asyncio
+import threading
+import time
+import pytest
+from unittest.mock import patch
+from gabay.core.utils import redis_client
+from gabay.worker import embedded as embedded_module
+from gabay.worker import tasks
+from gabay.worker.embedded import EmbeddedExecutor, executor as shared_executor
+
+
+@pytest.fixture(autouse=True)
+def no_redis():
+    with patch.object(redis_client.settings, "redis_url", ""):
+        yield
+
+
+@pytest.mark.asyncio
+async def test_blocking_handler_does_not_freeze_the_loop():
+    ran_on = {}
+
+    async def blocking_handler(user_id, args):
+        ran_on["thread"] = threading.get_ident()
+        time.sleep(0.3)  # a synchronous Google API call
+        return "done"
+
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    embedded = EmbeddedExecutor()
+    with patch.dict(tasks.ASYNC_HANDLERS, {"worker.tasks.process_slides": blocking_handler}):
+        await embedded.start()
+        ticking = asyncio.create_task(ticker())
+        assert await embedded.enqueue("worker.tasks.process_slides", (1, "{}"))
+        await embedded._queue.join()
+        ticking.cancel()
+        await embedded.stop()
+
+    assert ran_on["thread"] != threading.get_ident()
+    assert ticks > 10
+
+
+@pytest.mark.asyncio
+async def test_non_blocking_handler_runs_on_the_loop():
+    ran_on = {}
+
+    async def handler(user_id, topic):
+        ran_on["thread"] = threading.get_ident()
+
+    embedded = EmbeddedExecutor()
+    with patch.dict(tasks.ASYNC_HANDLERS, {"worker.tasks.process_news": handler}):
+        await embedded.start()
+        await embedded.enqueue("worker.tasks.process_news", (1, "world"))
+        await embedded._queue.join()
+        await embedded.stop()
+
+    assert ran_on["thread"] == threading.get_ident()
+
+
+@pytest.mark.asyncio
+async def test_interactive_tasks_run_before_background():
+    order = []
+
+    async def record(user_id, *args):
+        order.append(user_id)
+
+    embedded = EmbeddedExecutor()
+    with patch.dict(tasks.ASYNC_HANDLERS, {
+        "worker.tasks.triage_gmail_proactive": record,
+        "worker.tasks.process_news": record,
+    }), patch.object(embedded, "_work", lambda: asyncio.sleep(0)):
+        await embedded.start()
+        await embedded.enqueue("worker.tasks.triage_gmail_proactive", (1,))
+        await embedded.enqueue("worker.tasks.process_news", (2, "world"))
+        while not embedded._queue.empty():
+            _, _, task_name, args, kwargs, task_id = embedded._queue.get_nowait()
+            await embedded._run(task_name, args, kwargs, task_id)
+            embedded._queue.task_done()
+        await embedded.stop()
+
+    assert order == [2, 1]
+
+
+@pytest.mark.asyncio
+async def test_full_queue_applies_backpressure():
+    embedded = EmbeddedExecutor()
+    with patch.object(embedded_module.settings, "embedded_queue_size", 1), \
+         patch.object(embedded, "_work", lambda: asyncio.sleep(0)):
+        await embedded.start()
+        assert await embedded.enqueue("worker.tasks.process_news", (1, "a"))
+        assert not await embedded.enqueue("worker.tasks.process_news", (1, "b"), timeout=0.05)
+        embedded._queue.get_nowait()
+        embedded._queue.task_done()
+        await embedded.stop()
+
+
+@pytest.mark.asyncio
+async def test_delay_returns_a_result_with_an_id():
+    ran = asyncio.Event()
+
+    async def handler(user_id, topic):
+        ran.set()
+
+    with patch.dict(tasks.ASYNC_HANDLERS, {"worker.tasks.process_news": handler}):
+        await shared_executor.start()
+        try:
+            result = tasks.process_news.delay(1, "world")
+            assert result.id
+            await asyncio.wait_for(ran.wait(), timeout=2)
+        finally:
+            await shared_executor.stop()
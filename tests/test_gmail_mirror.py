@@ -0,0 +1,118 @@
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import patch
+import gabay.core.database as database
+from gabay.core.connectors import google_api
+from gabay.core.connectors.google_api import _parse_gmail_query, _search_gmail_mirror
+from gabay.core.database import DatabaseManager
+
+
+def ms(*args, tz=timezone.utc):
+    return int(datetime(*args, tzinfo=tz).timestamp() * 1000)
+
+
+@pytest.fixture
+def test_db(tmp_path):
+    test_db = DatabaseManager(db_path=str(tmp_path / "test.db"))
+    test_db.set_gmail_history_id(1, "100")
+    test_db.upsert_gmail_messages(1, [
+        {"id": "m1", "sender": "Alice <alice@example.com>", "subject": "Q3 budget review",
+         "internal_date": ms(2024, 3, 1), "labels": ["INBOX", "UNREAD"], "snippet": "numbers attached"},
+        {"id": "m2", "sender": "Bob <bob@example.com>", "subject": "Lunch",
+         "internal_date": ms(2024, 3, 2), "labels": ["INBOX"], "snippet": "tacos?"},
+        {"id": "m3", "sender": "Spammer <x@spam.test>", "subject": "budget deals",
+         "internal_date": ms(2024, 3, 3), "labels": ["SPAM"], "snippet": "cheap"},
+    ])
+    with patch.object(database, "db", test_db):
+        yield test_db
+
+
+def test_parse_supported_operators():
+    filters = _parse_gmail_query('is:unread from:alice subject:"Q3 budget" review')
+
+    assert filters["labels_all"] == ["UNREAD"]
+    assert filters["senders"] == ["alice"]
+    assert filters["subjects"] == ["Q3 budget"]
+    assert filters["text"] == ["review"]
+    assert _parse_gmail_query("is:read")["labels_none"] == ["UNREAD"]
+
+
+@pytest.mark.parametrize("query", ["alice OR bob", "-from:alice", "has:attachment", "label:receipts", "(budget)"])
+def test_parse_rejects_what_the_mirror_cannot_answer(query):
+    assert _parse_gmail_query(query) is None
+
+
+def test_parse_dates_in_the_users_timezone():
+    with patch.object(google_api.settings, "tz", "Asia/Manila"):
+        filters = _parse_gmail_query("after:2024/01/02 before:2024-01-03")
+
+    assert filters["after_ms"] == ms(2024, 1, 1, 16)
+    assert filters["before_ms"] == ms(2024, 1, 2, 16)
+
+
+def test_parse_dates_fall_back_to_utc_for_unknown_timezones():
+    with patch.object(google_api.settings, "tz", "Not/AZone"):
+        assert _parse_gmail_query("after:2024/01/02")["after_ms"] == ms(2024, 1, 2)
+
+
+def test_parse_relative_periods():
+    before = int(datetime.now(timezone.utc).timestamp() * 1000)
+    filters = _parse_gmail_query("newer_than:2d")
+    assert abs(before - 2 * 86400000 - filters["after_ms"]) < 5000
+
+
+def test_mirror_search_filters_and_skips_spam(test_db):
+    assert [m["id"] for m in test_db.search_gmail_mirror(1, text=["budget"])] == ["m1"]
+    assert [m["id"] for m in test_db.search_gmail_mirror(1, labels_all=["UNREAD"])] == ["m1"]
+    assert [m["id"] for m in test_db.search_gmail_mirror(1, senders=["bob"])] == ["m2"]
+    assert [m["id"] for m in test_db.search_gmail_mirror(1, after_ms=ms(2024, 3, 2))] == ["m2"]
+    assert [m["id"] for m in test_db.search_gmail_mirror(1)] == ["m2", "m1"]
+
+
+def test_whole_mailbox_mirror_answers_without_the_api(test_db):
+    test_db.set_gmail_mirror_since(1, 0)
+    with patch.object(google_api, "_search_gmail_api") as live:
+        emails = _search_gmail_mirror("1", "from:bob", _parse_gmail_query("from:bob"), 10)
+    assert [e["id"] for e in emails] == ["m2"]
+    live.assert_not_called()
+
+
+def test_free_text_goes_live_even_with_a_whole_mailbox_mirror(test_db):
+    # Body matches exist only on the server
+    test_db.set_gmail_mirror_since(1, 0)
+    assert _search_gmail_mirror("1", "budget", _parse_gmail_query("budget"), 10) is None
+
+
+def test_partial_mirror_asks_the_api_only_for_older_mail(test_db):
+    test_db.set_gmail_mirror_since(1, ms(2024, 3, 1))
+    older = [{"id": "old"}]
+    with patch.object(google_api, "_search_gmail_api", return_value=older) as live:
+        emails = _search_gmail_mirror("1", "from:bob", _parse_gmail_query("from:bob"), 10)
+
+    assert [e["id"] for e in emails] == ["m2", "old"]
+    assert live.call_args[0][1] == f"from:bob before:{ms(2024, 3, 1) // 1000}"
+    assert live.call_args[0][2] == 9
+
+
+def test_search_gmail_full_falls_back_live_for_unsupported_queries(test_db):
+    with patch.object(google_api, "sync_gmail_mirror", return_value=True) as sync, \
+         patch.object(google_api, "_search_gmail_api", return_value=[]) as live:
+        google_api.search_gmail_full("1", "has:attachment")
+    sync.assert_not_called()
+    live.assert_called_once()
+
+
+def test_new_mail_past_the_limit_is_reported_next_time(test_db):
+    test_db.upsert_gmail_messages(1, [
+        {"id": f"n{i}", "sender": "x@example.com", "subject": f"new {i}", "internal_date": ms(2024, 4, 1, i),
+         "labels": ["INBOX", "UNREAD"], "snippet": ""}
+        for i in range(3)
+    ])
+
+    first = [m["id"] for m in test_db.take_new_gmail_messages(1, limit=2)]
+    second = [m["id"] for m in test_db.take_new_gmail_messages(1, limit=2)]
+
+    # m1 (from the fixture) is unread in the inbox too
+    assert first == ["n2", "n1"]
+    assert second == ["n0", "m1"]
+    assert test_db.take_new_gmail_messages(1, limit=2) == []
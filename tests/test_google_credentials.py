@@ -0,0 +1,156 @@
+import threading
+import time
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from google.auth.exceptions import RefreshError
+from google.oauth2.credentials import Credentials
+from gabay.core.connectors import google_api, token_manager as token_manager_module
+from gabay.core.connectors.token_manager import TokenManager
+from gabay.core.utils import redis_client
+
+
+def stored_token(token="old", expires_in=timedelta(hours=-1)):
+    expiry = datetime.utcnow() + expires_in
+    return {
+        "token": token,
+        "refresh_token": "refresh",
+        "client_id": "client",
+        "client_secret": "secret",
+        "expiry": expiry.strftime("%Y-%m-%dT%H:%M:%SZ"),
+    }
+
+
+@pytest.fixture
+def tokens(tmp_path):
+    with patch.object(token_manager_module.settings, "data_dir", str(tmp_path)):
+        manager = TokenManager()
+    # Single host: the refresh lock falls back to the file lock
+    with patch.object(redis_client.settings, "redis_url", ""), \
+         patch.object(google_api, "token_manager", manager), \
+         patch.dict(google_api._credentials, clear=True):
+        yield manager
+
+
+@pytest.fixture
+def refresh_calls():
+    calls = []
+
+    def refresh(self, request):
+        calls.append(threading.get_ident())
+        time.sleep(0.2)  # a slow token endpoint widens the race
+        self.token = f"new-{len(calls)}"
+        self.expiry = datetime.utcnow() + timedelta(hours=1)
+
+    with patch.object(Credentials, "refresh", refresh):
+        yield calls
+
+
+def test_concurrent_callers_refresh_once(tokens, refresh_calls):
+    tokens.save_token("google", "1", stored_token())
+    results = []
+
+    def load():
+        results.append(google_api.get_google_credentials("1").token)
+
+    threads = [threading.Thread(target=load) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(refresh_calls) == 1
+    assert results == ["new-1"] * 5
+    assert tokens.get_token("google", "1")["token"] == "new-1"
+
+
+def test_fresh_credentials_are_served_from_memory(tokens, refresh_calls):
+    tokens.save_token("google", "1", stored_token("valid", timedelta(hours=1)))
+
+    first = google_api.get_google_credentials("1")
+    second = google_api.get_google_credentials("1")
+
+    assert first is second
+    assert refresh_calls == []
+
+
+def test_repairing_replaces_cached_credentials(tokens, refresh_calls):
+    tokens.save_token("google", "1", stored_token("valid", timedelta(hours=1)))
+    google_api.get_google_credentials("1")
+
+    tokens.save_token("google", "1", stored_token("repaired", timedelta(hours=1)))
+    # Same mtime granularity on some filesystems; force the version to move
+    with patch.object(tokens, "version", return_value=-1):
+        assert google_api.get_google_credentials("1").token == "repaired"
+
+
+def test_rejected_grant_marks_token_invalid(tokens):
+    tokens.save_token("google", "1", stored_token())
+    error = RefreshError("invalid_grant: Token has been expired or revoked.", {"error": "invalid_grant"})
+
+    with patch.object(Credentials, "refresh", side_effect=error):
+        assert google_api.get_google_credentials("1") is None
+
+    assert not tokens.is_valid("google", "1")
+
+
+def test_transient_refresh_failure_keeps_token_valid(tokens):
+    tokens.save_token("google", "1", stored_token())
+    error = RefreshError("Server error", {"error": "internal_failure"}, retryable=True)
+
+    with patch.object(Credentials, "refresh", side_effect=error):
+        assert google_api.get_google_credentials("1") is None
+
+    assert tokens.is_valid("google", "1")
+
+
+@pytest.fixture
+def built_services():
+    """Counts service builds; each build returns a fresh object."""
+    with patch.object(google_api, "build_google_service", side_effect=lambda *args: object()) as build, \
+         patch.object(google_api, "_thread_services", threading.local()):
+        yield build
+
+
+def test_services_are_rebuilt_when_the_token_changes(tokens, built_services):
+    tokens.save_token("google", "1", stored_token("valid", timedelta(hours=1)))
+    first = google_api.get_google_service("1", "drive", "v3")
+    assert google_api.get_google_service("1", "drive", "v3") is first
+
+    tokens.save_token("google", "1", stored_token("repaired", timedelta(hours=1)))
+    with patch.object(tokens, "version", return_value=-1):
+        assert google_api.get_google_service("1", "drive", "v3") is not first
+    assert built_services.call_count == 2
+
+
+def test_invalidated_token_drops_cached_services(tokens, built_services):
+    tokens.save_token("google", "1", stored_token("valid", timedelta(hours=1)))
+    first = google_api.get_google_service("1", "drive", "v3")
+
+    tokens.mark_invalid("google", "1")
+    with patch.object(tokens, "version", return_value=-1):
+        assert google_api.get_google_service("1", "drive", "v3") is not first
+
+
+def test_rejected_grant_drops_cached_services(tokens, built_services):
+    tokens.save_token("google", "1", stored_token("valid", timedelta(hours=1)))
+    google_api.get_google_service("1", "drive", "v3")
+
+    tokens.save_token("google", "1", stored_token())
+    error = RefreshError("invalid_grant: Token has been expired or revoked.", {"error": "invalid_grant"})
+    with patch.object(tokens, "version", return_value=-1), \
+         patch.object(Credentials, "refresh", side_effect=error):
+        assert google_api.get_google_service("1", "drive", "v3") is None
+    assert google_api._thread_services.cache == {}
+
+
+def test_service_cache_is_bounded_per_thread(tokens, built_services):
+    for uid in range(google_api.GOOGLE_SERVICE_CACHE_SIZE + 5):
+        tokens.save_token("google", str(uid), stored_token("valid", timedelta(hours=1)))
+    with patch.object(tokens, "version", return_value=1):
+        for uid in range(google_api.GOOGLE_SERVICE_CACHE_SIZE + 5):
+            google_api.get_google_service(str(uid), "drive", "v3")
+
+    cache = google_api._thread_services.cache
+    assert len(cache) == google_api.GOOGLE_SERVICE_CACHE_SIZE
+    assert ("0", "drive", "v3") not in cache
@@ -0,0 +1,68 @@
+import pytest
+from unittest.mock import patch
+from gabay.core.database import DatabaseManager
+from gabay.worker import heartbeat
+from gabay.worker.heartbeat import (
+    ACTIVE_INTERVAL, DORMANT_INTERVAL, HEARTBEAT_WINDOW, IDLE_INTERVAL, SWEEP_COUNT,
+    build_sweeps, next_interval, plan_heartbeat,
+)
+
+NOW = 1_700_000_000.0
+
+
+@pytest.fixture
+def test_db(tmp_path):
+    test_db = DatabaseManager(db_path=str(tmp_path / "test.db"))
+    # Every user is connected; no jitter, so countdowns are exactly the stable slots
+    with patch.object(heartbeat, "db", test_db), \
+         patch.object(heartbeat, "is_eligible", return_value=True), \
+         patch.object(heartbeat.random, "uniform", return_value=0):
+        yield test_db
+
+
+def test_slots_are_stable_and_inside_the_window(test_db):
+    first = dict(plan_heartbeat([str(u) for u in range(1, 50)], now=NOW))
+    states = {u: test_db.get_heartbeat_state(u) for u in first}
+
+    assert all(0 <= countdown < HEARTBEAT_WINDOW for countdown in first.values())
+    assert len(set(first.values())) > 40  # spread out, not bunched
+    assert all(state["next_run_at"] == NOW + first[u] + state["interval_seconds"] for u, state in states.items())
+    assert heartbeat._stable_offset(7) == heartbeat._stable_offset(7)
+
+
+def test_non_numeric_and_ineligible_users_are_skipped(test_db):
+    with patch.object(heartbeat, "is_eligible", side_effect=lambda uid: uid != 2):
+        assert [u for u, _ in plan_heartbeat(["local", "1", "2"], now=NOW)] == [1]
+
+
+def test_dormant_user_is_polled_every_fourth_window(test_db):
+    polled = []
+    for window in range(8):
+        if plan_heartbeat(["5"], now=NOW + window * HEARTBEAT_WINDOW):
+            polled.append(window)
+
+    assert polled == [0, 4]
+    assert test_db.get_heartbeat_state(5)["interval_seconds"] == DORMANT_INTERVAL
+
+
+def test_interval_adapts_to_activity_and_mail(test_db):
+    assert next_interval(1, None, NOW) == DORMANT_INTERVAL
+    assert next_interval(1, {"last_new_mail": 1}, NOW) == IDLE_INTERVAL
+    assert next_interval(1, {"last_new_mail": 3}, NOW) == ACTIVE_INTERVAL
+
+    test_db.append_message(1, "user", "hi")
+    assert next_interval(1, None, heartbeat.time.time()) == ACTIVE_INTERVAL
+    assert next_interval(1, None, heartbeat.time.time() + 3 * 86400) == IDLE_INTERVAL
+
+
+def test_sweeps_split_the_window_into_ordered_slices(test_db):
+    plan = [(1, 10.0), (2, 5.0), (3, HEARTBEAT_WINDOW - 1), (4, HEARTBEAT_WINDOW / SWEEP_COUNT)]
+
+    sweeps = build_sweeps(plan, now=NOW)
+
+    assert [(countdown, [u for u, _ in users]) for _, countdown, users in sweeps] == [
+        (0, [2, 1]),
+        (HEARTBEAT_WINDOW / SWEEP_COUNT, [4]),
+        (2 * HEARTBEAT_WINDOW / SWEEP_COUNT, [3]),
+    ]
+    assert len({sweep_id for sweep_id, _, _ in sweeps}) == 3
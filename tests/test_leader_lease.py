@@ -0,0 +1,144 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+import gabay.core.database as database
+from gabay.core.database import DatabaseManager
+from gabay.core.utils import redis_client
+from gabay.worker import leader, tasks
+from gabay.worker import scheduler as scheduler_module
+from gabay.worker.leader import LeaderLease, is_current_fence
+from gabay.worker.scheduler import ReminderScheduler
+from fakes import FakeRedis
+
+
+@pytest.fixture
+def fake_redis():
+    fake = FakeRedis()
+    with patch.object(redis_client.settings, "redis_url", "redis://fake"), \
+         patch.object(leader, "get_redis", return_value=fake), \
+         patch.object(scheduler_module, "get_redis", return_value=fake):
+        yield fake
+
+
+@pytest.fixture
+def test_db(tmp_path):
+    test_db = DatabaseManager(db_path=str(tmp_path / "test.db"))
+    with patch.object(scheduler_module, "db", test_db), patch.object(database, "db", test_db):
+        yield test_db
+
+
+def add_reminder(test_db, reminder_id, offset_seconds):
+    trigger = datetime.now(timezone.utc) + timedelta(seconds=offset_seconds)
+    test_db.create_reminder({
+        "id": reminder_id, "user_id": 1, "message": reminder_id, "trigger_time": trigger.isoformat(),
+    })
+
+
+def test_only_one_node_leads_and_renewal_keeps_the_token(fake_redis):
+    a, b = LeaderLease("beat", ttl=30), LeaderLease("beat", ttl=30)
+
+    assert a.acquire() == 1
+    assert b.acquire() is None
+    fake_redis.now += 20
+    assert a.acquire() == 1
+    fake_redis.now += 20
+    # Renewed 20s ago, so the 30s lease is still held
+    assert b.acquire() is None
+
+
+def test_takeover_after_expiry_fences_off_the_old_leader(fake_redis):
+    a, b = LeaderLease("beat", ttl=30), LeaderLease("beat", ttl=30)
+    assert a.acquire() == 1
+
+    fake_redis.now += 31
+    assert b.acquire() == 2
+    assert a.acquire() is None
+
+    assert not is_current_fence("beat", 1)
+    assert is_current_fence("beat", 2)
+
+
+def test_stale_fence_stops_check_reminders(fake_redis, test_db):
+    add_reminder(test_db, "due", -1)
+    LeaderLease("beat").acquire()
+    fake_redis.incr(leader._fence_key("beat"))  # a newer leader was elected
+
+    with patch.object(tasks, "fire_reminder") as fire:
+        tasks.check_reminders(fence=1)
+        fire.assert_not_called()
+        tasks.check_reminders(fence=2)
+        fire.assert_called_once()
+
+
+def test_stale_fence_skips_proactive_heartbeat(fake_redis):
+    LeaderLease("beat").acquire()
+    fake_redis.incr(leader._fence_key("beat"))
+
+    with patch("gabay.worker.heartbeat.plan_heartbeat") as plan:
+        tasks.proactive_heartbeat(fence=1)
+        plan.assert_not_called()
+
+
+def test_standby_scheduler_does_not_fire(fake_redis, test_db):
+    add_reminder(test_db, "due", -1)
+    LeaderLease("reminders").acquire()  # another replica leads
+    standby = ReminderScheduler()
+
+    with patch.object(tasks, "execute_reminder", MagicMock()) as execute:
+        assert not standby._check_leadership()
+        standby._apply_changes()
+        assert standby._fire_due() is None
+        execute.delay.assert_not_called()
+
+
+def test_new_leader_reloads_before_firing(fake_redis, test_db):
+    other = LeaderLease("reminders")
+    other.acquire()
+    scheduler = ReminderScheduler()
+    assert not scheduler._check_leadership()
+    scheduler._apply_changes()
+
+    # Created while standing by, and the notification was lost
+    add_reminder(test_db, "missed", -1)
+    fake_redis.now += 31
+
+    with patch.object(tasks, "execute_reminder", MagicMock()) as execute:
+        assert scheduler._check_leadership()
+        scheduler._apply_changes()
+        scheduler._fire_due()
+        execute.delay.assert_called_once_with("missed")
+
+
+def test_reminder_moved_later_is_rearmed_not_fired(fake_redis, test_db):
+    add_reminder(test_db, "moved", -1)
+    scheduler = ReminderScheduler()
+    assert scheduler._check_leadership()
+    scheduler._apply_changes()
+
+    later = datetime.now(timezone.utc) + timedelta(hours=1)
+    test_db.update_reminder("moved", {"trigger_time": later.isoformat()})
+
+    with patch.object(tasks, "execute_reminder", MagicMock()) as execute:
+        delay = scheduler._fire_due()
+        execute.delay.assert_not_called()
+    assert 3590 < delay <= 3600
+
+
+def test_polling_fallback_defers_to_a_running_scheduler(fake_redis, test_db):
+    add_reminder(test_db, "due", -1)
+    LeaderLease("reminders").acquire()
+
+    with patch.object(tasks, "fire_reminder") as fire:
+        tasks.check_reminders(fence=None)
+        fire.assert_not_called()
+
+        # The scheduler died and its lease ran out: polling takes over
+        fake_redis.now += 31
+        tasks.check_reminders(fence=None)
+        fire.assert_called_once()
+
+
+def test_polling_fallback_is_on_the_beat_schedule():
+    from gabay.worker.celery_app import celery_app
+    tasks_scheduled = {entry["task"] for entry in celery_app.conf.beat_schedule.values()}
+    assert "worker.tasks.check_reminders" in tasks_scheduled
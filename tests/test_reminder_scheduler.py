@@ -0,0 +1,107 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+import gabay.core.database as database
+from gabay.core.database import DatabaseManager
+from gabay.core.utils import redis_client
+from gabay.worker import scheduler as scheduler_module
+from gabay.worker import tasks
+from gabay.worker.scheduler import ReminderScheduler
+
+
+@pytest.fixture
+def test_db(tmp_path):
+    test_db = DatabaseManager(db_path=str(tmp_path / "test.db"))
+    # Single-process mode: no Redis, so the scheduler is always the leader
+    with patch.object(redis_client.settings, "redis_url", ""), \
+         patch.object(scheduler_module, "db", test_db), \
+         patch.object(database, "db", test_db):
+        yield test_db
+
+
+@pytest.fixture
+def execute_reminder():
+    with patch.object(tasks, "execute_reminder", MagicMock()) as mock_task:
+        yield mock_task.delay
+
+
+def add_reminder(test_db, reminder_id, offset_seconds, **extra):
+    trigger = datetime.now(timezone.utc) + timedelta(seconds=offset_seconds)
+    test_db.create_reminder({
+        "id": reminder_id,
+        "user_id": 1,
+        "message": f"reminder {reminder_id}",
+        "trigger_time": trigger.isoformat(),
+        **extra,
+    })
+    return trigger
+
+
+def leading_scheduler():
+    scheduler = ReminderScheduler()
+    assert scheduler._check_leadership()
+    scheduler._apply_changes()
+    return scheduler
+
+
+def test_fires_due_reminders_and_sleeps_until_next(test_db, execute_reminder):
+    add_reminder(test_db, "due", -5)
+    add_reminder(test_db, "later", 3600)
+    scheduler = leading_scheduler()
+
+    delay = scheduler._fire_due()
+
+    execute_reminder.assert_called_once_with("due")
+    assert test_db.get_reminder("due")["status"] == "completed"
+    assert 3590 < delay <= 3600
+
+
+def test_recurring_reminder_rearms_in_place(test_db, execute_reminder):
+    trigger = add_reminder(test_db, "every-minute", -1, interval_seconds=60, remaining_count=2)
+    scheduler = leading_scheduler()
+
+    delay = scheduler._fire_due()
+
+    next_trigger = trigger + timedelta(seconds=60)
+    assert scheduler._deadlines["every-minute"] == next_trigger.timestamp()
+    reminder = test_db.get_reminder("every-minute")
+    assert reminder["trigger_time"] == next_trigger.isoformat()
+    assert reminder["remaining_count"] == 1
+    assert 0 < delay <= 60
+
+
+def test_changed_reminder_leaves_stale_heap_entry_behind(test_db, execute_reminder):
+    add_reminder(test_db, "moved", 3600)
+    scheduler = leading_scheduler()
+
+    earlier = datetime.now(timezone.utc) - timedelta(seconds=1)
+    test_db.update_reminder("moved", {"trigger_time": earlier.isoformat()})
+    scheduler.notify("moved")
+    scheduler._apply_changes()
+
+    assert scheduler._fire_due() is None
+    execute_reminder.assert_called_once_with("moved")
+    # The old deadline is skipped lazily instead of firing a second time
+    assert scheduler._fire_due() is None
+    assert scheduler._heap == []
+    execute_reminder.assert_called_once()
+
+
+def test_cancelled_reminder_is_not_fired(test_db, execute_reminder):
+    add_reminder(test_db, "cancelled", -1)
+    scheduler = leading_scheduler()
+    test_db.update_reminder("cancelled", {"status": "cancelled"})
+
+    assert scheduler._fire_due() is None
+    execute_reminder.assert_not_called()
+
+
+def test_full_reload_on_wildcard_notification(test_db, execute_reminder):
+    scheduler = leading_scheduler()
+    add_reminder(test_db, "new", -1)
+
+    scheduler.notify()
+    scheduler._apply_changes()
+    scheduler._fire_due()
+
+    execute_reminder.assert_called_once_with("new")
@@ -0,0 +1,91 @@
+import re
+import pytest
+from unittest.mock import MagicMock, patch
+from gabay.core.connectors import google_api
+from gabay.core.skills import sheets as sheets_skill
+
+
+class FakeSheets:
+    """
+    Sheets service stand-in over a list of rows ([] is a blank row). Like the real API,
+    values().get() leaves out blank rows at the end of the requested range.
+    """
+
+    def __init__(self, rows, grid_rows=1000, columns=3):
+        self.rows, self.grid_rows, self.columns = rows, grid_rows, columns
+        self.ranges = []
+
+    def spreadsheets(self):
+        spreadsheets = MagicMock()
+        spreadsheets.get.side_effect = self._get
+        spreadsheets.values.return_value.get.side_effect = self._get_values
+        return spreadsheets
+
+    def _get(self, spreadsheetId, fields):
+        props = {"sheetId": 7, "title": "Data", "index": 0,
+                 "gridProperties": {"rowCount": self.grid_rows, "columnCount": self.columns}}
+        return MagicMock(execute=lambda: {"sheets": [{"properties": props}]})
+
+    def _get_values(self, spreadsheetId, range, majorDimension):
+        assert majorDimension == "ROWS"
+        self.ranges.append(range)
+        start, end = map(int, re.search(r"!A(\d+):[A-Z]+(\d+)$", range).groups())
+        page = self.rows[start - 1:end]
+        while page and not page[-1]:
+            page = page[:-1]
+        return MagicMock(execute=lambda: {"values": page} if page else {})
+
+
+@pytest.fixture
+def sheet_service():
+    services = []
+
+    def install(rows, **kwargs):
+        services.append(FakeSheets(rows, **kwargs))
+        return services[-1]
+
+    with patch.object(google_api, "get_google_service", side_effect=lambda *args: services[-1]):
+        yield install
+
+
+def test_rows_keep_their_positions_across_blank_rows_at_page_edges(sheet_service):
+    rows = [["h"], ["a"], [], [], ["b"], [], ["c"]]
+    sheet_service(rows, grid_rows=20)
+
+    # Page 1 ends on two blank rows that the API drops; they must reappear before "b"
+    assert list(google_api.iter_sheet_rows("1", "s", page_rows=4)) == rows
+
+
+def test_paging_stops_at_the_data_not_the_grid(sheet_service):
+    service = sheet_service([["h"], ["a"], ["b"]], grid_rows=100_000)
+
+    assert list(google_api.iter_sheet_rows("1", "s", page_rows=2)) == [["h"], ["a"], ["b"]]
+    # Two pages with data, one empty page, and nothing further out to row 100,000
+    assert len(service.ranges) == 3
+
+
+def test_no_trailing_blank_rows_are_invented(sheet_service):
+    sheet_service([["h"], ["a"], [], []], grid_rows=10)
+    assert list(google_api.iter_sheet_rows("1", "s", page_rows=3)) == [["h"], ["a"]]
+
+
+def test_max_rows_reads_only_the_first_page(sheet_service):
+    service = sheet_service([[str(i)] for i in range(50)], grid_rows=50)
+
+    rows = google_api.get_sheet_values("1", "s", max_rows=5)
+
+    assert rows == [[str(i)] for i in range(5)]
+    assert service.ranges == ["'Data'!A1:C5"]
+
+
+@pytest.mark.asyncio
+async def test_auto_report_reads_a_preview_and_takes_the_size_from_the_grid(sheet_service):
+    service = sheet_service([[str(i)] for i in range(200)], grid_rows=200)
+
+    with patch.object(sheets_skill, "send_telegram_message"), \
+         patch.object(sheets_skill, "get_llm_response", return_value="report") as llm:
+        await sheets_skill.handle_auto_report_skill(1, "s", "growth")
+
+    prompt = llm.call_args.kwargs["prompt"]
+    assert "only the first 30 rows are shown; the sheet has up to 200 rows" in prompt
+    assert service.ranges == [f"'Data'!A1:C{sheets_skill.REPORT_PREVIEW_ROWS + 1}"]
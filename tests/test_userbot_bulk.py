@@ -0,0 +1,163 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+from telethon.errors import FloodWaitError
+from gabay.core.database import DatabaseManager
+from gabay.core.utils import userbot as userbot_module
+from gabay.core.utils.userbot import UserbotManager
+
+
+class FakeClient:
+    """Stands in for a connected TelethonClient and records every send."""
+
+    def __init__(self, manager=None, flood_once_for=None):
+        self.sent = []
+        self.manager = manager
+        self.flood_once_for = flood_once_for
+        self.lock_held_during_send = False
+        self.sends_serialized = True
+
+    async def send_message(self, peer, text):
+        if self.manager and self.manager._lock and self.manager._lock.locked():
+            self.lock_held_during_send = True
+        if self.manager and not self.manager._send_lock.locked():
+            self.sends_serialized = False
+        if peer == self.flood_once_for:
+            self.flood_once_for = None
+            raise FloodWaitError(request=None, capture=0)
+        self.sent.append((peer, text))
+
+
+@pytest.fixture
+def test_db(tmp_path):
+    test_db = DatabaseManager(db_path=str(tmp_path / "test.db"))
+    with patch.object(userbot_module, "db", test_db), \
+         patch.object(userbot_module, "OWNER_LOCK_PATH", str(tmp_path / "userbot.session.owner")):
+        yield test_db
+
+
+def make_owner(client):
+    manager = UserbotManager()
+    manager.BULK_MIN_INTERVAL = 0
+    assert manager.claim_ownership()
+    manager._lock = asyncio.Lock()
+    manager._send_lock = asyncio.Lock()
+
+    async def start():
+        return client
+
+    async def resolve(recipient):
+        return recipient
+
+    manager.start = start
+    manager._resolve_peer = resolve
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_send_bulk_sends_each_recipient_once(test_db):
+    client = FakeClient(flood_once_for="@bob")
+    manager = make_owner(client)
+    client.manager = manager
+
+    report = await manager.send_bulk(1, {"alice": "@alice", "bob": "@bob"}, "hi")
+
+    assert report == {"alice": "sent", "bob": "sent"}
+    assert client.sent == [("@alice", "hi"), ("@bob", "hi")]
+    assert not client.lock_held_during_send
+    assert client.sends_serialized
+    assert [b["status"] for b in test_db.get_bulk_batches()] == ["completed"]
+    await manager.stop()
+
+
+@pytest.mark.asyncio
+async def test_second_process_only_queues(test_db):
+    owner = make_owner(FakeClient())
+    other = UserbotManager()
+    assert not other.claim_ownership()
+
+    report = await other.send_bulk(1, {"alice": "@alice"}, "hi")
+
+    assert report == {"alice": "pending"}
+    batch = test_db.get_bulk_batches()[0]
+    assert batch["status"] == "queued" and batch["owner"] is None
+    await owner.stop()
+
+
+@pytest.mark.asyncio
+async def test_outbox_sends_queued_and_orphaned_batches_once(test_db):
+    client = FakeClient()
+    manager = make_owner(client)
+    test_db.create_bulk_batch("queued", 1, "one", {"alice": "@alice"}, status="queued")
+    test_db.create_bulk_batch("orphaned", 1, "two", {"bob": "@bob"}, owner="dead-owner")
+    test_db.create_bulk_batch("mine", 1, "three", {"carol": "@carol"}, owner=manager._owner_id)
+
+    await manager._drain_outbox()
+    await manager._drain_outbox()
+
+    assert sorted(client.sent) == [("@alice", "one"), ("@bob", "two")]
+    assert test_db.get_bulk_batch("mine")["status"] == "running"
+    await manager.stop()
+
+
+@pytest.mark.asyncio
+async def test_offline_owner_requeues_batch(test_db):
+    manager = make_owner(None)
+
+    report = await manager.send_bulk(1, {"alice": "@alice"}, "hi")
+
+    assert report == {"alice": "pending"}
+    batch = test_db.get_bulk_batches()[0]
+    assert batch["status"] == "queued" and batch["owner"] is None
+    await manager.stop()
+
+
+def test_claim_bulk_batch_is_exclusive(test_db):
+    test_db.create_bulk_batch("b1", 1, "hi", {"alice": "@alice"}, status="queued")
+
+    assert test_db.claim_bulk_batch("b1", "owner-a")
+    assert not test_db.claim_bulk_batch("b1", "owner-a")
+    # A new owner may take over a batch whose owner went away
+    assert test_db.claim_bulk_batch("b1", "owner-b")
+
+    test_db.set_bulk_batch_status("b1", "completed")
+    assert not test_db.claim_bulk_batch("b1", "owner-c")
+
+
+@pytest.mark.asyncio
+async def test_single_send_outside_the_owner_is_reported_as_queued(test_db):
+    owner = make_owner(FakeClient())
+    other = UserbotManager()
+    assert not other.claim_ownership()
+
+    status = await other.send_message("@alice", "hi", user_id=42, name="alice")
+
+    assert status == userbot_module.QUEUED
+    batch = test_db.get_bulk_batches()[0]
+    assert batch["status"] == "queued" and batch["user_id"] == 42
+    await owner.stop()
+
+
+@pytest.mark.asyncio
+async def test_outbox_tells_the_requester_how_a_queued_send_went(test_db):
+    client = FakeClient()
+    manager = make_owner(client)
+    client.manager = manager
+    test_db.create_bulk_batch("queued", 42, "hi", {"alice": "@alice"}, status="queued")
+
+    with patch("gabay.core.utils.telegram.send_telegram_message") as notify:
+        await manager._drain_outbox()
+
+    assert client.sent == [("@alice", "hi")]
+    assert client.sends_serialized
+    user_id, text = notify.call_args.args
+    assert user_id == 42 and "✅ Alice" in text
+    await manager.stop()
+
+
+@pytest.mark.asyncio
+async def test_owner_send_reports_failure_when_offline(test_db):
+    manager = make_owner(None)
+    with patch.object(userbot_module, "userbot", manager):
+        assert await userbot_module.send_userbot_message("@alice", "hi") == userbot_module.FAILED
+    await manager.stop()
@@ -0,0 +1,47 @@
+import threading
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from gabay.core.database import DatabaseManager
+from gabay.core.utils import voice
+
+
+class ThreadRecordingDB(DatabaseManager):
+    """Records which thread each transcript cache call runs on."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.threads = []
+
+    def get_voice_transcript(self, file_unique_id):
+        self.threads.append(threading.get_ident())
+        return super().get_voice_transcript(file_unique_id)
+
+    def save_voice_transcript(self, file_unique_id, transcript):
+        self.threads.append(threading.get_ident())
+        return super().save_voice_transcript(file_unique_id, transcript)
+
+
+@pytest.fixture
+def test_db(tmp_path):
+    test_db = ThreadRecordingDB(db_path=str(tmp_path / "test.db"))
+    with patch.object(voice, "db", test_db):
+        yield test_db
+
+
+def voice_note(unique_id="v1"):
+    note = MagicMock(file_unique_id=unique_id, file_size=1024)
+    note.get_file = AsyncMock(return_value=MagicMock(download_to_memory=AsyncMock()))
+    return note
+
+
+@pytest.mark.asyncio
+async def test_transcripts_are_cached_off_the_event_loop(test_db):
+    note = voice_note()
+    with patch.object(voice, "transcribe_audio_async", AsyncMock(return_value="hello")) as transcribe:
+        assert await voice.transcribe_voice_note(note) == "hello"
+        assert await voice.transcribe_voice_note(note) == "hello"
+
+    transcribe.assert_awaited_once()
+    note.get_file.assert_awaited_once()
+    assert len(test_db.threads) == 3
+    assert threading.get_ident() not in test_db.threads